@@ -7,24 +7,305 @@ organized Markdown documentation in api_docs/ folders.
 """
 import os
 import sys
-import subprocess
+import time
+import hashlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timezone
 import json
-import yaml
 from rich.console import Console
 from rich.table import Table
 from rich.progress import Progress, SpinnerColumn, TextColumn
 from rich.panel import Panel
 
+from chunk_export import spec_source
+from fragment_cache import FragmentCache
+from lazy_json import LazyObject
+from profiling import PROFILE_COLUMNS, ProfileReport, StageProfiler, emit_metrics, load_metrics_hook, maybe_stage
+from openapi_to_markdown import (
+    OpenAPIToMarkdown, SPLIT_MODES, YAML_BACKEND,
+    get_render_version, load_spec_file, load_spec_header, resolve_build_date, utc_date
+)
+from output_formats import DEFAULT_FORMAT, DEFAULT_MAX_TOKENS, format_names, get_format
+from output_writer import OutputWriter, hash_file, write_atomic
+from spec_cache import SpecCache, DEFAULT_CACHE_DIR
+from spec_fetcher import DEFAULT_SOURCES_FILE, DEFAULT_STATE_FILE, SpecFetcher, load_sources
+from spec_watcher import create_watcher, iter_changes
+from search_index import SearchIndex, index_spec_file, spec_rows
+from shared_schemas import SHARED_SCHEMAS_FILE, SchemaLibrary, schema_hashes
+
 console = Console()
 
 
+def hash_bytes(data):
+    """Return the hex SHA-256 digest of raw bytes"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_output(output_path):
+    """Hash a generated Markdown file, or every Markdown file of a split output directory"""
+    if not output_path.is_dir():
+        return hash_file(output_path)
+    
+    digest = hashlib.sha256()
+    for md_file in sorted(output_path.glob('*.md')):
+        digest.update(md_file.name.encode('utf-8') + b'\0')
+        digest.update(hash_file(md_file).encode('ascii'))
+    return digest.hexdigest()
+
+
+def write_output(converter, output_file, writer, split=None, fragment_cache=None, profiler=None,
+                 output_format=DEFAULT_FORMAT, format_options=None):
+    """Write a converter's documentation to output_file through an OutputWriter
+    
+    Returns (message, output_hash).
+    """
+    if split:
+        with maybe_stage(profiler, 'write'):
+            counts = converter.write_shards(output_file, split, prune=True, writer=writer)
+        message = (f"Converted: {output_file.name}/ ({counts['written']} written, "
+                   f"{counts['unchanged']} unchanged, {counts['removed']} removed)")
+        output_hash = hash_output(output_file)
+    else:
+        # Stream chunks to disk, hashing as we go, instead of building the document in memory;
+        # an output that comes out byte-identical does not replace the existing file.
+        # When profiling, sections are rendered first so the write stage is timed on its own.
+        chunks = get_format(output_format).render(converter, **(format_options or {}))
+        if profiler is not None:
+            chunks = list(chunks)
+        with maybe_stage(profiler, 'write'):
+            result = writer.write(output_file, chunks)
+        message = f"Converted: {output_file.name}" + ("" if result.changed else " (unchanged)")
+        output_hash = result.sha256
+    
+    if fragment_cache is not None:
+        fragment_cache.save()
+        total = fragment_cache.hits + fragment_cache.misses
+        if total:
+            message += f" ({fragment_cache.hits}/{total} fragments reused)"
+    
+    return message, output_hash
+
+
+class ConvertResult:
+    """Outcome of convert_spec, also sent back from pool workers
+    
+    stages holds the per-stage metrics when profiling and None otherwise,
+    write_stats the files and bytes written or left unchanged, search_rows
+    the spec_rows() result or None, and ref_hashes the files pulled in
+    through $ref (see ref_file_hashes).
+    """
+    
+    __slots__ = ('status', 'message', 'output_hash', 'stages', 'write_stats', 'search_rows', 'ref_hashes')
+    
+    def __init__(self, status, message, output_hash=None, stages=None, write_stats=None, search_rows=None,
+                 ref_hashes=None):
+        self.status = status
+        self.message = message
+        self.output_hash = output_hash
+        self.stages = stages
+        self.write_stats = write_stats
+        self.search_rows = search_rows
+        self.ref_hashes = ref_hashes
+
+
+def ref_file_hashes(converter, input_file):
+    """Content hashes of the files a conversion loaded through external $refs
+    
+    Keyed by path relative to the spec's directory, like the refs
+    themselves; None when the spec references no other file.
+    """
+    base_dir = Path(input_file).parent.resolve()
+    return {
+        Path(os.path.relpath(document, base_dir)).as_posix(): digest
+        for document, digest in sorted(converter.resolver.loaded_files.items())
+    } or None
+
+
+def convert_spec(input_file, output_file, cache_dir=None, split=None, profile=False, build_date=None,
+                 shared_schemas=None, output_format=DEFAULT_FORMAT, format_options=None, index_as=None,
+                 spec=None):
+    """Convert a single spec file to Markdown in the current process
+    
+    Module-level so it can be pickled and run inside pool workers.
+    Parsed specs are read from / stored in the cache at cache_dir when given.
+    With split, output_file is a directory that receives one shard per tag
+    or endpoint. build_date fixes the footer timestamp, and shared_schemas maps
+    the names of schemas documented in the platform's shared library to
+    their links. output_format names one of the output_formats, and
+    format_options are passed to its renderer. With index_as, a (key,
+    platform) pair, the search index rows of the spec are built from the
+    already parsed spec as well. spec, when given, is the spec already
+    parsed from input_file, which is then not read again. Returns a
+    ConvertResult.
+    """
+    profiler = StageProfiler() if profile else None
+    writer = OutputWriter()
+    try:
+        cache = fragment_cache = None
+        if cache_dir is not None:
+            cache = SpecCache(cache_dir)
+            # Fragments are Markdown; other formats would only empty the cache
+            if output_format == DEFAULT_FORMAT:
+                fragment_cache = FragmentCache(cache_dir / 'fragments', input_file, get_render_version())
+        
+        if spec is None:
+            with maybe_stage(profiler, 'load'):
+                spec = load_spec_file(input_file, cache)
+        converter = OpenAPIToMarkdown(spec, input_file.parent, fragment_cache, profiler, build_date, shared_schemas)
+        message, output_hash = write_output(
+            converter, output_file, writer, split, fragment_cache, profiler, output_format,
+            dict(format_options or {}, source=spec_source(input_file))
+        )
+        
+        search_rows = None
+        if index_as is not None:
+            try:
+                search_rows = spec_rows(converter, *index_as)
+            except Exception:
+                pass  # update_search_index falls back to the spec file and reports the error
+        return ConvertResult('success', message, output_hash, profiler and profiler.stages, writer.stats, search_rows,
+                             ref_file_hashes(converter, input_file))
+    except Exception as e:
+        return ConvertResult('error', f"Error converting {input_file.name}: {e}", write_stats=writer.stats)
+
+
+class BuildManifest:
+    """Persistent record of which spec content produced which Markdown output
+    
+    Each entry maps a spec (by path relative to api_specs/, and by output
+    format, see BatchAPIConverter.get_manifest_key) to the hash of its
+    content, the converter hash it was built with and the hash of the
+    Markdown written. A spec is up to date only when all three still match,
+    so edits to the spec, edits to the converter and changed options all
+    trigger a rebuild while git checkouts and copies do not. Files the spec
+    pulls in through external $refs are recorded with their hashes as well.
+    """
+    
+    VERSION = 1
+    
+    def __init__(self, path, converter_hash):
+        self.path = path
+        self.converter_hash = converter_hash
+        self.entries = {}
+        self.load()
+    
+    def load(self):
+        """Read the manifest from disk, starting empty if missing or unreadable"""
+        try:
+            data = json.loads(self.path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return
+        
+        if data.get('version') == self.VERSION:
+            self.entries = data.get('entries', {})
+    
+    def save(self):
+        """Write the manifest back to disk"""
+        data = {'version': self.VERSION, 'entries': dict(sorted(self.entries.items()))}
+        write_atomic(self.path, json.dumps(data, indent=2) + '\n')
+    
+    def is_fresh(self, key, spec_hash, output_file, shared_hash=None, date_source=None, ref_base=None):
+        """Check that the recorded build for key matches the current inputs and output
+        
+        shared_hash covers the links into a shared schema library, which
+        change with the other specs of the platform. date_source is what the
+        footer timestamp was derived from (see BatchAPIConverter.get_date_source).
+        ref_base is the directory the recorded $ref files are relative to.
+        """
+        entry = self.entries.get(key)
+        if not entry:
+            return False
+        if entry.get('spec_hash') != spec_hash or entry.get('converter_hash') != self.converter_hash:
+            return False
+        if entry.get('shared_hash') != shared_hash or entry.get('date_source') != date_source:
+            return False
+        if not self.refs_unchanged(entry, ref_base):
+            return False
+        
+        try:
+            return hash_output(output_file) == entry.get('output_hash')
+        except OSError:
+            return False
+    
+    def record(self, key, spec_hash, output_hash, **fields):
+        """Remember a successful build, with any further fields that are not None"""
+        self.entries[key] = {
+            'spec_hash': spec_hash,
+            'converter_hash': self.converter_hash,
+            'output_hash': output_hash
+        }
+        self.entries[key].update((name, value) for name, value in fields.items() if value is not None)
+    
+    @staticmethod
+    def refs_unchanged(entry, ref_base=None):
+        """Whether the files an entry pulled in through $ref still have the recorded content"""
+        for name, digest in (entry.get('ref_hashes') or {}).items():
+            try:
+                current = hash_file(Path(ref_base or '.') / name)
+            except OSError:
+                current = None
+            if current != digest:
+                return False
+        return True
+    
+    def get_build_date(self, key, spec_hash, ref_base=None):
+        """Build date recorded for key when it was built from the same spec (and $ref file) content"""
+        entry = self.entries.get(key)
+        if entry and entry.get('spec_hash') == spec_hash and entry.get('build_date'):
+            if self.refs_unchanged(entry, ref_base):
+                return utc_date(datetime.fromisoformat(entry['build_date']))
+        return None
+    
+    def get_schema_hashes(self, key, spec_hash):
+        """Component schema hashes recorded for key when it was built from the same spec content"""
+        entry = self.entries.get(key)
+        if entry and entry.get('spec_hash') == spec_hash and 'schema_hashes' in entry:
+            return entry['schema_hashes']
+        return None
+    
+    def invalidate(self, key):
+        """Forget the recorded build for key"""
+        self.entries.pop(key, None)
+
+
 class BatchAPIConverter:
-    def __init__(self):
+    def __init__(self, jobs=1, force=False, verbose=False, cache_dir=DEFAULT_CACHE_DIR, split=None,
+                 profile=False, stats_json=None, search_index=True, build_date=None, shared_schemas=False,
+                 output_format=DEFAULT_FORMAT, max_tokens=DEFAULT_MAX_TOKENS):
         self.api_specs_dir = Path("api_specs")
         self.api_docs_dir = Path("api_docs")
-        self.converter_script = Path("openapi_to_markdown.py")
+        self.jobs = max(1, jobs)
+        self.force = force
+        self.verbose = verbose
+        self.cache_dir = cache_dir
+        self.split = split
+        self.shared_schemas = shared_schemas
+        self.options = {'split': split} if split else {}
+        if shared_schemas:
+            self.options['shared_schemas'] = True
+        self.output_format = output_format
+        self.output_suffix = get_format(output_format).suffix
+        if output_format != DEFAULT_FORMAT:
+            self.options['format'] = output_format
+        self.format_options = {}
+        if output_format == 'chunks':
+            self.format_options['max_tokens'] = self.options['max_tokens'] = max_tokens
+        self.stats_json = stats_json
+        # 'now', 'mtime', 'content' or an ISO date; None uses SOURCE_DATE_EPOCH or now
+        self.build_date = build_date
+        self.search_index_path = self.api_docs_dir / '.search_index.db' if search_index else None
+        # Per-stage metrics of every converted spec, collected when profiling
+        self.profile_report = ProfileReport() if profile or stats_json else None
+        # Writes output files and tallies bytes written / left unchanged, including pool workers'
+        self.writer = OutputWriter()
+        # Parsed specs and fragment caches kept in memory between watch-mode rebuilds
+        self.warm_specs = {}
+        self.warm_fragments = {}
+        self.manifest = BuildManifest(
+            self.api_docs_dir / '.build_manifest.json',
+            self.get_converter_hash()
+        )
         self.stats = {
             'total_files': 0,
             'converted': 0,
@@ -61,69 +342,581 @@ class BatchAPIConverter:
         platform = spec_info['platform']
         spec_name = spec_info['file'].stem  # filename without extension
         
-        # Create platform directory in api_docs if it doesn't exist
+        # The platform directory is created by the output writer on the first write into it
         platform_docs_dir = self.api_docs_dir / platform
-        platform_docs_dir.mkdir(parents=True, exist_ok=True)
         
-        # Generate output filename (same name as input, just .md extension)
-        output_file = platform_docs_dir / f"{spec_name}.md"
+        # Split output goes into a directory named after the spec
+        if self.split:
+            return platform_docs_dir / spec_name
+        
+        # Generate output filename (same name as input, with the output format's extension)
+        output_file = platform_docs_dir / f"{spec_name}{self.output_suffix}"
         return output_file
     
     def get_spec_title(self, spec_file):
-        """Extract title from API specification"""
+        """Extract title from API specification
+        
+        Only the `info` block is read; the full document is parsed once,
+        later, by the conversion itself.
+        """
         try:
-            with open(spec_file, 'r', encoding='utf-8') as f:
-                if spec_file.suffix in ['.yaml', '.yml']:
-                    spec = yaml.safe_load(f)
-                else:
-                    spec = json.load(f)
-                
-                title = spec.get('info', {}).get('title', spec_file.stem.replace('_', ' ').title())
-                version = spec.get('info', {}).get('version', '')
-                
-                if version:
-                    return f"{title} v{version}"
-                return title
+            info = load_spec_header(spec_file)
+            
+            title = info.get('title', spec_file.stem.replace('_', ' ').title())
+            version = info.get('version', '')
+            
+            if version:
+                return f"{title} v{version}"
+            return title
         except:
             return spec_file.stem.replace('_', ' ').title()
     
-    def convert_file(self, spec_info):
-        """Convert a single spec file to Markdown"""
+    def get_converter_hash(self):
+        """Hash the converter source and options so converter changes invalidate old builds"""
+        source = get_render_version().encode('ascii')
+        options = json.dumps(self.options, sort_keys=True).encode('utf-8')
+        return hash_bytes(source + b'\0' + options)
+    
+    def get_spec_key(self, spec_info):
+        """Stable key for a spec, independent of the working directory"""
+        return spec_info['relative_path'].as_posix()
+    
+    def get_manifest_key(self, spec_info):
+        """Manifest key of a spec's output in the current format
+        
+        Every output format has its own entry, so switching --format back
+        and forth does not rebuild specs whose output is still in place.
+        """
+        key = self.get_spec_key(spec_info)
+        return key if self.output_format == DEFAULT_FORMAT else f"{key}:{self.output_format}"
+    
+    def is_up_to_date(self, spec_info, output_file):
+        """Check whether the existing output can be reused
+        
+        Hashes the spec file in blocks (without parsing) and compares against the
+        build manifest. The hash is kept on spec_info for recording later.
+        """
+        if 'content_hash' not in spec_info:
+            spec_info['content_hash'] = hash_file(spec_info['file'])
+        spec_info['build_date'] = self.get_build_date(spec_info)
+        spec_info['date_source'] = self.get_date_source(spec_info['build_date'])
+        
+        if self.force:
+            self.manifest.invalidate(self.get_manifest_key(spec_info))
+            return False
+        
+        return self.manifest.is_fresh(
+            self.get_manifest_key(spec_info), spec_info['content_hash'], output_file,
+            spec_info.get('shared_hash'), spec_info['date_source'], spec_info['file'].parent
+        )
+    
+    def get_build_date(self, spec_info):
+        """Footer timestamp for a spec
+        
+        With 'content' the date is the first build of the current spec
+        content, so rebuilding an unchanged spec reproduces the same bytes.
+        """
+        if self.build_date == 'content':
+            recorded = self.manifest.get_build_date(
+                self.get_manifest_key(spec_info), spec_info['content_hash'], spec_info['file'].parent
+            )
+            return recorded or datetime.now(timezone.utc).replace(microsecond=0)
+        return resolve_build_date(self.build_date, spec_info['file'])
+    
+    @staticmethod
+    def get_render_date(spec_info):
+        """Build date handed to the converter
+        
+        In 'now' mode this is None, the time of rendering, which lets split
+        output keep the date of its index while no shard changed.
+        """
+        return None if spec_info.get('date_source') == 'now' else spec_info['build_date']
+    
+    def get_date_source(self, build_date):
+        """What a footer timestamp is derived from, recorded in the manifest
+        
+        'now' and 'content' keep the timestamp of the last build of unchanged
+        input. Otherwise the resolved date itself is recorded, so a new
+        --build-date value, a new SOURCE_DATE_EPOCH or (in mtime mode) a
+        touched spec makes the build stale.
+        """
+        if self.build_date in ('now', 'content'):
+            return self.build_date
+        if self.build_date is None and not os.environ.get('SOURCE_DATE_EPOCH'):
+            return 'now'
+        return build_date.isoformat()
+    
+    def prepare_shared_schemas(self, spec_files):
+        """Build the shared schema library of every platform in spec_files
+        
+        Schema hashes are reused from the build manifest while a spec's
+        content is unchanged, so only new or edited specs are parsed here.
+        Those are kept on their spec_info as 'spec' and handed to the
+        conversion, so they are not parsed a second time; lazily loaded
+        specs, which are cheap to open and cannot be sent to a worker, are
+        not kept. The links into the library (and their hash, for the
+        manifest) are stored on each spec_info, and
+        api_docs/<platform>/_schemas.md is rewritten where the library changed.
+        """
+        cache = SpecCache(self.cache_dir) if self.cache_dir is not None else None
+        libraries = {}
+        for spec in spec_files:
+            key = self.get_spec_key(spec)
+            spec['content_hash'] = hash_file(spec['file'])
+            hashes = None if self.force else self.manifest.get_schema_hashes(
+                self.get_manifest_key(spec), spec['content_hash']
+            )
+            loaded = None
+            if hashes is None:
+                try:
+                    loaded = load_spec_file(spec['file'], cache)
+                    hashes = schema_hashes(loaded, spec['file'].parent)
+                except Exception:
+                    hashes = {}  # the conversion reports the error
+                if loaded is not None and not isinstance(loaded, LazyObject):
+                    spec['spec'] = loaded
+            spec['schema_hashes'] = hashes
+            libraries.setdefault(spec['platform'], SchemaLibrary(spec['platform'])).add(
+                key, spec['file'], hashes, spec.get('spec')
+            )
+        
+        for library in libraries.values():
+            library.build()
+            self.write_schema_library(library, cache)
+        
+        # Split output lives one directory further down
+        prefix = '../' if self.split else ''
+        for spec in spec_files:
+            links = libraries[spec['platform']].links(self.get_spec_key(spec), prefix)
+            spec['shared_schemas'] = links
+            spec['shared_hash'] = hash_bytes(json.dumps(links, sort_keys=True).encode('utf-8')) if links else None
+    
+    def write_schema_library(self, library, cache=None):
+        """Write a platform's _schemas.md unless the manifest shows it is current"""
+        key = f"{library.platform}/{SHARED_SCHEMAS_FILE}"
+        output_file = self.api_docs_dir / library.platform / SHARED_SCHEMAS_FILE
+        
+        if not library:
+            # Only remove a library this converter wrote
+            if key in self.manifest.entries and output_file.exists():
+                output_file.unlink()
+            self.manifest.invalidate(key)
+            return
+        
+        digest = library.digest
+        if self.build_date == 'content':
+            build_date = self.manifest.get_build_date(key, digest) or datetime.now(timezone.utc).replace(microsecond=0)
+        elif self.build_date == 'mtime':
+            newest = max(library.spec_files.values(), key=lambda path: path.stat().st_mtime)
+            build_date = resolve_build_date('mtime', newest)
+        else:
+            build_date = resolve_build_date(self.build_date)
+        date_source = self.get_date_source(build_date)
+        
+        if not self.force and self.manifest.is_fresh(key, digest, output_file, date_source=date_source):
+            return
+        
+        result = self.writer.write(output_file, library.iter_markdown(cache, build_date))
+        self.manifest.record(key, digest, result.sha256, build_date=build_date.isoformat(), date_source=date_source)
+        if result.changed:
+            console.print(f"[green]✓[/green] Shared schemas: {library.platform}/{SHARED_SCHEMAS_FILE} "
+                          f"({len(library.headings)} schemas)")
+    
+    def record_build(self, spec_info, status, output_hash, ref_hashes=None):
+        """Store a successful build in the manifest, or drop the entry on failure"""
+        key = self.get_manifest_key(spec_info)
+        if status == 'success':
+            self.remove_other_layout(spec_info)
+            build_date = spec_info.get('build_date')
+            self.manifest.record(
+                key, spec_info['content_hash'], output_hash,
+                build_date=build_date and build_date.isoformat(),
+                date_source=spec_info.get('date_source'),
+                shared_hash=spec_info.get('shared_hash'),
+                schema_hashes=spec_info.get('schema_hashes'),
+                ref_hashes=ref_hashes
+            )
+        else:
+            self.manifest.invalidate(key)
+    
+    def remove_other_layout(self, spec_info):
+        """Remove a spec's Markdown in the other layout (single file or split directory)
+        
+        Switching --split on or off leaves the previous output next to the new
+        one. It is removed when the manifest shows this converter wrote it
+        (its hash is still recorded for the spec) and reported otherwise.
+        """
+        if self.output_format != DEFAULT_FORMAT:
+            return
+        platform_dir = self.get_output_path(spec_info).parent
+        stem = spec_info['file'].stem
+        if self.split:
+            other = platform_dir / f"{stem}{self.output_suffix}"
+            found = other.is_file()
+        else:
+            other = platform_dir / stem
+            found = other.is_dir()
+        if not found:
+            return
+        
+        entry = self.manifest.entries.get(self.get_manifest_key(spec_info)) or {}
+        if entry.get('output_hash') is None or hash_output(other) != entry['output_hash']:
+            console.print(f"[yellow]![/yellow] Output of the previous layout left in place: {other}")
+            return
+        if self.split:
+            other.unlink()
+        else:
+            for shard in other.glob('*.md'):
+                shard.unlink()
+            try:
+                other.rmdir()
+            except OSError:
+                pass  # holds files this converter did not write
+        if self.verbose:
+            console.print(f"[yellow]○[/yellow] Removed output of the previous layout: {other}")
+    
+    def convert_warm(self, spec_info):
+        """Convert a single spec reusing the parsed spec and fragments kept in memory"""
         input_file = spec_info['file']
         output_file = self.get_output_path(spec_info)
         
-        # Check if output already exists and is newer than input
-        if output_file.exists() and output_file.stat().st_mtime > input_file.stat().st_mtime:
+        if self.is_up_to_date(spec_info, output_file):
             return 'skipped', f"Up to date: {output_file.name}"
         
-        # Run the converter
-        cmd = [
-            sys.executable,
-            str(self.converter_script),
-            str(input_file),
-            '-o', str(output_file)
-        ]
-        
+        profiler = StageProfiler() if self.profiling else None
         try:
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            if result.returncode == 0:
-                return 'success', f"Converted: {output_file.name}"
+            content_hash = spec_info['content_hash']
+            cached = self.warm_specs.get(input_file)
+            if cached and cached[0] == content_hash:
+                spec = cached[1]
+            elif 'spec' in spec_info:
+                spec = spec_info.pop('spec')
+                self.warm_specs[input_file] = (content_hash, spec)
             else:
-                return 'error', f"Error: {result.stderr.strip()}"
+                cache = SpecCache(self.cache_dir) if self.cache_dir is not None else None
+                with maybe_stage(profiler, 'load'):
+                    spec = load_spec_file(input_file, cache)
+                self.warm_specs[input_file] = (content_hash, spec)
+            
+            fragment_cache = None
+            if self.output_format == DEFAULT_FORMAT:
+                if input_file not in self.warm_fragments:
+                    fragment_dir = self.cache_dir / 'fragments' if self.cache_dir is not None else None
+                    self.warm_fragments[input_file] = FragmentCache(fragment_dir, input_file, get_render_version())
+                fragment_cache = self.warm_fragments[input_file]
+                fragment_cache.start_run()
+            
+            converter = OpenAPIToMarkdown(
+                spec, input_file.parent, fragment_cache, profiler, self.get_render_date(spec_info),
+                spec_info.get('shared_schemas')
+            )
+            message, output_hash = write_output(
+                converter, output_file, self.writer, self.split, fragment_cache, profiler, self.output_format,
+                dict(self.format_options, source=spec_source(input_file))
+            )
+            status = 'success'
+            ref_hashes = ref_file_hashes(converter, input_file)
+            if index_as := self.get_index_as(spec_info):
+                self.record_search_rows(spec_info, spec_rows(converter, *index_as))
         except Exception as e:
-            return 'error', f"Exception: {str(e)}"
+            status, message, output_hash = 'error', f"Error converting {input_file.name}: {e}", None
+            ref_hashes = None
+        
+        self.record_build(spec_info, status, output_hash, ref_hashes)
+        if status == 'success':
+            self.record_profile(spec_info, profiler and profiler.stages)
+        return status, message
+    
+    def watch(self, platform_filter=None, debounce=0.5):
+        """Convert everything once, then rebuild specs as they change until interrupted"""
+        self.run(platform_filter=platform_filter)
+        
+        watcher = create_watcher(self.api_specs_dir)
+        dependents = self.get_ref_dependents(platform_filter)
+        watcher.watch_files(dependents)
+        console.print(f"\n[bold cyan]Watching {self.api_specs_dir}/ ({watcher.name}), "
+                      f"press Ctrl+C to stop[/bold cyan]")
+        
+        try:
+            for changed in iter_changes(watcher, debounce):
+                # Specs are rebuilt when a file they pull in through $ref changes, too
+                spec_files = {path for path in changed if path.parent.parent == self.api_specs_dir}
+                for path in changed:
+                    spec_files.update(dependents.get(path.resolve(), ()))
+                
+                targets = []
+                platforms = set()
+                for spec_file in sorted(spec_files):
+                    if platform_filter and spec_file.parent.name != platform_filter:
+                        continue
+                    
+                    spec_info = {
+                        'platform': spec_file.parent.name,
+                        'file': spec_file,
+                        'relative_path': spec_file.relative_to(self.api_specs_dir)
+                    }
+                    platforms.add(spec_info['platform'])
+                    
+                    if not spec_file.exists():
+                        self.manifest.invalidate(self.get_manifest_key(spec_info))
+                        if self.search_index_path is not None:
+                            index = SearchIndex(self.search_index_path)
+                            index.remove_spec(self.get_spec_key(spec_info))
+                            index.close()
+                        self.warm_specs.pop(spec_file, None)
+                        self.warm_fragments.pop(spec_file, None)
+                        console.print(f"[yellow]○[/yellow] Removed: {spec_info['relative_path']}")
+                        continue
+                    
+                    targets.append(spec_info)
+                
+                # A changed spec can move schemas into or out of its platform's shared library,
+                # which changes the links in the platform's other docs
+                if self.shared_schemas and platforms:
+                    targets = [spec for spec in self.find_spec_files() if spec['platform'] in platforms]
+                    self.prepare_shared_schemas(targets)
+                
+                for spec_info in targets:
+                    start = time.perf_counter()
+                    status, message = self.convert_warm(spec_info)
+                    elapsed = time.perf_counter() - start
+                    if status != 'skipped' or spec_info['file'] in changed:
+                        self.stats['total_files'] += 1
+                        self.record_result(status, f"{message} [dim]in {elapsed * 1000:.0f} ms[/dim]")
+                    self.update_search_index([spec_info])
+                
+                self.manifest.save()
+                dependents = self.get_ref_dependents(platform_filter)
+                watcher.watch_files(dependents)
+        except KeyboardInterrupt:
+            console.print("\n[cyan]Stopped watching.[/cyan]")
+        finally:
+            watcher.close()
+    
+    def get_ref_dependents(self, platform_filter=None):
+        """Map each file that specs pull in through external $refs to those spec files
+        
+        Taken from the build manifest, so it covers the specs built so far.
+        """
+        dependents = {}
+        for spec_info in self.find_spec_files():
+            if platform_filter and spec_info['platform'] != platform_filter:
+                continue
+            entry = self.manifest.entries.get(self.get_manifest_key(spec_info)) or {}
+            for name in entry.get('ref_hashes') or {}:
+                path = (spec_info['file'].parent / name).resolve()
+                dependents.setdefault(path, set()).add(spec_info['file'])
+        return dependents
     
-    def generate_summary(self):
-        """Generate a simple summary of converted files"""
+    @property
+    def profiling(self):
+        return self.profile_report is not None
+    
+    def record_profile(self, spec_info, stages):
+        """Add a converted spec's stage metrics to the report and hand them to metrics hooks"""
+        if self.profile_report is None or not stages:
+            return
+        name = str(spec_info['relative_path'])
+        self.profile_report.add(name, stages)
+        emit_metrics(name, stages)
+    
+    def print_profile(self):
+        """Print per-stage totals over every profiled spec"""
+        table = Table(title=f"Stage Profile ({len(self.profile_report.specs)} specs)")
+        for i, column in enumerate(PROFILE_COLUMNS):
+            table.add_column(column, style="cyan" if i == 0 else None, justify="left" if i == 0 else "right")
+        for row in self.profile_report.table_rows():
+            table.add_row(*row)
+        console.print(table)
+    
+    def get_index_as(self, spec_info):
+        """(key, platform) a converter builds search rows for, or None without a search index"""
+        if self.search_index_path is None:
+            return None
+        return self.get_spec_key(spec_info), spec_info['platform']
+    
+    @staticmethod
+    def record_search_rows(spec_info, search_rows):
+        """Keep the search rows built during conversion until update_search_index stores them"""
+        if search_rows is not None:
+            spec_info['search_rows'] = search_rows
+    
+    def update_search_index(self, spec_files, prune=False):
+        """Re-index the specs whose content changed since they were last indexed
+        
+        Relies on the content hashes is_up_to_date stored on each spec_info.
+        Rows built while converting a spec are stored as they are; only specs
+        that were not converted in this run (e.g. when the index was deleted)
+        are loaded again. With prune, specs that are no longer in spec_files
+        are dropped.
+        """
+        if self.search_index_path is None:
+            return
+        
+        cache = SpecCache(self.cache_dir) if self.cache_dir is not None else None
+        index = SearchIndex(self.search_index_path)
+        indexed = 0
+        try:
+            keys = set()
+            for spec in spec_files:
+                key = self.get_spec_key(spec)
+                keys.add(key)
+                search_rows = spec.pop('search_rows', None)
+                if 'content_hash' not in spec or index.spec_hash(key) == spec['content_hash']:
+                    continue
+                try:
+                    if search_rows is not None:
+                        index.store_rows(key, spec['platform'], *search_rows, spec['content_hash'])
+                    else:
+                        index_spec_file(index, key, spec['platform'], spec['file'], spec['content_hash'], cache)
+                    indexed += 1
+                except Exception as e:
+                    console.print(f"[red]✗[/red] Could not index {spec['file'].name}: {e}")
+            
+            if prune:
+                for key in set(index.spec_keys()) - keys:
+                    index.remove_spec(key)
+        finally:
+            index.close()
+        
+        if self.verbose and indexed:
+            console.print(f"[dim]Search index: {indexed} specs re-indexed in {self.search_index_path}[/dim]")
+    
+    def fetch_sources(self, sources_file=DEFAULT_SOURCES_FILE, workers=8):
+        """Download the specs listed in a sources manifest into api_specs/<platform>/
+        
+        Unchanged specs cost one conditional request; their files are left
+        untouched, so the conversion that follows skips them as well.
+        """
+        try:
+            sources = load_sources(sources_file)
+        except (OSError, ValueError) as e:
+            console.print(f"[red]Cannot read sources manifest {sources_file}: {e}[/red]")
+            return
+        
+        counts = {'updated': 0, 'not_modified': 0, 'unchanged': 0, 'error': 0}
+        fetcher = SpecFetcher(self.api_specs_dir, self.api_specs_dir / DEFAULT_STATE_FILE.name, workers)
+        try:
+            with console.status(f"Fetching {len(sources)} specifications..."):
+                for result in fetcher.fetch_all(sources):
+                    counts[result.status] += 1
+                    if result.status == 'updated':
+                        console.print(f"[green]↓[/green] Fetched: {result.path} ({result.message})")
+                    elif result.status == 'error':
+                        console.print(f"[red]✗[/red] Fetch failed: {result.url}: {result.message}")
+                    elif self.verbose:
+                        console.print(f"[yellow]○[/yellow] Not modified: {result.path}")
+        finally:
+            fetcher.close()
+        
+        console.print(f"[bold]Fetched {len(sources)} sources:[/bold] {counts['updated']} updated, "
+                      f"{counts['not_modified'] + counts['unchanged']} unchanged, {counts['error']} failed\n")
+    
+    def record_write_stats(self, write_stats):
+        """Add the output written by a conversion (possibly in a pool worker) to the totals"""
+        for key, value in (write_stats or {}).items():
+            self.writer.stats[key] += value
+    
+    def record_result(self, status, message):
+        """Update stats and print the outcome of a single conversion"""
+        if status == 'success':
+            self.stats['converted'] += 1
+            console.print(f"[green]✓[/green] {message}")
+        elif status == 'skipped':
+            self.stats['skipped'] += 1
+            console.print(f"[yellow]○[/yellow] {message}")
+        else:
+            self.stats['errors'] += 1
+            console.print(f"[red]✗[/red] {message}")
+    
+    def convert_all(self, spec_files, progress, task):
+        """Convert spec files, spreading the work over a process pool when jobs > 1"""
+        if self.shared_schemas:
+            progress.update(task, description="Collecting shared schemas...")
+            self.prepare_shared_schemas(spec_files)
+        elif self.output_format == DEFAULT_FORMAT:
+            for platform in {spec['platform'] for spec in spec_files}:
+                self.write_schema_library(SchemaLibrary(platform))
+        
+        pending = []
+        
+        for spec in spec_files:
+            self.stats['total_files'] += 1
+            output_file = self.get_output_path(spec)
+            
+            if self.is_up_to_date(spec, output_file):
+                spec.pop('spec', None)
+                self.record_result('skipped', f"Up to date: {output_file.name}")
+                progress.advance(task)
+            else:
+                pending.append((spec, output_file))
+        
+        if self.jobs == 1 or len(pending) <= 1:
+            for spec, output_file in pending:
+                progress.update(task, description=f"Converting {spec['file'].name}...")
+                self.record_conversion(spec, convert_spec(spec['file'], output_file, **self.convert_options(spec)))
+                progress.advance(task)
+            return
+        
+        progress.update(task, description=f"Converting {len(pending)} specifications ({self.jobs} jobs)...")
+        with ProcessPoolExecutor(max_workers=min(self.jobs, len(pending))) as executor:
+            futures = {
+                executor.submit(convert_spec, spec['file'], output_file, **self.convert_options(spec)): spec
+                for spec, output_file in pending
+            }
+            
+            for future in as_completed(futures):
+                spec = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = ConvertResult('error', f"Worker failed on {spec['file'].name}: {e}")
+                self.record_conversion(spec, result)
+                progress.advance(task)
+    
+    def convert_options(self, spec_info):
+        """Keyword arguments of convert_spec for a spec; hands over (and drops) its parsed spec"""
+        return {
+            'cache_dir': self.cache_dir,
+            'split': self.split,
+            'profile': self.profiling,
+            'build_date': self.get_render_date(spec_info),
+            'shared_schemas': spec_info.get('shared_schemas'),
+            'output_format': self.output_format,
+            'format_options': self.format_options,
+            'index_as': self.get_index_as(spec_info),
+            'spec': spec_info.pop('spec', None)
+        }
+    
+    def record_conversion(self, spec_info, result):
+        """Take in everything a ConvertResult reports for a spec"""
+        self.record_search_rows(spec_info, result.search_rows)
+        self.record_write_stats(result.write_stats)
+        self.record_build(spec_info, result.status, result.output_hash, result.ref_hashes)
+        self.record_profile(spec_info, result.stages)
+        self.record_result(result.status, result.message)
+    
+    def generate_summary(self, titles=None):
+        """Generate a simple summary of converted files
+        
+        titles maps output paths to the spec titles already read for the
+        listing, so no spec has to be opened again here.
+        """
+        titles = titles or {}
         summary = []
         
         for platform_dir in sorted(self.api_docs_dir.iterdir()):
             if platform_dir.is_dir():
-                md_files = sorted(platform_dir.glob("*.md"))
+                md_files = sorted(platform_dir.glob(f"*{self.output_suffix}"))
+                md_files += sorted(d for d in platform_dir.iterdir() if (d / 'index.md').is_file())
                 if md_files:
                     summary.append(f"\n{platform_dir.name}:")
                     for md_file in md_files:
-                        summary.append(f"  - {md_file.name}")
+                        name = f"{md_file.name}/" if md_file.is_dir() else md_file.name
+                        if title := titles.get(md_file):
+                            summary.append(f"  - {name} ({title})")
+                        else:
+                            summary.append(f"  - {name}")
         
         return '\n'.join(summary) if summary else "No documentation files found."
     
@@ -136,6 +929,10 @@ class BatchAPIConverter:
             border_style="cyan"
         ))
         
+        if self.verbose:
+            cache = self.cache_dir if self.cache_dir is not None else 'disabled'
+            console.print(f"[dim]YAML backend: {YAML_BACKEND}, jobs: {self.jobs}, spec cache: {cache}[/dim]")
+        
         # Find all spec files
         spec_files = self.find_spec_files()
         
@@ -157,11 +954,11 @@ class BatchAPIConverter:
         table.add_column("Title", style="yellow")
         
         for spec in spec_files:
-            title = self.get_spec_title(spec['file'])
+            spec['title'] = self.get_spec_title(spec['file'])
             table.add_row(
                 spec['platform'],
                 spec['file'].name,
-                title
+                spec['title']
             )
         
         console.print(table)
@@ -174,27 +971,17 @@ class BatchAPIConverter:
             console=console
         ) as progress:
             task = progress.add_task("Converting specifications...", total=len(spec_files))
+            try:
+                self.convert_all(spec_files, progress, task)
+            finally:
+                self.manifest.save()
             
-            for spec in spec_files:
-                self.stats['total_files'] += 1
-                progress.update(task, description=f"Converting {spec['file'].name}...")
-                
-                status, message = self.convert_file(spec)
-                
-                if status == 'success':
-                    self.stats['converted'] += 1
-                    console.print(f"[green]✓[/green] {message}")
-                elif status == 'skipped':
-                    self.stats['skipped'] += 1
-                    console.print(f"[yellow]○[/yellow] {message}")
-                else:
-                    self.stats['errors'] += 1
-                    console.print(f"[red]✗[/red] {message}")
-                
-                progress.advance(task)
+            progress.update(task, description="Updating search index...")
+            self.update_search_index(spec_files, prune=not platform_filter)
         
         # Show summary of files
-        summary = self.generate_summary()
+        titles = {self.get_output_path(spec): spec['title'] for spec in spec_files}
+        summary = self.generate_summary(titles)
         if summary:
             console.print("\n[cyan]Documentation files:[/cyan]")
             console.print(summary)
@@ -205,6 +992,19 @@ class BatchAPIConverter:
         console.print(f"  [green]Converted: {self.stats['converted']}[/green]")
         console.print(f"  [yellow]Skipped: {self.stats['skipped']}[/yellow]")
         console.print(f"  [red]Errors: {self.stats['errors']}[/red]")
+        written = self.writer.stats
+        if written['files_written'] or written['files_unchanged']:
+            console.print(f"  Output: {written['files_written']} files written "
+                          f"({written['bytes_written'] / 1024:,.1f} KiB), "
+                          f"{written['files_unchanged']} unchanged "
+                          f"({written['bytes_unchanged'] / 1024:,.1f} KiB skipped)")
+        
+        if self.profile_report is not None and self.profile_report.specs:
+            console.print()
+            self.print_profile()
+            if self.stats_json:
+                self.profile_report.write_json(Path(self.stats_json))
+                console.print(f"[dim]Stage metrics written to: {self.stats_json}[/dim]")
         
         # Show where docs are located
         if self.stats['converted'] > 0 or self.stats['skipped'] > 0:
@@ -226,41 +1026,154 @@ def main():
     parser.add_argument(
         '--force',
         action='store_true',
-        help='Force reconversion of all files (ignore timestamps)'
+        help='Force reconversion of all files (invalidate the build manifest)'
+    )
+    
+    parser.add_argument(
+        '-j', '--jobs',
+        type=int,
+        default=os.cpu_count() or 1,
+        help='Number of worker processes for conversion (default: CPU count)'
+    )
+    parser.add_argument(
+        '--split',
+        choices=SPLIT_MODES,
+        help='Write each spec as a directory with one file per tag or per endpoint plus index.md'
+    )
+    parser.add_argument(
+        '--format',
+        choices=format_names(),
+        default=DEFAULT_FORMAT,
+        help=f'Output format; json and ndjson write the endpoints and schemas as records, chunks '
+             f'token-budgeted chunks per operation for embedding (default: {DEFAULT_FORMAT})'
+    )
+    parser.add_argument(
+        '--max-tokens',
+        type=int,
+        default=DEFAULT_MAX_TOKENS,
+        help=f'Approximate size budget of each chunk with --format chunks (default: {DEFAULT_MAX_TOKENS})'
+    )
+    parser.add_argument(
+        '--fetch',
+        action='store_true',
+        help='Download the specs listed in the sources manifest before converting'
+    )
+    parser.add_argument(
+        '--sources',
+        type=str,
+        default=str(DEFAULT_SOURCES_FILE),
+        help=f'Sources manifest for --fetch (default: {DEFAULT_SOURCES_FILE})'
+    )
+    parser.add_argument(
+        '--watch',
+        action='store_true',
+        help='After converting, keep running and rebuild specs as they change'
+    )
+    parser.add_argument(
+        '--debounce',
+        type=float,
+        default=0.5,
+        help='Seconds to wait for further changes before rebuilding in watch mode (default: 0.5)'
+    )
+    parser.add_argument(
+        '--bench',
+        action='store_true',
+        help='Run the benchmark suite on synthetic specs instead of converting (see bench/)'
+    )
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='Report wall time and peak memory per conversion stage across all converted specs'
+    )
+    parser.add_argument(
+        '--stats-json',
+        type=str,
+        help='Write per-spec, per-stage timing and memory as JSON to this file'
+    )
+    parser.add_argument(
+        '--metrics-hook',
+        type=str,
+        help='module:function called with (spec path, stage metrics) for every profiled spec'
+    )
+    parser.add_argument(
+        '--build-date',
+        type=str,
+        help="Footer timestamp: 'content' (first build of the current spec content), 'mtime', "
+             "'now' or an ISO 8601 date/time (default: SOURCE_DATE_EPOCH if set, else now)"
+    )
+    parser.add_argument(
+        '--shared-schemas',
+        action='store_true',
+        help=f'Render schemas defined identically by several specs of a platform once, '
+             f'into api_docs/<platform>/{SHARED_SCHEMAS_FILE}, and link to them'
+    )
+    parser.add_argument(
+        '--no-index',
+        action='store_true',
+        help='Do not update the search index (api_docs/.search_index.db, queried with search_index.py)'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Always parse specs instead of using the parsed-spec cache'
+    )
+    parser.add_argument(
+        '--cache-dir',
+        type=str,
+        default=str(DEFAULT_CACHE_DIR),
+        help=f'Directory for the parsed-spec cache (default: {DEFAULT_CACHE_DIR})'
+    )
+    parser.add_argument(
+        '-v', '--verbose',
+        action='store_true',
+        help='Show loader backend and other run details'
     )
     
     args = parser.parse_args()
     
-    converter = BatchAPIConverter()
+    if args.split and args.format != DEFAULT_FORMAT:
+        parser.error('--split only supports the markdown format')
+    if args.shared_schemas and args.format != DEFAULT_FORMAT:
+        parser.error('--shared-schemas only applies to the markdown format')
+    if args.max_tokens < 64:
+        parser.error('--max-tokens must be at least 64')
     
-    # Modify converter if force flag is set
-    if args.force:
-        original_convert = converter.convert_file
-        def force_convert(spec_info):
-            # Remove the timestamp check by always converting
-            input_file = spec_info['file']
-            output_file = converter.get_output_path(spec_info)
-            
-            cmd = [
-                sys.executable,
-                str(converter.converter_script),
-                str(input_file),
-                '-o', str(output_file)
-            ]
-            
-            try:
-                result = subprocess.run(cmd, capture_output=True, text=True)
-                if result.returncode == 0:
-                    return 'success', f"Converted: {output_file.name}"
-                else:
-                    return 'error', f"Error: {result.stderr.strip()}"
-            except Exception as e:
-                return 'error', f"Exception: {str(e)}"
-        
-        converter.convert_file = force_convert
+    if args.build_date not in (None, 'now', 'mtime', 'content'):
+        try:
+            datetime.fromisoformat(args.build_date)
+        except ValueError:
+            parser.error(f"invalid --build-date '{args.build_date}'")
     
-    converter.run(platform_filter=args.platform)
+    if args.bench:
+        sys.path.insert(0, str(Path(__file__).resolve().parent / 'bench'))
+        from run_benchmarks import main as run_benchmarks
+        run_benchmarks(['--jobs', str(args.jobs)])
+        return
+    
+    if args.metrics_hook:
+        load_metrics_hook(args.metrics_hook)
+    
+    converter = BatchAPIConverter(
+        jobs=args.jobs,
+        force=args.force,
+        verbose=args.verbose,
+        cache_dir=None if args.no_cache else Path(args.cache_dir),
+        split=args.split,
+        profile=args.profile or bool(args.metrics_hook),
+        stats_json=args.stats_json,
+        search_index=not args.no_index,
+        build_date=args.build_date,
+        shared_schemas=args.shared_schemas,
+        output_format=args.format,
+        max_tokens=args.max_tokens
+    )
+    if args.fetch:
+        converter.fetch_sources(Path(args.sources), workers=max(8, args.jobs))
+    if args.watch:
+        converter.watch(platform_filter=args.platform, debounce=args.debounce)
+    else:
+        converter.run(platform_filter=args.platform)
 
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark spec loading backends
+
+Times the pure-Python YAML loader, the libyaml loader (when available) and
+the json module on every spec in api_specs/. The JSON column parses a JSON
+serialization of the same document, to show what a .json spec costs.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+
+import yaml
+from rich.console import Console
+from rich.table import Table
+
+ROOT = Path(os.path.dirname(os.path.abspath(__file__))).parent
+sys.path.insert(0, str(ROOT))
+
+from openapi_to_markdown import YAML_BACKEND
+
+console = Console()
+
+
+def get_backends():
+    """Return the (name, parse function) pairs to compare"""
+    backends = [('pure-python', lambda text: yaml.load(text, Loader=yaml.SafeLoader))]
+    if hasattr(yaml, 'CSafeLoader'):
+        backends.append(('libyaml', lambda text: yaml.load(text, Loader=yaml.CSafeLoader)))
+    return backends
+
+
+def best_time(func, arg, repeat):
+    """Best wall time in seconds over repeat runs"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(arg)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Compare YAML/JSON loading backends on API specifications'
+    )
+    parser.add_argument(
+        'spec_files',
+        nargs='*',
+        help='Spec files to load (default: everything in api_specs/)'
+    )
+    parser.add_argument(
+        '-r', '--repeat',
+        type=int,
+        default=3,
+        help='Runs per backend and file; the best time is reported (default: 3)'
+    )
+
+    args = parser.parse_args()
+
+    if args.spec_files:
+        spec_files = [Path(p) for p in args.spec_files]
+    else:
+        spec_files = sorted(
+            p for p in (ROOT / 'api_specs').glob('*/*')
+            if p.suffix in ['.yaml', '.yml', '.json']
+        )
+
+    backends = get_backends()
+
+    table = Table(title=f"Spec loading (default backend: {YAML_BACKEND})")
+    table.add_column("File", style="green")
+    table.add_column("Size", justify="right")
+    for name, _ in backends:
+        table.add_column(f"{name} (ms)", justify="right")
+    table.add_column("json (ms)", justify="right")
+
+    totals = [0.0] * (len(backends) + 1)
+
+    for spec_file in spec_files:
+        text = spec_file.read_text(encoding='utf-8')
+        row = [spec_file.name, f"{len(text) / 1024:.0f} KB"]
+
+        for i, (_, parse) in enumerate(backends):
+            elapsed = best_time(parse, text, args.repeat)
+            totals[i] += elapsed
+            row.append(f"{elapsed * 1000:.1f}")
+
+        json_text = json.dumps(backends[-1][1](text), default=str)
+        elapsed = best_time(json.loads, json_text, args.repeat)
+        totals[-1] += elapsed
+        row.append(f"{elapsed * 1000:.1f}")
+
+        table.add_row(*row)
+
+    table.add_row("[bold]Total[/bold]", "", *(f"[bold]{t * 1000:.1f}[/bold]" for t in totals))
+    console.print(table)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Converter benchmark suite
+
+Generates synthetic OpenAPI 3.x and Swagger 2.0 specs, then times spec
+loading (parse and cache hit), each _generate_* section of
+OpenAPIToMarkdown and end-to-end batch conversion throughput. Results are
+written as JSON so runs of different versions can be compared.
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import argparse
+import tempfile
+from pathlib import Path
+from datetime import datetime
+
+from rich.console import Console
+from rich.table import Table
+
+BENCH_DIR = Path(os.path.dirname(os.path.abspath(__file__)))
+ROOT = BENCH_DIR.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(BENCH_DIR))
+
+import batch_convert
+from batch_convert import BatchAPIConverter
+from openapi_to_markdown import OpenAPIToMarkdown, YAML_BACKEND, get_render_version, load_spec_file
+from spec_cache import SpecCache
+from synthetic_spec import generate_spec, write_spec
+
+console = Console()
+
+SECTION_METHODS = [
+    '_generate_header',
+    '_generate_overview',
+    '_generate_authentication',
+    '_generate_servers',
+    '_generate_endpoints',
+    '_generate_schemas',
+    '_generate_footer'
+]
+
+
+def best_time(func, repeat):
+    """Best wall time in seconds over repeat calls"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_load(spec_file, cache_dir, repeat):
+    """Time parsing a spec and loading it back from a warm SpecCache"""
+    cache = SpecCache(cache_dir)
+    load_spec_file(spec_file, cache)  # Warm the cache
+    return {
+        'parse': best_time(lambda: load_spec_file(spec_file), repeat),
+        'cache_hit': best_time(lambda: load_spec_file(spec_file, cache), repeat)
+    }
+
+
+def bench_sections(spec, repeat):
+    """Time every _generate_* section on a fresh converter, so indexes are built inside the timing"""
+    results = {}
+    for method in SECTION_METHODS:
+        results[method] = best_time(lambda: getattr(OpenAPIToMarkdown(spec), method)(), repeat)
+    results['generate_markdown'] = best_time(lambda: OpenAPIToMarkdown(spec).generate_markdown(), repeat)
+    return results
+
+
+def bench_batch(spec_files, work_dir, jobs):
+    """Time full batch runs: cold, with warm caches, and a no-op rebuild"""
+    platform_dir = work_dir / 'api_specs' / 'synthetic'
+    platform_dir.mkdir(parents=True)
+    for i, spec_file in enumerate(spec_files):
+        shutil.copy(spec_file, platform_dir / f"spec{i}{spec_file.suffix}")
+    total_bytes = sum(p.stat().st_size for p in platform_dir.iterdir())
+
+    cache_dir = work_dir / '.spec_cache'
+    runs = [
+        ('cold', dict(force=True, cache_dir=None)),
+        ('warm_cache', dict(force=True, cache_dir=cache_dir)),
+        ('up_to_date', dict(force=False, cache_dir=cache_dir))
+    ]
+
+    results = {}
+    cwd = os.getcwd()
+    quiet = batch_convert.console.quiet
+    os.chdir(work_dir)
+    batch_convert.console.quiet = True
+    try:
+        # Populate the caches so the warm run measures reuse
+        BatchAPIConverter(jobs=jobs, force=True, cache_dir=cache_dir).run()
+
+        for name, options in runs:
+            start = time.perf_counter()
+            BatchAPIConverter(jobs=jobs, **options).run()
+            elapsed = time.perf_counter() - start
+            results[name] = {
+                'seconds': elapsed,
+                'specs_per_second': len(spec_files) / elapsed,
+                'mb_per_second': total_bytes / elapsed / 1e6
+            }
+    finally:
+        batch_convert.console.quiet = quiet
+        os.chdir(cwd)
+
+    return results
+
+
+def run_benchmarks(paths=2000, schemas=400, ref_depth=8, specs=4, jobs=1, repeat=3, output=None):
+    """Run the whole suite and return the results dict (also written to output if given)"""
+    work_dir = Path(tempfile.mkdtemp(prefix='api-ripper-bench-'))
+    config = {
+        'paths': paths, 'schemas': schemas, 'ref_depth': ref_depth,
+        'specs': specs, 'jobs': jobs, 'repeat': repeat
+    }
+    results = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'render_version': get_render_version()[:12],
+        'python': platform.python_version(),
+        'yaml_backend': YAML_BACKEND,
+        'config': config,
+        'load': {},
+        'sections': {},
+        'batch': {}
+    }
+
+    try:
+        generated = []
+        for name, version in [('openapi3', '3.0'), ('swagger2', '2.0')]:
+            with console.status(f"Generating {name} spec with {paths} paths..."):
+                spec = generate_spec(paths=paths, schemas=schemas, ref_depth=ref_depth, version=version)
+                for suffix in ['.yaml', '.json']:
+                    spec_file = work_dir / 'specs' / f"{name}{suffix}"
+                    write_spec(spec, spec_file)
+                    generated.append(spec_file)
+
+        for spec_file in generated:
+            with console.status(f"Timing load of {spec_file.name}..."):
+                results['load'][spec_file.name] = bench_load(spec_file, work_dir / 'load_cache', repeat)
+
+        for spec_file in generated:
+            if spec_file.suffix == '.json':
+                with console.status(f"Timing sections of {spec_file.stem}..."):
+                    results['sections'][spec_file.stem] = bench_sections(load_spec_file(spec_file), repeat)
+
+        batch_specs = [generated[i % len(generated)] for i in range(specs)]
+        with console.status(f"Timing batch conversion of {specs} specs..."):
+            results['batch'] = bench_batch(batch_specs, work_dir / 'batch', jobs)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    if output:
+        Path(output).write_text(json.dumps(results, indent=2) + '\n', encoding='utf-8')
+    return results
+
+
+def flatten_timings(results):
+    """Map 'group/name/metric' to seconds for every timing in a results dict"""
+    flat = {}
+    for group in ['load', 'sections']:
+        for name, timings in results.get(group, {}).items():
+            for metric, seconds in timings.items():
+                flat[f"{group}/{name}/{metric}"] = seconds
+    for name, run in results.get('batch', {}).items():
+        flat[f"batch/{name}"] = run['seconds']
+    return flat
+
+
+def print_results(results, baseline=None):
+    """Print timings as a table, with the change against a baseline run if given"""
+    current = flatten_timings(results)
+    previous = flatten_timings(baseline) if baseline else {}
+
+    config = results['config']
+    table = Table(title=f"Benchmark ({config['paths']} paths, {config['specs']} specs, "
+                        f"{config['jobs']} jobs, YAML: {results['yaml_backend']})")
+    table.add_column("Measurement", style="cyan")
+    table.add_column("Time (ms)", justify="right")
+    if baseline:
+        table.add_column("Baseline (ms)", justify="right")
+        table.add_column("Change", justify="right")
+
+    for key, seconds in current.items():
+        row = [key, f"{seconds * 1000:.1f}"]
+        if baseline:
+            if key in previous and previous[key] > 0:
+                change = (seconds - previous[key]) / previous[key] * 100
+                style = 'red' if change > 10 else 'green' if change < -10 else 'white'
+                row += [f"{previous[key] * 1000:.1f}", f"[{style}]{change:+.0f}%[/{style}]"]
+            else:
+                row += ['-', '-']
+        table.add_row(*row)
+
+    console.print(table)
+    for name, run in results['batch'].items():
+        console.print(f"  batch {name}: {run['specs_per_second']:.1f} specs/s, {run['mb_per_second']:.2f} MB/s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Benchmark the OpenAPI to Markdown converter on synthetic specifications'
+    )
+    parser.add_argument('--paths', type=int, default=2000, help='Paths per synthetic spec (default: 2000)')
+    parser.add_argument('--schemas', type=int, default=400, help='Models per synthetic spec (default: 400)')
+    parser.add_argument('--ref-depth', type=int, default=8, help='Length of $ref chains (default: 8)')
+    parser.add_argument('--specs', type=int, default=4, help='Specs in the batch throughput run (default: 4)')
+    parser.add_argument('-j', '--jobs', type=int, default=1, help='Worker processes for the batch run (default: 1)')
+    parser.add_argument('-r', '--repeat', type=int, default=3, help='Repeats per timing; best is kept (default: 3)')
+    parser.add_argument('-o', '--output', type=str, default='bench_results.json',
+                        help='Where to write the JSON results (default: bench_results.json)')
+    parser.add_argument('--compare', type=str, help='Previous results JSON to compare against')
+
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(
+        paths=args.paths,
+        schemas=args.schemas,
+        ref_depth=args.ref_depth,
+        specs=args.specs,
+        jobs=args.jobs,
+        repeat=args.repeat,
+        output=args.output
+    )
+
+    baseline = json.loads(Path(args.compare).read_text(encoding='utf-8')) if args.compare else None
+    print_results(results, baseline)
+    console.print(f"\nResults written to: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Synthetic OpenAPI 3.x / Swagger 2.0 specification generator
+
+Builds deterministic specs of arbitrary size for benchmarking: thousands of
+paths spread over tags, shared parameters, large schemas and deep $ref
+chains (each link of a chain extends the next one through allOf).
+"""
+import sys
+import json
+import random
+import argparse
+from pathlib import Path
+
+import yaml
+
+try:
+    from yaml import CSafeDumper as SpecDumper
+except ImportError:
+    from yaml import SafeDumper as SpecDumper
+
+PROPERTY_TYPES = ['string', 'integer', 'number', 'boolean']
+
+
+def generate_schemas(rng, count, properties, ref_depth):
+    """Return (schemas, chain heads) for a spec, independent of version"""
+    schemas = {}
+
+    for i in range(count):
+        props = {}
+        for j in range(properties):
+            if i and j % 5 == 4:
+                props[f"field{j}"] = {'$ref': f"#/SCHEMAS/Model{rng.randrange(i)}"}
+            elif j % 7 == 6:
+                props[f"field{j}"] = {'type': 'array', 'items': {'type': rng.choice(PROPERTY_TYPES)}}
+            else:
+                props[f"field{j}"] = {
+                    'type': rng.choice(PROPERTY_TYPES),
+                    'description': f"Field {j} of model {i}."
+                }
+        schemas[f"Model{i}"] = {
+            'type': 'object',
+            'description': f"Synthetic model {i}.",
+            'required': [f"field{j}" for j in range(0, properties, 3)],
+            'properties': props
+        }
+
+    # Deep chains: Chain{c}_0 -> Chain{c}_1 -> ... -> Model
+    heads = []
+    for c in range(max(1, count // 20)):
+        for depth in range(ref_depth):
+            name = f"Chain{c}_{depth}"
+            target = f"Chain{c}_{depth + 1}" if depth + 1 < ref_depth else f"Model{rng.randrange(count)}"
+            schemas[name] = {
+                'allOf': [
+                    {'$ref': f"#/SCHEMAS/{target}"},
+                    {'properties': {f"level{depth}": {'type': 'string'}}}
+                ]
+            }
+        heads.append(f"Chain{c}_0")
+
+    return schemas, heads
+
+
+def generate_spec(paths=1000, schemas=200, properties=20, ref_depth=6, tags=20,
+                  version='3.0', seed=0):
+    """Generate a synthetic spec dict; version is '3.0' or '2.0'"""
+    rng = random.Random(seed)
+    swagger = version.startswith('2')
+    schema_prefix = '#/definitions/' if swagger else '#/components/schemas/'
+    param_prefix = '#/parameters/' if swagger else '#/components/parameters/'
+
+    models, heads = generate_schemas(rng, schemas, properties, ref_depth)
+    # Rewrite the version-neutral placeholder into real refs
+    models = json.loads(json.dumps(models).replace('#/SCHEMAS/', schema_prefix))
+    targets = list(models)
+
+    shared_params = {
+        'Limit': {'name': 'limit', 'in': 'query', 'description': 'Page size.'},
+        'Cursor': {'name': 'cursor', 'in': 'query', 'description': 'Pagination cursor.'},
+        'Id': {'name': 'id', 'in': 'path', 'required': True, 'description': 'Resource ID.'}
+    }
+    for param, kind in zip(shared_params.values(), ['integer', 'string', 'string']):
+        if swagger:
+            param['type'] = kind
+        else:
+            param['schema'] = {'type': kind}
+
+    tag_names = [f"Tag {t}" for t in range(tags)]
+    spec_paths = {}
+
+    for i in range(paths):
+        model = rng.choice(heads) if i % 3 == 0 else rng.choice(targets)
+        tag = tag_names[i % tags]
+        ref = {'$ref': f"{schema_prefix}{model}"}
+
+        if swagger:
+            ok_response = {'description': 'Success', 'schema': ref}
+            body = [{'name': 'body', 'in': 'body', 'required': True, 'schema': ref}]
+        else:
+            ok_response = {'description': 'Success', 'content': {'application/json': {'schema': ref}}}
+            body = None
+
+        get_op = {
+            'tags': [tag],
+            'operationId': f"getResource{i}",
+            'summary': f"Get resource {i}",
+            'description': f"Returns resource {i} as {model}.",
+            'parameters': [{'$ref': f"{param_prefix}Id"}, {'$ref': f"{param_prefix}Limit"}],
+            'responses': {'200': ok_response, '404': {'description': 'Not found'}}
+        }
+        post_op = {
+            'tags': [tag, tag_names[(i + 1) % tags]],
+            'operationId': f"createResource{i}",
+            'summary': f"Create resource {i}",
+            'parameters': [{'$ref': f"{param_prefix}Cursor"}] + (body or []),
+            'responses': {'201': ok_response}
+        }
+        if not swagger:
+            post_op['requestBody'] = {'required': True, 'content': {'application/json': {'schema': ref}}}
+
+        spec_paths[f"/group{i % 50}/resource{i}/{{id}}"] = {'get': get_op, 'post': post_op}
+
+    spec = {
+        'info': {
+            'title': f"Synthetic API ({paths} paths)",
+            'version': '1.0.0',
+            'description': 'Generated for benchmarking the converter.'
+        },
+        'tags': [{'name': t, 'description': f"Operations for {t}."} for t in tag_names],
+        'paths': spec_paths
+    }
+
+    if swagger:
+        spec = {'swagger': '2.0', **spec}
+        spec.update({
+            'host': 'api.example.com',
+            'basePath': '/v1',
+            'schemes': ['https'],
+            'securityDefinitions': {'apiKey': {'type': 'apiKey', 'in': 'header', 'name': 'X-API-Key'}},
+            'parameters': shared_params,
+            'definitions': models
+        })
+    else:
+        spec = {'openapi': '3.0.3', **spec}
+        spec.update({
+            'servers': [{'url': 'https://api.example.com/v1'}],
+            'components': {
+                'securitySchemes': {'apiKey': {'type': 'apiKey', 'in': 'header', 'name': 'X-API-Key'}},
+                'parameters': shared_params,
+                'schemas': models
+            }
+        })
+
+    return spec
+
+
+def write_spec(spec, output_path):
+    """Write a spec as YAML or JSON depending on the file extension"""
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        if output_path.suffix == '.json':
+            json.dump(spec, f)
+        else:
+            yaml.dump(spec, f, Dumper=SpecDumper, sort_keys=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Generate a synthetic OpenAPI/Swagger specification for benchmarking'
+    )
+    parser.add_argument('output', type=str, help='Output file (.yaml, .yml or .json)')
+    parser.add_argument('--paths', type=int, default=1000, help='Number of paths (default: 1000)')
+    parser.add_argument('--schemas', type=int, default=200, help='Number of models (default: 200)')
+    parser.add_argument('--properties', type=int, default=20, help='Properties per model (default: 20)')
+    parser.add_argument('--ref-depth', type=int, default=6, help='Length of allOf $ref chains (default: 6)')
+    parser.add_argument('--tags', type=int, default=20, help='Number of tags (default: 20)')
+    parser.add_argument('--swagger2', action='store_true', help='Generate Swagger 2.0 instead of OpenAPI 3.0')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed (default: 0)')
+
+    args = parser.parse_args()
+
+    spec = generate_spec(
+        paths=args.paths,
+        schemas=args.schemas,
+        properties=args.properties,
+        ref_depth=args.ref_depth,
+        tags=args.tags,
+        version='2.0' if args.swagger2 else '3.0',
+        seed=args.seed
+    )
+    write_spec(spec, args.output)
+    print(f"Synthetic spec written to: {args.output}", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
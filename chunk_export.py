@@ -0,0 +1,150 @@
+"""
+Token-budgeted chunks for embedding and retrieval pipelines
+
+Each operation becomes a self-contained chunk: the API title, the
+operation as rendered in the Markdown docs and, inlined after it, the
+component schemas it reaches through $ref plus its inline request and
+response body schemas. A chunk over the size budget is split into parts
+that each repeat the operation's heading. Every chunk carries an ID
+derived from its text and its place (spec, operation and part), so after a
+spec change only the chunks whose text changed need to be embedded again.
+"""
+import hashlib
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+DEFAULT_MAX_TOKENS = 512
+
+# Rough size of a token in characters for English prose and Markdown
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count, without depending on a particular tokenizer"""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def spec_source(spec_path: Path) -> str:
+    """Name of a spec in chunk IDs: <platform>/<file>, as in api_specs/"""
+    spec_path = Path(spec_path)
+    return f"{spec_path.parent.name}/{spec_path.name}"
+
+
+def chunk_id(text: str, *place: Any) -> str:
+    """Hash of a chunk's text and its place, so that identical parts of different operations differ"""
+    digest = hashlib.sha256()
+    for value in place:
+        digest.update(f"{value}\0".encode('utf-8'))
+    digest.update(text.encode('utf-8'))
+    return digest.hexdigest()[:32]
+
+
+def split_text(text: str, max_tokens: int) -> List[str]:
+    """Split text at line boundaries (or mid-line if a line alone is too long) into pieces within max_tokens"""
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    pieces = []
+    current = ''
+    for line in text.split('\n'):
+        while len(line) > max_chars:
+            if current:
+                pieces.append(current)
+                current = ''
+            pieces.append(line[:max_chars])
+            line = line[max_chars:]
+        candidate = f"{current}\n{line}" if current else line
+        if len(candidate) > max_chars and current:
+            pieces.append(current)
+            current = line
+        else:
+            current = candidate
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def pack(pieces: List[str], header: str, continued_header: str, max_tokens: int) -> List[str]:
+    """Greedily pack pieces into chunks, each starting with a header and fitting max_tokens
+
+    Pieces that do not fit a chunk on their own are split first.
+    """
+    chunks = []
+    current = header
+    current_pieces = 0
+    room = max_tokens - estimate_tokens(continued_header + '\n\n')
+    for piece in pieces:
+        for part in split_text(piece, room) if estimate_tokens(piece) > room else [piece]:
+            candidate = f"{current}\n\n{part}"
+            if current_pieces and estimate_tokens(candidate) > max_tokens:
+                chunks.append(current)
+                candidate = f"{continued_header}\n\n{part}"
+            current = candidate
+            current_pieces += 1
+    chunks.append(current)
+    return chunks
+
+
+def body_schemas(converter, operation: Dict[str, Any]) -> Iterator[tuple]:
+    """(label, schema) for the inline object schemas of an operation's request and response bodies
+
+    Schemas that are $refs to components are left out; they are inlined by name.
+    """
+    bodies = [('Request body', converter._deref(operation.get('requestBody')))]
+    bodies += [(f"Response {status_code}", converter._deref(response))
+               for status_code, response in (operation.get('responses') or {}).items()]
+
+    seen = set()
+    for label, body in bodies:
+        if not isinstance(body, dict) or not isinstance(body.get('content'), dict):
+            continue
+        for content_type, media in body['content'].items():
+            schema = media.get('schema') if isinstance(media, dict) else None
+            if not isinstance(schema, dict) or '$ref' in schema:
+                continue
+            name = f"{label} ({content_type})"
+            if schema.get('type') == 'array' and isinstance(schema.get('items'), dict) and '$ref' not in schema['items']:
+                schema, name = schema['items'], f"{label} items ({content_type})"
+            # The same schema is often listed under several media types
+            if (schema.get('properties') or schema.get('allOf')) and id(schema) not in seen:
+                seen.add(id(schema))
+                yield name, schema
+
+
+def iter_chunk_records(converter, selection=None, max_tokens: int = DEFAULT_MAX_TOKENS,
+                       source: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """Yield one record per chunk: ID, operation, part number and Markdown text
+
+    source names the spec (see spec_source) and goes into the IDs, so
+    chunks of different specs never share one.
+    """
+    title = converter.info.get('title', 'API Documentation')
+    if version := converter.info.get('version'):
+        title += f" v{version}"
+    schemas = converter.components.get('schemas') or {}
+
+    wanted, by_tag, _ = converter._apply_selection(selection)
+    if 'endpoints' not in wanted:
+        return
+    for endpoint in converter.endpoints if by_tag is None else converter._unique_endpoints(by_tag):
+        names = converter._referenced_schemas([endpoint])
+        pieces = [converter._format_endpoint(endpoint)]
+        pieces += [
+            converter._render_fragment('schema', name, schema, lambda: converter._render_schema(name, schema)).rstrip()
+            for name, schema in schemas.items() if name in names
+        ]
+        pieces += [converter._render_schema(label, schema).rstrip()
+                   for label, schema in body_schemas(converter, endpoint.operation)]
+
+        heading = f"#### `{endpoint.method} {endpoint.path}`"
+        texts = pack(pieces, f"# {title}", f"# {title}\n\n{heading} (continued)", max_tokens)
+        for part, text in enumerate(texts, 1):
+            yield {
+                'id': chunk_id(text, source or '', endpoint.method, endpoint.path, part),
+                'method': endpoint.method,
+                'path': endpoint.path,
+                'operation_id': endpoint.operation_id,
+                'part': part,
+                'parts': len(texts),
+                'tokens': estimate_tokens(text),
+                'schemas': sorted(names),
+                'text': text
+            }
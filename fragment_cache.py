@@ -0,0 +1,233 @@
+"""
+Per-fragment cache of rendered Markdown
+
+Each rendered unit of a document (an operation, a schema, a security
+scheme) is keyed by a hash of its input, including everything it reaches
+through $refs, and the rendered Markdown is stored per spec. On the next
+run only fragments whose key changed are rendered again.
+"""
+import os
+import json
+import hashlib
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+# Bump when the on-disk format changes
+FRAGMENT_CACHE_VERSION = 1
+
+
+def canonical_json(obj: Any) -> bytes:
+    """Serialize obj deterministically for hashing"""
+    return json.dumps(obj, sort_keys=True, separators=(',', ':'), default=str).encode('utf-8')
+
+
+class FragmentCache:
+    """Rendered fragments for one spec, stored as a JSON file
+
+    Entries not used during a run are dropped when the cache is saved, so
+    the file only ever holds fragments of the latest version of the spec.
+    Runs that render part of a document save without pruning.
+    """
+
+    def __init__(self, cache_dir: Optional[Path], spec_path: Path, salt: str = ''):
+        """With cache_dir None the fragments only live in memory"""
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.path = None
+        if self.cache_dir is not None:
+            name = hashlib.sha256(str(Path(spec_path).resolve()).encode('utf-8')).hexdigest()
+            self.path = self.cache_dir / f"{name}.json"
+        self.salt = salt
+        self.fragments = {}
+        self.used = {}
+        self.hits = 0
+        self.misses = 0
+        self.load()
+
+    def load(self):
+        """Read cached fragments, starting empty if missing or unreadable"""
+        if self.path is None:
+            return
+        try:
+            data = json.loads(self.path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return
+
+        if data.get('version') == FRAGMENT_CACHE_VERSION and data.get('salt') == self.salt:
+            self.fragments = data.get('fragments', {})
+
+    def save(self, prune: bool = True):
+        """Write back the fragments used in this run, if anything changed
+
+        Without prune, fragments rendered in this run are added to the
+        cached ones instead of replacing them; use this when only part of
+        the document was rendered.
+        """
+        if self.path is None:
+            return
+        if prune:
+            if not self.misses and len(self.used) == len(self.fragments):
+                return
+            fragments = self.used
+        else:
+            if not self.misses:
+                return
+            fragments = {**self.fragments, **self.used}
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        data = {'version': FRAGMENT_CACHE_VERSION, 'salt': self.salt, 'fragments': fragments}
+        fd, tmp_name = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp_name, self.path)
+        except BaseException:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+            raise
+
+    def start_run(self):
+        """Begin another render pass in the same process, keeping the last pass warm"""
+        if self.used:
+            self.fragments = self.used
+        self.used = {}
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, key: str, render: Callable[[], str]) -> str:
+        """Return the cached Markdown for key, rendering and storing it on a miss"""
+        text = self.fragments.get(key)
+        if text is None:
+            text = render()
+            self.misses += 1
+        else:
+            self.hits += 1
+        self.used[key] = text
+        return text
+
+
+class FragmentHasher:
+    """Computes fragment keys that cover everything a fragment reaches via $ref
+
+    Hashes of ref targets are memoized, so each referenced object is
+    serialized once per document no matter how many fragments use it.
+    Refs that reach each other (a strongly connected component of the ref
+    graph, found with Tarjan's algorithm) share one hash of all their
+    members, so cyclic schemas are hashed once as well, whichever ref the
+    walk starts from.
+    """
+
+    def __init__(self, resolve: Callable[[str], Any]):
+        self.resolve = resolve
+        self.ref_hashes: Dict[str, str] = {}
+
+    def key(self, kind: str, name: str, obj: Any) -> str:
+        """Key for a fragment of the given kind and name built from obj"""
+        digest = hashlib.sha256(f"{kind}\0{name}\0".encode('utf-8'))
+        digest.update(self.digest(obj).encode('ascii'))
+        return digest.hexdigest()
+
+    def digest(self, obj: Any) -> str:
+        """Hash of obj and everything it reaches through $ref"""
+        digest = hashlib.sha256(canonical_json(obj))
+        for ref in sorted(self._collect_refs(obj)):
+            if ref not in self.ref_hashes:
+                self._hash_components(ref)
+            digest.update(f"\0{ref}\0{self.ref_hashes[ref]}".encode('utf-8'))
+        return digest.hexdigest()
+
+    def _hash_components(self, root: str):
+        """Hash every ref reachable from root, one strongly connected component at a time
+
+        An iterative Tarjan walk; components are completed (and hashed)
+        after every component they reference.
+        """
+        edges: Dict[str, tuple] = {}
+        index: Dict[str, int] = {}
+        low: Dict[str, int] = {}
+        stack: List[str] = []
+        on_stack = set()
+        work = [(root, 0)]
+        while work:
+            ref, position = work.pop()
+            if position == 0:
+                index[ref] = low[ref] = len(index)
+                stack.append(ref)
+                on_stack.add(ref)
+                try:
+                    target = self.resolve(ref)
+                except Exception:
+                    target = None
+                edges[ref] = (target, sorted(self._collect_refs(target)))
+
+            successors = edges[ref][1]
+            descended = False
+            while position < len(successors):
+                successor = successors[position]
+                position += 1
+                if successor in self.ref_hashes:
+                    continue
+                if successor not in index:
+                    work.append((ref, position))
+                    work.append((successor, 0))
+                    descended = True
+                    break
+                if successor in on_stack:
+                    low[ref] = min(low[ref], index[successor])
+            if descended:
+                continue
+
+            if low[ref] == index[ref]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+                    if member == ref:
+                        break
+                self._hash_component(component, edges)
+            if work:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[ref])
+
+    def _hash_component(self, component: List[str], edges: Dict[str, tuple]):
+        """Memoize the hashes of one strongly connected component of refs"""
+        if len(component) == 1 and component[0] not in edges[component[0]][1]:
+            ref = component[0]
+            target, refs = edges[ref]
+            digest = hashlib.sha256(canonical_json(target))
+            for successor in refs:
+                digest.update(f"\0{successor}\0{self.ref_hashes[successor]}".encode('utf-8'))
+            self.ref_hashes[ref] = digest.hexdigest()
+            return
+
+        # Members are hashed in sorted order and refer to each other by name only
+        members = set(component)
+        digest = hashlib.sha256(b'cycle')
+        for member in sorted(members):
+            target, refs = edges[member]
+            digest.update(f"\0{member}\0".encode('utf-8'))
+            digest.update(canonical_json(target))
+            for successor in refs:
+                value = '' if successor in members else self.ref_hashes[successor]
+                digest.update(f"\0{successor}\0{value}".encode('utf-8'))
+        component_hash = digest.hexdigest()
+        for member in members:
+            self.ref_hashes[member] = hashlib.sha256(f"{component_hash}\0{member}".encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _collect_refs(obj: Any) -> set:
+        refs = set()
+        stack = [obj]
+        while stack:
+            current = stack.pop()
+            if isinstance(current, dict):
+                ref = current.get('$ref')
+                if isinstance(ref, str):
+                    refs.add(ref)
+                stack.extend(current.values())
+            elif isinstance(current, list):
+                stack.extend(current)
+        return refs
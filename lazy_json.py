@@ -0,0 +1,212 @@
+"""
+Memory-bounded loading of large JSON specifications
+
+The file is memory-mapped and scanned once for the byte offsets of object
+members; nothing is parsed until a member is used. The root object,
+`paths`, `components` and each `components` section become LazyObject
+mappings. Every other value (one path item, one schema, `info`) is parsed
+with json.loads from its own slice of the file when it is accessed. Path
+items and components are not kept once parsed, apart from a small number
+of recently used ones, so memory use depends on the largest entry rather
+than on the size of the file. What stays resident is the offset index:
+one key and two integers per entry.
+"""
+import re
+import json
+import mmap
+from collections import OrderedDict
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+# Member paths that are loaded as LazyObjects; '*' matches any key
+LAZY_PATHS = {(), ('paths',), ('components',), ('components', '*')}
+
+# Containers whose parsed members are kept, because they are few and small
+RETAINED_PATHS = {(), ('components',)}
+
+# Parsed members of other lazy containers kept for reuse, per container
+RECENT_SIZE = 64
+
+_WHITESPACE = re.compile(rb'[ \t\r\n]*')
+_STRING = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"', re.S)
+_SCALAR_END = re.compile(rb'[,}\]\s]')
+# Everything up to the next bracket outside a string, in one regex call
+_TO_BRACKET = re.compile(rb'(?:[^"{}\[\]]+|"[^"\\]*(?:\\.[^"\\]*)*")*', re.S)
+
+
+def _skip_whitespace(buf, pos: int) -> int:
+    return _WHITESPACE.match(buf, pos).end()
+
+
+def _string_end(buf, pos: int) -> int:
+    match = _STRING.match(buf, pos)
+    if match is None:
+        raise ValueError(f"Unterminated JSON string at byte {pos}")
+    return match.end()
+
+
+def value_end(buf, pos: int) -> int:
+    """Offset just past the JSON value starting at pos, found without parsing it"""
+    first = buf[pos:pos + 1]
+    if first == b'"':
+        return _string_end(buf, pos)
+    if first in (b'{', b'['):
+        depth = 0
+        while True:
+            char = buf[pos:pos + 1]
+            if char in (b'{', b'['):
+                depth += 1
+            elif char in (b'}', b']'):
+                depth -= 1
+                if depth == 0:
+                    return pos + 1
+            else:
+                raise ValueError(f"Unterminated JSON value at byte {pos}")
+            pos = _TO_BRACKET.match(buf, pos + 1).end()
+    if not first:
+        raise ValueError(f"Expected a JSON value at byte {pos}")
+    match = _SCALAR_END.search(buf, pos)
+    return match.start() if match else len(buf)
+
+
+def is_lazy(path: Tuple[str, ...]) -> bool:
+    return path in LAZY_PATHS or path[:-1] + ('*',) in LAZY_PATHS
+
+
+def index_object(buf, start: int, path: Tuple[str, ...] = ()) -> Tuple[Dict[str, tuple], int]:
+    """Offsets of the members of the JSON object starting at start, and the offset just past it
+
+    Each key maps to (value start, value end, index); index is the
+    index_object() result of a nested lazy container, found in the same
+    pass, and None for other values.
+    """
+    spans = {}
+    end = start + 1
+    for key, value_start, end, index in _iter_members(buf, start, path):
+        spans[key] = (value_start, end, index)
+    return spans, _skip_whitespace(buf, end) + 1
+
+
+def _iter_members(buf, start: int, path: Tuple[str, ...]) -> Iterator[tuple]:
+    pos = _skip_whitespace(buf, start + 1)
+    if buf[pos:pos + 1] == b'}':
+        return
+    while True:
+        key_end = _string_end(buf, pos)
+        raw = buf[pos:key_end]
+        key = json.loads(raw) if b'\\' in raw else raw[1:-1].decode('utf-8')
+
+        pos = _skip_whitespace(buf, key_end)
+        if buf[pos:pos + 1] != b':':
+            raise ValueError(f"Expected ':' after object key at byte {pos}")
+        pos = _skip_whitespace(buf, pos + 1)
+        index = None
+        if is_lazy(path + (key,)) and buf[pos:pos + 1] == b'{':
+            index = index_object(buf, pos, path + (key,))
+            end = index[1]
+        else:
+            end = value_end(buf, pos)
+        yield key, pos, end, index
+
+        pos = _skip_whitespace(buf, end)
+        separator = buf[pos:pos + 1]
+        if separator == b'}':
+            return
+        if separator != b',':
+            raise ValueError(f"Expected ',' or '}}' in object at byte {pos}")
+        pos = _skip_whitespace(buf, pos + 1)
+
+
+class LazyObject(Mapping):
+    """A JSON object in a mapped file whose members are parsed when accessed
+
+    Nested containers listed in LAZY_PATHS are LazyObjects themselves. A
+    transform, if set, is applied to every value as it is parsed (the ref
+    resolver uses it to rebase refs in external documents). Assigned
+    members override the file and are kept in memory.
+    """
+
+    def __init__(self, buf, start: int, path: Tuple[str, ...] = (),
+                 transform: Optional[Callable[[Any], Any]] = None, spans: Optional[Dict[str, tuple]] = None):
+        self.buf = buf
+        self.start = start
+        self.path = path
+        self.transform = transform
+        self.retain = path in RETAINED_PATHS
+        self._spans = spans
+        self._values: Dict[str, Any] = {}
+        self._recent: OrderedDict = OrderedDict()
+
+    @property
+    def spans(self) -> Dict[str, tuple]:
+        """Key -> (start, end, index) of every member, see index_object(); found on first use"""
+        if self._spans is None:
+            self._spans = index_object(self.buf, self.start, self.path)[0]
+        return self._spans
+
+    def set_transform(self, transform: Callable[[Any], Any]):
+        self.transform = transform
+        for value in self._values.values():
+            if isinstance(value, LazyObject):
+                value.set_transform(transform)
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._values:
+            return self._values[key]
+        if key in self._recent:
+            self._recent.move_to_end(key)
+            return self._recent[key]
+
+        start, end, index = self.spans[key]
+        if index is not None:
+            value = LazyObject(self.buf, start, self.path + (key,), self.transform, index[0])
+            self._values[key] = value
+            return value
+
+        value = json.loads(self.buf[start:end])
+        if self.transform is not None:
+            value = self.transform(value)
+        if self.retain:
+            self._values[key] = value
+        else:
+            self._recent[key] = value
+            if len(self._recent) > RECENT_SIZE:
+                self._recent.popitem(last=False)
+        return value
+
+    def __setitem__(self, key: str, value: Any):
+        self.spans.setdefault(key, None)
+        self._recent.pop(key, None)
+        self._values[key] = value
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.spans
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.spans)
+
+    def __len__(self) -> int:
+        return len(self.spans)
+
+    def __repr__(self) -> str:
+        location = '/'.join(self.path) or 'root'
+        return f"LazyObject({location}, {len(self)} members)"
+
+
+def load_lazy_json(file_path: Path) -> Any:
+    """Map a JSON file and return its root as a LazyObject
+
+    Documents whose root is not an object, and empty files (which cannot
+    be mapped), are parsed in full.
+    """
+    with open(file_path, 'rb') as f:
+        if not f.seek(0, 2):
+            return json.loads(b'')
+        buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    # A UTF-8 byte order mark is skipped like json.loads does for bytes
+    start = _skip_whitespace(buf, 3 if buf[:3] == b'\xef\xbb\xbf' else 0)
+    if buf[start:start + 1] != b'{':
+        return json.loads(buf[:])
+    return LazyObject(buf, start)
@@ -4,40 +4,612 @@ OpenAPI/Swagger to Markdown Converter
 
 Converts OpenAPI/Swagger specifications (YAML or JSON) into well-organized Markdown documentation.
 """
+import os
 import json
+import re
+import hashlib
 import yaml
 import sys
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterable, Iterator, List, Optional, TextIO
 import argparse
-from datetime import datetime
+from datetime import datetime, timezone
+from functools import lru_cache
+
+from chunk_export import spec_source
+from fragment_cache import FragmentCache, FragmentHasher
+from lazy_json import LazyObject, load_lazy_json
+from output_formats import DEFAULT_FORMAT, DEFAULT_MAX_TOKENS, format_names, get_format
+from output_writer import OutputWriter, hash_file
+from profiling import (
+    PROFILE_COLUMNS, ProfileReport, StageProfiler, emit_metrics, load_metrics_hook, maybe_stage
+)
+from ref_resolver import RefResolver, RefResolutionError, schema_name
+from spec_cache import SpecCache, DEFAULT_CACHE_DIR
+from spec_normalizer import normalize_spec
+
+# Prefer the libyaml-backed loader; it parses large specs many times faster
+try:
+    from yaml import CSafeLoader as SpecLoader
+    YAML_BACKEND = 'libyaml'
+except ImportError:
+    from yaml import SafeLoader as SpecLoader
+    YAML_BACKEND = 'pure-python'
+
+
+HTTP_METHODS = ['get', 'post', 'put', 'delete', 'patch', 'options', 'head']
+SPLIT_MODES = ['tag', 'endpoint']
+
+# Sections of a full document, in output order
+SECTIONS = ['header', 'overview', 'authentication', 'servers', 'endpoints', 'schemas', 'footer']
+
+# JSON specs at least this large are loaded lazily (see lazy_json)
+LAZY_MIN_SIZE = 64 << 20
+
+# Resolved refs memoized at a time for lazily loaded specs
+LAZY_MEMO_LIMIT = 1024
+
+# Characters load_spec_header parses before looking `info` up directly
+HEADER_SCAN_CHARS = 64 << 10
+
+TOP_LEVEL_INFO = re.compile(r"""(?:info|"info"|'info')[ \t]*:""")
+
+FOOTER_DATE = re.compile(r'\*Generated on (\d{4}-\d\d-\d\d \d\d:\d\d:\d\d)(?: UTC)?\*\s*$')
+
+
+@lru_cache(maxsize=None)
+def get_render_version() -> str:
+    """Hash of the rendering code, so cached fragments die with converter changes"""
+    digest = hashlib.sha256()
+    for module_file in (__file__, Path(__file__).with_name('ref_resolver.py'),
+                        Path(__file__).with_name('spec_normalizer.py'),
+                        Path(__file__).with_name('shared_schemas.py'),
+                        Path(__file__).with_name('output_formats.py'),
+                        Path(__file__).with_name('chunk_export.py')):
+        digest.update(Path(module_file).read_bytes())
+    return digest.hexdigest()
+
+
+def slugify(text: str) -> str:
+    """Turn a tag name or path into a safe, stable file name stem"""
+    return re.sub(r'[^a-z0-9]+', '-', text.lower()).strip('-') or 'root'
+
+
+def join_sections(sections: Iterable[Iterable[str]]) -> Iterator[str]:
+    """Join sections of lines the way generate_markdown does, as a stream
+    
+    Lines within a section are separated by a newline, non-empty sections by
+    a blank line.
+    """
+    separator = ''
+    for lines in sections:
+        prefix = separator
+        for line in lines:
+            yield prefix + line
+            prefix = '\n'
+            separator = '\n\n'
+
+
+def compact_record(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Drop the keys of a structured record that carry no value"""
+    return {key: value for key, value in record.items() if value is not None and value != [] and value != {}}
+
+
+def utc_date(value: datetime) -> datetime:
+    """value in UTC; naive values (ISO dates without an offset, old manifests) are taken to be UTC"""
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+def generate_footer(build_date: Optional[datetime] = None) -> str:
+    """Documentation footer stamped with build_date, or the current time, in UTC"""
+    build_date = utc_date(build_date) if build_date else datetime.now(timezone.utc)
+    return f"\n---\n\n*Generated on {build_date.strftime('%Y-%m-%d %H:%M:%S')} UTC*"
+
+
+def resolve_build_date(value: Optional[str] = None, spec_path: Optional[Path] = None) -> datetime:
+    """Timestamp for the documentation footer
+    
+    value is 'now', 'mtime' (modification time of spec_path), 'content' or an
+    ISO 8601 date/time. Without a value, SOURCE_DATE_EPOCH is honoured when
+    set, as in other reproducible builds, and the current time is used
+    otherwise. 'content' resolves to the current time; callers that know an
+    earlier build of the same content (see reusable_build_date) keep its date.
+    The result is always in UTC, so the footer does not depend on the
+    timezone of the machine that builds it.
+    """
+    if value is None:
+        if epoch := os.environ.get('SOURCE_DATE_EPOCH'):
+            return datetime.fromtimestamp(int(epoch), tz=timezone.utc)
+        value = 'now'
+    
+    if value == 'now':
+        return datetime.now(timezone.utc)
+    if value == 'content':
+        return datetime.now(timezone.utc).replace(microsecond=0)
+    if value == 'mtime':
+        if spec_path is None:
+            raise ValueError("build date 'mtime' needs a spec file")
+        return datetime.fromtimestamp(Path(spec_path).stat().st_mtime, tz=timezone.utc)
+    try:
+        return utc_date(datetime.fromisoformat(value))
+    except ValueError:
+        raise ValueError(f"Invalid build date '{value}', expected now, mtime, content or an ISO 8601 date/time")
+
+
+def read_build_date(path: Path) -> Optional[datetime]:
+    """Footer timestamp of an existing Markdown document, or None"""
+    try:
+        with open(path, 'rb') as f:
+            f.seek(max(f.seek(0, 2) - 256, 0))
+            tail = f.read().decode('utf-8', 'replace')
+    except OSError:
+        return None
+    match = FOOTER_DATE.search(tail)
+    return utc_date(datetime.strptime(match.group(1), '%Y-%m-%d %H:%M:%S')) if match else None
+
+
+def reusable_build_date(converter: 'OpenAPIToMarkdown', output: Path, split: Optional[str] = None,
+                        selection: Optional['Selection'] = None) -> Optional[datetime]:
+    """Footer date of the Markdown at output if converter reproduces it exactly, for --build-date content
+    
+    output is the document, or the directory of split output. The
+    converter's build date is left unchanged.
+    """
+    previous = read_build_date(output / 'index.md' if split else output)
+    if previous is None:
+        return None
+    
+    build_date, converter.build_date = converter.build_date, previous
+    try:
+        if split:
+            for name, content in converter.iter_shards(split):
+                if hashlib.sha256(content.encode('utf-8')).hexdigest() != hash_file(output / name):
+                    return None
+            return previous
+        digest = hashlib.sha256()
+        for chunk in get_format('markdown').render(converter, selection):
+            digest.update(chunk.encode('utf-8'))
+        return previous if digest.hexdigest() == hash_file(output) else None
+    finally:
+        converter.build_date = build_date
+
+
+class Endpoint:
+    """Index record for a single operation in a spec"""
+    
+    __slots__ = ('method', 'path', 'tags', 'operation_id', 'operation')
+    
+    def __init__(self, method: str, path: str, operation: Dict[str, Any]):
+        self.method = method
+        self.path = path
+        self.tags = operation.get('tags') or []
+        self.operation_id = operation.get('operationId')
+        self.operation = operation
+    
+    def __repr__(self) -> str:
+        return f"Endpoint({self.method} {self.path})"
+
+
+class LazyEndpoint(Endpoint):
+    """Index record for an operation of a lazily loaded spec
+    
+    The operation is parsed again from the spec file whenever it is used,
+    so indexing every operation does not keep them all in memory.
+    """
+    
+    __slots__ = ('paths',)
+    
+    def __init__(self, method: str, path: str, operation: Dict[str, Any], paths: LazyObject):
+        self.method = method
+        self.path = path
+        # Tag names repeat across operations; each is stored once
+        self.tags = [sys.intern(tag) if isinstance(tag, str) else tag for tag in operation.get('tags') or []]
+        self.operation_id = operation.get('operationId')
+        self.paths = paths
+    
+    @property
+    def operation(self) -> Dict[str, Any]:
+        return self.paths[self.path][self.method.lower()]
+
+
+class Selection:
+    """Which sections and which operations to render
+    
+    Operations are kept when they match every filter given: one of tags,
+    a path starting with path_prefix, one of operation_ids. When operations
+    are filtered, the schemas section only lists the schemas they reference.
+    """
+    
+    __slots__ = ('sections', 'tags', 'path_prefix', 'operation_ids')
+    
+    def __init__(self, sections: Optional[Iterable[str]] = None, tags: Optional[Iterable[str]] = None,
+                 path_prefix: Optional[str] = None, operation_ids: Optional[Iterable[str]] = None):
+        self.sections = list(sections) if sections else list(SECTIONS)
+        unknown = [name for name in self.sections if name not in SECTIONS]
+        if unknown:
+            raise ValueError(f"Unknown sections {unknown}, expected some of {SECTIONS}")
+        self.tags = set(tags) if tags else None
+        self.path_prefix = path_prefix
+        self.operation_ids = set(operation_ids) if operation_ids else None
+    
+    @property
+    def filters_endpoints(self) -> bool:
+        return bool(self.tags or self.path_prefix or self.operation_ids)
 
 
 class OpenAPIToMarkdown:
     """Converts OpenAPI specifications to Markdown documentation"""
     
-    def __init__(self, spec: Dict[str, Any]):
+    def __init__(self, spec: Dict[str, Any], base_path: Optional[Path] = None,
+                 fragment_cache: Optional[FragmentCache] = None,
+                 profiler: Optional[StageProfiler] = None,
+                 build_date: Optional[datetime] = None,
+                 shared_schemas: Optional[Dict[str, str]] = None):
         self.spec = spec
+        memo_limit = LAZY_MEMO_LIMIT if isinstance(spec, LazyObject) else None
+        self.resolver = RefResolver(spec, base_path, loader=load_spec_file, memo_limit=memo_limit)
+        self.fragment_cache = fragment_cache
+        self.fragment_hasher = FragmentHasher(self.resolver.resolve) if fragment_cache else None
+        self.profiler = profiler
+        # Fixed footer timestamp for reproducible output; None means the time of rendering
+        self.build_date = build_date
+        # Schema name -> link for schemas documented in a shared library instead of here
+        self.shared_schemas = shared_schemas or {}
         self.info = spec.get('info', {})
         self.servers = spec.get('servers', [])
         self.paths = spec.get('paths', {})
         self.components = spec.get('components', {})
         self.security = spec.get('security', [])
         self.tags = spec.get('tags', [])
+        self._endpoints = None
+        self._endpoints_by_tag = None
+        self._rendered_endpoints = {}
+        # Listings still to come per multi-tag operation while the endpoints section is generated
+        self._pending_endpoints = {}
+    
+    def generate_markdown(self, selection: Optional[Selection] = None) -> str:
+        """Generate complete Markdown documentation, or only the selected parts"""
+        return ''.join(self.iter_markdown(selection))
+    
+    def iter_markdown(self, selection: Optional[Selection] = None) -> Iterator[str]:
+        """Generate the documentation as a stream of chunks
+        
+        Joining the chunks gives exactly generate_markdown(), but endpoints
+        and schemas are rendered one at a time instead of being collected
+        into one large string first.
+        """
+        return join_sections(self._iter_sections(selection))
+    
+    def write_to(self, fileobj: TextIO, selection: Optional[Selection] = None):
+        """Write the documentation to a text file object section by section"""
+        for chunk in self.iter_markdown(selection):
+            fileobj.write(chunk)
+    
+    def _iter_sections(self, selection: Optional[Selection] = None) -> Iterator[Iterable[str]]:
+        """Yield each selected section as an iterable of lines; empty sections yield nothing
+        
+        Sections that were not selected are never rendered, and with
+        operation filters only the matching operations and the schemas
+        they reference are looked at.
+        """
+        wanted, by_tag, schema_names = self._apply_selection(selection)
+        
+        render = {
+            'header': self._generate_header,
+            'overview': self._generate_overview,
+            'authentication': self._generate_authentication,
+            'servers': self._generate_servers,
+            'endpoints': lambda: self._generate_endpoints(by_tag),
+            'schemas': lambda: self._generate_schemas(schema_names),
+            'footer': self._generate_footer
+        }
+        
+        for name in SECTIONS:
+            if name not in wanted:
+                continue
+            
+            # Stream the large sections unless each section is timed whole
+            if name == 'endpoints' and self.profiler is None:
+                yield self._iter_endpoints(by_tag)
+            elif name == 'schemas' and self.profiler is None:
+                yield self._iter_schemas(schema_names)
+            else:
+                with maybe_stage(self.profiler, f"_generate_{name}"):
+                    text = render[name]()
+                yield [text] if text else []
+    
+    def _apply_selection(self, selection: Optional[Selection]) -> tuple:
+        """Resolve a selection to (sections, endpoints by tag, schema names)
+        
+        The endpoints and schema names are None when every one of them is
+        selected.
+        """
+        wanted = selection.sections if selection is not None else SECTIONS
+        by_tag = schema_names = None
+        if selection is not None and selection.filters_endpoints:
+            by_tag = self._select_endpoints(selection)
+            if 'schemas' in wanted:
+                schema_names = self._referenced_schemas(
+                    endpoint for endpoints in by_tag.values() for endpoint in endpoints
+                )
+        return wanted, by_tag, schema_names
+    
+    def iter_records(self, selection: Optional[Selection] = None) -> Iterator[Dict[str, Any]]:
+        """Generate the documentation as structured records instead of Markdown
+        
+        Yields an 'api' record (title, overview, security schemes, servers),
+        then one 'endpoint' record per operation and one 'schema' record per
+        component schema, walking the same endpoint index, selection and
+        $ref resolution as the Markdown output.
+        """
+        wanted, by_tag, schema_names = self._apply_selection(selection)
+        
+        if any(section in wanted for section in ('header', 'overview', 'authentication', 'servers')):
+            yield self._api_record(wanted)
+        
+        if 'endpoints' in wanted:
+            for endpoint in self.endpoints if by_tag is None else self._unique_endpoints(by_tag):
+                yield self._endpoint_record(endpoint)
+        
+        if 'schemas' in wanted:
+            for name, schema in (self.components.get('schemas') or {}).items():
+                if schema_names is None or name in schema_names:
+                    yield self._schema_record(name, schema)
+    
+    def _api_record(self, wanted: Iterable[str]) -> Dict[str, Any]:
+        """The API-level record for the selected header, overview, authentication and servers"""
+        record = {'kind': 'api'}
+        if 'header' in wanted:
+            record.update(title=self.info.get('title'), version=self.info.get('version'))
+        if 'overview' in wanted:
+            record.update(
+                description=self.info.get('description'),
+                contact=self.info.get('contact'),
+                license=self.info.get('license')
+            )
+        if 'authentication' in wanted:
+            record['security_schemes'] = {
+                name: self._deref(scheme)
+                for name, scheme in (self.components.get('securitySchemes') or {}).items()
+            }
+            record['security'] = self.security
+        if 'servers' in wanted:
+            record['servers'] = self.servers
+        return compact_record(record)
+    
+    def _endpoint_record(self, endpoint: Endpoint) -> Dict[str, Any]:
+        """Structured form of one operation, with schemas given as in the Markdown"""
+        operation = endpoint.operation
+        
+        parameters = []
+        for param in operation.get('parameters') or []:
+            param = self._deref(param)
+            if not isinstance(param, dict):
+                continue
+            schema = param.get('schema')
+            parameters.append(compact_record({
+                'name': param.get('name'),
+                'in': param.get('in'),
+                'type': self._get_schema_ref(schema) if isinstance(schema, dict) else None,
+                'required': bool(param.get('required', False)),
+                'description': param.get('description')
+            }))
+        
+        request_body = self._deref(operation.get('requestBody'))
+        if isinstance(request_body, dict):
+            request_body = compact_record({
+                'description': request_body.get('description'),
+                'required': request_body.get('required'),
+                'content': self._content_types(request_body.get('content'))
+            })
+        
+        responses = {}
+        for status_code, response in (operation.get('responses') or {}).items():
+            response = self._deref(response)
+            if isinstance(response, dict):
+                responses[str(status_code)] = compact_record({
+                    'description': response.get('description'),
+                    'content': self._content_types(response.get('content'))
+                })
+        
+        return compact_record({
+            'kind': 'endpoint',
+            'method': endpoint.method,
+            'path': endpoint.path,
+            'operation_id': endpoint.operation_id,
+            'tags': endpoint.tags,
+            'summary': operation.get('summary'),
+            'description': operation.get('description'),
+            'deprecated': operation.get('deprecated'),
+            'parameters': parameters,
+            'request_body': request_body,
+            'responses': responses,
+            'security': operation.get('security')
+        })
+    
+    def _content_types(self, content: Any) -> Dict[str, str]:
+        """Media type -> schema reference or type of a request or response body"""
+        if not isinstance(content, dict):
+            return {}
+        return {
+            content_type: self._get_schema_ref(spec['schema']) if isinstance(spec.get('schema'), dict) else None
+            for content_type, spec in content.items() if isinstance(spec, dict)
+        }
+    
+    def _schema_record(self, name: str, schema: Dict[str, Any]) -> Dict[str, Any]:
+        """Structured form of one component schema, flattened like the Markdown"""
+        try:
+            schema = self.resolver.flatten(schema)
+        except RefResolutionError:
+            pass
+        
+        required = schema.get('required') or []
+        properties = [
+            compact_record({
+                'name': prop_name,
+                'type': self._get_schema_ref(prop_spec),
+                'required': prop_name in required,
+                'description': prop_spec.get('description'),
+                'format': prop_spec.get('format'),
+                'enum': prop_spec.get('enum')
+            })
+            for prop_name, prop_spec in (schema.get('properties') or {}).items()
+            if isinstance(prop_spec, dict)
+        ]
+        
+        return compact_record({
+            'kind': 'schema',
+            'name': name,
+            'type': schema.get('type', 'object'),
+            'description': schema.get('description'),
+            'enum': schema.get('enum'),
+            'properties': properties
+        })
     
-    def generate_markdown(self) -> str:
-        """Generate complete Markdown documentation"""
-        sections = [
+    def iter_shards(self, split: str) -> Iterator[tuple]:
+        """Generate the documentation split into several files
+        
+        Yields (file name, Markdown) pairs: one shard per tag or per
+        operation depending on split, a schemas.md shard and an index.md
+        page linking to all of them. Shards are rendered one at a time.
+        """
+        if split not in SPLIT_MODES:
+            raise ValueError(f"Unknown split mode '{split}', expected one of {SPLIT_MODES}")
+        
+        used = {'index.md', 'schemas.md'}
+        
+        def unique_name(stem):
+            name, n = f"{stem}.md", 2
+            while name in used:
+                name, n = f"{stem}-{n}.md", n + 1
+            used.add(name)
+            return name
+        
+        # (tag name, tag description, [(file name, label, endpoints)])
+        groups = []
+        shards = []
+        by_tag = self.endpoints_by_tag
+        endpoint_files = {}
+        
+        tag_list = [(tag.get('name', 'Unknown'), tag.get('description')) for tag in self.tags]
+        if None in by_tag:
+            tag_list.append((None, None))
+        
+        for tag_name, description in tag_list:
+            if tag_name not in by_tag:
+                continue
+            
+            entries = []
+            if split == 'tag':
+                name = unique_name(slugify(tag_name or 'other-endpoints'))
+                entries.append((name, tag_name or 'Other Endpoints', by_tag[tag_name]))
+                shards.append((name, tag_name or 'Other Endpoints', description, by_tag[tag_name]))
+            else:
+                for endpoint in by_tag[tag_name]:
+                    key = (endpoint.method, endpoint.path)
+                    if key not in endpoint_files:
+                        endpoint_files[key] = unique_name(slugify(f"{endpoint.method}-{endpoint.path}"))
+                        shards.append((endpoint_files[key], f"{endpoint.method} {endpoint.path}", None, [endpoint]))
+                    entries.append((endpoint_files[key], f"`{endpoint.method} {endpoint.path}`", [endpoint]))
+            groups.append((tag_name, description, entries))
+        
+        yield 'index.md', ''.join(join_sections(self._iter_index_sections(groups, split)))
+        
+        for name, title, description, endpoints in shards:
+            yield name, ''.join(join_sections([self._iter_shard_lines(title, description, endpoints)]))
+        
+        if self.components.get('schemas'):
+            yield 'schemas.md', ''.join(join_sections([["[Back to index](index.md)\n"], self._iter_schemas()]))
+    
+    def write_shards(self, output_dir: Path, split: str, prune: bool = False,
+                     writer: Optional[OutputWriter] = None) -> Dict[str, int]:
+        """Write split documentation into output_dir, skipping unchanged shards
+        
+        Shards are replaced atomically through writer (a fresh OutputWriter
+        by default). With prune, Markdown files left over from shards that no longer exist
+        are removed, so output_dir must be dedicated to this spec.
+        Without a fixed build date, an existing index.md keeps its footer
+        date while no shard changed, so an unchanged document is not rewritten.
+        Returns counts of shards written, unchanged and removed.
+        """
+        writer = writer or OutputWriter()
+        counts = {'written': 0, 'unchanged': 0, 'removed': 0}
+        names = set()
+        
+        index_file = output_dir / 'index.md'
+        build_date = self.build_date
+        previous = read_build_date(index_file) if build_date is None else None
+        index = None
+        self.build_date = build_date or previous
+        try:
+            for name, content in self.iter_shards(split):
+                names.add(name)
+                if previous is not None and name == 'index.md':
+                    index = content  # written last, once it is known whether anything changed
+                    continue
+                if writer.write(output_dir / name, content).changed:
+                    counts['written'] += 1
+                else:
+                    counts['unchanged'] += 1
+        finally:
+            self.build_date = build_date
+        
+        if index is not None:
+            if counts['written'] or hashlib.sha256(index.encode('utf-8')).hexdigest() != hash_file(index_file):
+                footer = generate_footer(previous)
+                index = index[:-len(footer)] + generate_footer()
+            if writer.write(index_file, index).changed:
+                counts['written'] += 1
+            else:
+                counts['unchanged'] += 1
+        
+        if prune:
+            for stale in output_dir.glob('*.md'):
+                if stale.name not in names:
+                    stale.unlink()
+                    counts['removed'] += 1
+        
+        return counts
+    
+    def _iter_index_sections(self, groups: list, split: str) -> Iterator[Iterable[str]]:
+        """Yield the sections of the index page for split output"""
+        for text in (
             self._generate_header(),
             self._generate_overview(),
             self._generate_authentication(),
-            self._generate_servers(),
-            self._generate_endpoints(),
-            self._generate_schemas(),
-            self._generate_footer()
-        ]
+            self._generate_servers()
+        ):
+            yield [text] if text else []
+        
+        if groups:
+            lines = ["## Endpoints\n"]
+            for tag_name, description, entries in groups:
+                if split == 'tag':
+                    name, label, endpoints = entries[0]
+                    count = f"{len(endpoints)} endpoint" + ("s" if len(endpoints) != 1 else "")
+                    line = f"- [{label}]({name}) ({count})"
+                    lines.append(f"{line}: {description.strip()}" if description else line)
+                else:
+                    lines.append(f"### {tag_name or 'Other Endpoints'}\n")
+                    for name, label, endpoints in entries:
+                        summary = endpoints[0].operation.get('summary')
+                        lines.append(f"- [{label}]({name})" + (f": {summary}" if summary else ""))
+                    lines.append("")
+            yield lines
         
-        return '\n\n'.join(filter(None, sections))
+        if self.components.get('schemas'):
+            yield ["## Schemas\n", f"See [Schemas](schemas.md) ({len(self.components['schemas'])} schemas)."]
+        
+        yield [self._generate_footer()]
+    
+    def _iter_shard_lines(self, title: str, description: Optional[str], endpoints: List[Endpoint]) -> Iterator[str]:
+        """Yield the lines of a single tag or endpoint shard"""
+        yield f"# {title}\n"
+        yield "[Back to index](index.md)\n"
+        if description:
+            yield f"{description}\n"
+        for endpoint in endpoints:
+            yield self._format_endpoint(endpoint)
     
     def _generate_header(self) -> str:
         """Generate documentation header"""
@@ -87,37 +659,46 @@ class OpenAPIToMarkdown:
         sections = ["## Authentication\n"]
         
         for name, scheme in self.components['securitySchemes'].items():
-            sections.append(f"### {name}")
-            
-            scheme_type = scheme.get('type', 'Unknown')
-            sections.append(f"**Type**: {scheme_type}")
-            
-            if scheme_type == 'http':
-                sections.append(f"**Scheme**: {scheme.get('scheme', 'Unknown')}")
-                if bearer_format := scheme.get('bearerFormat'):
-                    sections.append(f"**Bearer Format**: {bearer_format}")
-            
-            elif scheme_type == 'apiKey':
-                sections.append(f"**In**: {scheme.get('in', 'Unknown')}")
-                sections.append(f"**Name**: {scheme.get('name', 'Unknown')}")
-            
-            elif scheme_type == 'oauth2':
-                sections.append("**OAuth2 Flows**:")
-                for flow_type, flow_config in scheme.get('flows', {}).items():
-                    sections.append(f"\n**{flow_type.title()} Flow**:")
-                    if auth_url := flow_config.get('authorizationUrl'):
-                        sections.append(f"- Authorization URL: `{auth_url}`")
-                    if token_url := flow_config.get('tokenUrl'):
-                        sections.append(f"- Token URL: `{token_url}`")
-                    if scopes := flow_config.get('scopes'):
-                        sections.append("- Scopes:")
-                        for scope, desc in scopes.items():
-                            sections.append(f"  - `{scope}`: {desc}")
-            
-            if description := scheme.get('description'):
-                sections.append(f"\n{description}")
-            
-            sections.append("")
+            sections.append(self._render_fragment(
+                'securityScheme', name, scheme,
+                lambda: self._render_security_scheme(name, scheme)
+            ))
+        
+        return '\n'.join(sections)
+    
+    def _render_security_scheme(self, name: str, scheme: Dict[str, Any]) -> str:
+        """Render a single security scheme, ending with a blank line"""
+        sections = [f"### {name}"]
+        
+        scheme_type = scheme.get('type', 'Unknown')
+        sections.append(f"**Type**: {scheme_type}")
+        
+        if scheme_type == 'http':
+            sections.append(f"**Scheme**: {scheme.get('scheme', 'Unknown')}")
+            if bearer_format := scheme.get('bearerFormat'):
+                sections.append(f"**Bearer Format**: {bearer_format}")
+        
+        elif scheme_type == 'apiKey':
+            sections.append(f"**In**: {scheme.get('in', 'Unknown')}")
+            sections.append(f"**Name**: {scheme.get('name', 'Unknown')}")
+        
+        elif scheme_type == 'oauth2':
+            sections.append("**OAuth2 Flows**:")
+            for flow_type, flow_config in scheme.get('flows', {}).items():
+                sections.append(f"\n**{flow_type.title()} Flow**:")
+                if auth_url := flow_config.get('authorizationUrl'):
+                    sections.append(f"- Authorization URL: `{auth_url}`")
+                if token_url := flow_config.get('tokenUrl'):
+                    sections.append(f"- Token URL: `{token_url}`")
+                if scopes := flow_config.get('scopes'):
+                    sections.append("- Scopes:")
+                    for scope, desc in scopes.items():
+                        sections.append(f"  - `{scope}`: {desc}")
+        
+        if description := scheme.get('description'):
+            sections.append(f"\n{description}")
+        
+        sections.append("")
         
         return '\n'.join(sections)
     
@@ -149,60 +730,174 @@ class OpenAPIToMarkdown:
         
         return '\n'.join(sections)
     
-    def _generate_endpoints(self) -> str:
+    @property
+    def endpoints(self) -> List[Endpoint]:
+        """All operations in path order, indexed once on first use"""
+        if self._endpoints is None:
+            self._endpoints = [
+                self._make_endpoint(method, path, operation)
+                for path, path_item in self.paths.items()
+                for method, operation in path_item.items()
+                if method in HTTP_METHODS
+            ]
+        return self._endpoints
+    
+    def _make_endpoint(self, method: str, path: str, operation: Dict[str, Any]) -> Endpoint:
+        if isinstance(self.paths, LazyObject):
+            return LazyEndpoint(method.upper(), path, operation, self.paths)
+        return Endpoint(method.upper(), path, operation)
+    
+    @property
+    def endpoints_by_tag(self) -> Dict[Optional[str], List[Endpoint]]:
+        """Operations grouped by tag; untagged operations are under None"""
+        if self._endpoints_by_tag is None:
+            grouped = {}
+            for endpoint in self.endpoints:
+                for tag in endpoint.tags or [None]:
+                    grouped.setdefault(tag, []).append(endpoint)
+            self._endpoints_by_tag = grouped
+        return self._endpoints_by_tag
+    
+    def _select_endpoints(self, selection: Selection) -> Dict[Optional[str], List[Endpoint]]:
+        """Operations matching the selection's filters, grouped like endpoints_by_tag
+        
+        Only path items under path_prefix are visited, and an operation
+        listed under several tags is only grouped under the selected ones.
+        """
+        if selection.path_prefix:
+            path_items = ((path, item) for path, item in self.paths.items() if path.startswith(selection.path_prefix))
+        else:
+            path_items = self.paths.items()
+        
+        grouped = {}
+        for path, path_item in path_items:
+            for method, operation in path_item.items():
+                if method not in HTTP_METHODS:
+                    continue
+                if selection.operation_ids and operation.get('operationId') not in selection.operation_ids:
+                    continue
+                
+                endpoint = self._make_endpoint(method, path, operation)
+                for tag in endpoint.tags or [None]:
+                    if selection.tags is None or tag in selection.tags:
+                        grouped.setdefault(tag, []).append(endpoint)
+        return grouped
+    
+    @staticmethod
+    def _unique_endpoints(by_tag: Dict[Optional[str], List[Endpoint]]) -> List[Endpoint]:
+        """Operations of a tag grouping, each once even when grouped under several tags"""
+        return list(dict.fromkeys(endpoint for group in by_tag.values() for endpoint in group))
+    
+    def _referenced_schemas(self, endpoints: Iterable[Endpoint]) -> set:
+        """Names of the component schemas reachable through $refs from the given operations"""
+        names = set()
+        seen = set()
+        stack = [endpoint.operation for endpoint in endpoints]
+        while stack:
+            current = stack.pop()
+            if isinstance(current, dict):
+                ref = current.get('$ref')
+                if isinstance(ref, str) and ref not in seen:
+                    seen.add(ref)
+                    if (name := schema_name(ref)) is not None:
+                        names.add(name)
+                    try:
+                        stack.append(self.resolver.resolve(ref))
+                    except RefResolutionError:
+                        pass
+                stack.extend(current.values())
+            elif isinstance(current, list):
+                stack.extend(current)
+        return names
+    
+    def _generate_endpoints(self, by_tag: Optional[Dict[Optional[str], List[Endpoint]]] = None) -> str:
         """Generate endpoints section"""
         if not self.paths:
             return None
         
-        sections = ["## Endpoints\n"]
+        return '\n'.join(self._iter_endpoints(by_tag)) or None
+    
+    def _iter_endpoints(self, by_tag: Optional[Dict[Optional[str], List[Endpoint]]] = None) -> Iterator[str]:
+        """Yield the lines of the endpoints section, for all operations or the given groups"""
+        if not self.paths or by_tag == {}:
+            return
         
-        # Group endpoints by tags
-        tagged_endpoints = {}
-        untagged_endpoints = []
+        yield "## Endpoints\n"
         
-        for path, path_item in self.paths.items():
-            for method, operation in path_item.items():
-                if method in ['get', 'post', 'put', 'delete', 'patch', 'options', 'head']:
-                    endpoint_info = {
-                        'path': path,
-                        'method': method.upper(),
-                        'operation': operation
-                    }
-                    
-                    if tags := operation.get('tags'):
-                        for tag in tags:
-                            if tag not in tagged_endpoints:
-                                tagged_endpoints[tag] = []
-                            tagged_endpoints[tag].append(endpoint_info)
-                    else:
-                        untagged_endpoints.append(endpoint_info)
+        tagged_endpoints = by_tag if by_tag is not None else self.endpoints_by_tag
+        untagged_endpoints = tagged_endpoints.get(None, [])
+        
+        # A multi-tag operation's rendering is dropped after its last listing
+        self._pending_endpoints = {}
+        for tag in self.tags:
+            for endpoint in tagged_endpoints.get(tag.get('name', 'Unknown'), []):
+                if len(endpoint.tags) > 1:
+                    key = (endpoint.method, endpoint.path)
+                    self._pending_endpoints[key] = self._pending_endpoints.get(key, 0) + 1
         
         # Generate tagged endpoints
         for tag in self.tags:
             tag_name = tag.get('name', 'Unknown')
             if tag_name in tagged_endpoints:
-                sections.append(f"### {tag_name}")
+                yield f"### {tag_name}"
                 if description := tag.get('description'):
-                    sections.append(f"{description}\n")
+                    yield f"{description}\n"
                 
                 for endpoint in tagged_endpoints[tag_name]:
-                    sections.append(self._format_endpoint(endpoint))
+                    yield self._format_endpoint(endpoint)
                 
-                sections.append("")
+                yield ""
         
         # Generate untagged endpoints
         if untagged_endpoints:
-            sections.append("### Other Endpoints\n")
+            yield "### Other Endpoints\n"
             for endpoint in untagged_endpoints:
-                sections.append(self._format_endpoint(endpoint))
+                yield self._format_endpoint(endpoint)
+    
+    def _format_endpoint(self, endpoint: Endpoint) -> str:
+        """Format a single endpoint, rendering operations with several tags only once"""
+        if len(endpoint.tags) < 2:
+            return self._render_endpoint_fragment(endpoint)
         
-        return '\n'.join(sections)
+        # Only multi-tag operations are kept, so streaming output stays small
+        key = (endpoint.method, endpoint.path)
+        pending = self._pending_endpoints.get(key)
+        if pending is not None:
+            if pending <= 1:
+                del self._pending_endpoints[key]
+                return self._rendered_endpoints.pop(key, None) or self._render_endpoint_fragment(endpoint)
+            self._pending_endpoints[key] = pending - 1
+        if key not in self._rendered_endpoints:
+            self._rendered_endpoints[key] = self._render_endpoint_fragment(endpoint)
+        return self._rendered_endpoints[key]
+    
+    def _render_endpoint_fragment(self, endpoint: Endpoint) -> str:
+        """Render an endpoint through the fragment cache when one is configured"""
+        return self._render_fragment(
+            'endpoint', f"{endpoint.method} {endpoint.path}", endpoint.operation,
+            lambda: self._render_endpoint(endpoint)
+        )
+    
+    def iter_fragments(self) -> Iterator[tuple]:
+        """(kind, name, source) of every cacheable fragment, as passed to _render_fragment"""
+        for name, scheme in (self.components.get('securitySchemes') or {}).items():
+            yield 'securityScheme', name, scheme
+        for endpoint in self.endpoints:
+            yield 'endpoint', f"{endpoint.method} {endpoint.path}", endpoint.operation
+        for name, schema in (self.components.get('schemas') or {}).items():
+            yield 'schema', name, schema
+    
+    def _render_fragment(self, kind: str, name: str, source: Any, render) -> str:
+        """Reuse the cached Markdown for an unchanged fragment, or render it"""
+        if self.fragment_cache is None:
+            return render()
+        return self.fragment_cache.render(self.fragment_hasher.key(kind, name, source), render)
     
-    def _format_endpoint(self, endpoint: Dict[str, Any]) -> str:
-        """Format a single endpoint"""
-        method = endpoint['method']
-        path = endpoint['path']
-        operation = endpoint['operation']
+    def _render_endpoint(self, endpoint: Endpoint) -> str:
+        """Render the Markdown for a single endpoint"""
+        method = endpoint.method
+        path = endpoint.path
+        operation = endpoint.operation
         
         lines = [f"#### `{method} {path}`"]
         
@@ -216,9 +911,10 @@ class OpenAPIToMarkdown:
         if parameters := operation.get('parameters'):
             lines.append("\n**Parameters**:")
             for param in parameters:
+                param = self._deref(param)
                 param_name = param.get('name', 'Unknown')
                 param_in = param.get('in', 'Unknown')
-                param_type = param.get('schema', {}).get('type', 'Unknown')
+                param_type = self._deref(param.get('schema', {})).get('type', 'Unknown')
                 required = param.get('required', False)
                 
                 param_line = f"- `{param_name}` ({param_in}, {param_type}"
@@ -232,7 +928,7 @@ class OpenAPIToMarkdown:
                 lines.append(param_line)
         
         # Request body
-        if request_body := operation.get('requestBody'):
+        if request_body := self._deref(operation.get('requestBody')):
             lines.append("\n**Request Body**:")
             if rb_desc := request_body.get('description'):
                 lines.append(f"{rb_desc}")
@@ -247,6 +943,7 @@ class OpenAPIToMarkdown:
         if responses := operation.get('responses'):
             lines.append("\n**Responses**:")
             for status_code, response in responses.items():
+                response = self._deref(response)
                 response_line = f"- `{status_code}`"
                 if resp_desc := response.get('description'):
                     response_line += f": {resp_desc}"
@@ -261,71 +958,252 @@ class OpenAPIToMarkdown:
         lines.append("---")
         return '\n'.join(lines)
     
-    def _get_schema_ref(self, schema: Dict[str, Any]) -> str:
+    def _deref(self, obj: Any) -> Any:
+        """Resolve a $ref through the shared resolver, leaving broken refs as-is"""
+        try:
+            return self.resolver.deref(obj)
+        except RefResolutionError:
+            return obj
+    
+    def _get_schema_ref(self, schema: Dict[str, Any], _seen: frozenset = frozenset()) -> str:
         """Get schema reference or type"""
         if '$ref' in schema:
-            ref_parts = schema['$ref'].split('/')
-            return ref_parts[-1]
+            ref = schema['$ref']
+            if (name := schema_name(ref)) is not None or ref in _seen:
+                return name or ref.split('/')[-1]
+            # Refs into paths or other inline fragments: describe what they point at
+            target = self._deref(schema)
+            if target is schema:
+                return ref.split('/')[-1]
+            return self._get_schema_ref(target, _seen | {ref})
+        elif schema.get('type') == 'array' and isinstance(schema.get('items'), dict):
+            return f"array[{self._get_schema_ref(schema['items'], _seen)}]"
         elif 'type' in schema:
             return schema['type']
+        elif 'properties' in schema:
+            return 'object'
+        for keyword, separator in [('oneOf', ' | '), ('anyOf', ' | '), ('allOf', ' & ')]:
+            if isinstance(schema.get(keyword), list):
+                return separator.join(self._get_schema_ref(part, _seen) for part in schema[keyword])
         return 'Unknown'
     
-    def _generate_schemas(self) -> str:
+    def _generate_schemas(self, names: Optional[set] = None) -> str:
         """Generate schemas section"""
         if not self.components.get('schemas'):
             return None
         
-        sections = ["## Schemas\n"]
+        return '\n'.join(self._iter_schemas(names)) or None
+    
+    def _iter_schemas(self, names: Optional[set] = None) -> Iterator[str]:
+        """Yield the lines of the schemas section, for all schemas or only the named ones"""
+        schemas = self.components.get('schemas')
+        if not schemas or names == set():
+            return
         
-        for schema_name, schema in self.components['schemas'].items():
-            sections.append(f"### {schema_name}")
-            
-            if description := schema.get('description'):
-                sections.append(f"{description}\n")
-            
-            schema_type = schema.get('type', 'object')
-            sections.append(f"**Type**: `{schema_type}`")
+        yield "## Schemas\n"
+        
+        shared = []
+        for name, schema in schemas.items():
+            if names is not None and name not in names:
+                continue
+            if name in self.shared_schemas:
+                shared.append(name)
+                continue
+            yield self._render_fragment('schema', name, schema, lambda: self._render_schema(name, schema))
+        
+        if shared:
+            library = self.shared_schemas[shared[0]].split('#')[0]
+            yield f"Shared with other specifications, see [Shared Schemas]({library}):\n"
+            for name in shared:
+                yield f"- [{name}]({self.shared_schemas[name]})"
+    
+    def _render_schema(self, name: str, schema: Dict[str, Any]) -> str:
+        """Render a single component schema, ending with a blank line"""
+        return '\n'.join(self._iter_schema_lines(name, schema))
+    
+    def _iter_schema_lines(self, name: str, schema: Dict[str, Any]) -> Iterator[str]:
+        """Yield the lines of a single component schema"""
+        try:
+            schema = self.resolver.flatten(schema)
+        except RefResolutionError:
+            pass
+        
+        yield f"### {name}"
+        
+        if description := schema.get('description'):
+            yield f"{description}\n"
+        
+        schema_type = schema.get('type', 'object')
+        yield f"**Type**: `{schema_type}`"
+        
+        if properties := schema.get('properties'):
+            yield "\n**Properties**:"
+            required_props = schema.get('required', [])
             
-            if properties := schema.get('properties'):
-                sections.append("\n**Properties**:")
-                required_props = schema.get('required', [])
+            for prop_name, prop_spec in properties.items():
+                prop_type = self._get_schema_ref(prop_spec)
+                prop_line = f"- `{prop_name}` ({prop_type}"
                 
-                for prop_name, prop_spec in properties.items():
-                    prop_type = prop_spec.get('type', self._get_schema_ref(prop_spec))
-                    prop_line = f"- `{prop_name}` ({prop_type}"
-                    
-                    if prop_name in required_props:
-                        prop_line += ", **required**"
-                    prop_line += ")"
-                    
-                    if prop_desc := prop_spec.get('description'):
-                        prop_line += f": {prop_desc}"
-                    
-                    sections.append(prop_line)
-            
-            sections.append("")
+                if prop_name in required_props:
+                    prop_line += ", **required**"
+                prop_line += ")"
+                
+                if prop_desc := prop_spec.get('description'):
+                    prop_line += f": {prop_desc}"
+                
+                yield prop_line
         
-        return '\n'.join(sections)
+        yield ""
     
     def _generate_footer(self) -> str:
         """Generate documentation footer"""
-        return f"\n---\n\n*Generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*"
+        return generate_footer(self.build_date)
 
 
-def load_spec_file(file_path: Path) -> Dict[str, Any]:
-    """Load OpenAPI specification from YAML or JSON file"""
+def parse_spec_text(content: str, suffix: str) -> Dict[str, Any]:
+    """Parse specification text according to its file extension
+    
+    YAML is parsed with the libyaml loader when PyYAML was built with it
+    (see YAML_BACKEND); JSON always goes through the json module.
+    """
+    if suffix in ['.yaml', '.yml']:
+        return yaml.load(content, Loader=SpecLoader)
+    elif suffix == '.json':
+        return json.loads(content)
+    else:
+        # Try the fast JSON path first, then fall back to YAML
+        try:
+            return json.loads(content)
+        except ValueError:
+            return yaml.load(content, Loader=SpecLoader)
+
+
+def load_spec_file(file_path: Path, cache: Optional[SpecCache] = None,
+                   lazy: Optional[bool] = None) -> Dict[str, Any]:
+    """Load OpenAPI specification from YAML or JSON file
+    
+    Swagger 2.0 documents are normalized to the OpenAPI 3.x shape. When a
+    SpecCache is given, an unchanged file is returned from the cache
+    (already normalized) instead of being parsed, and freshly parsed files
+    are added to it.
+    
+    JSON files are loaded lazily, bypassing the cache, when lazy is True
+    or (with lazy None) when they are at least LAZY_MIN_SIZE bytes: the
+    file is memory-mapped and path items and components are parsed one
+    at a time as the converter reaches them. Swagger 2.0 documents are
+    still normalized as a whole.
+    """
+    file_path = Path(file_path)
+    if file_path.suffix == '.json':
+        if lazy is None:
+            lazy = file_path.stat().st_size >= LAZY_MIN_SIZE
+        if lazy:
+            return normalize_spec(load_lazy_json(file_path))
+    
+    data = file_path.read_bytes()
+    
+    if cache is not None:
+        spec = cache.get(file_path, data)
+        if spec is not None:
+            return spec
+    
+    spec = normalize_spec(parse_spec_text(data.decode('utf-8'), file_path.suffix))
+    
+    if cache is not None:
+        cache.put(file_path, data, spec)
+    return spec
+
+
+def load_spec_header(file_path: Path) -> Dict[str, Any]:
+    """Load only the top-level `info` block of a specification
+    
+    Reads the document one top-level key at a time, skipping the values of
+    other keys without building them, and stops as soon as `info` has been
+    read, so listing titles and versions does not build the full object
+    tree. When `info` is not among the first HEADER_SCAN_CHARS characters
+    (it may follow a large `paths` block), it is looked up directly
+    instead, see _find_info. Returns an empty dict when there is no `info`
+    mapping.
+    
+    Uses the pure-Python loader because libyaml's loader cannot compose
+    single nodes; it only ever parses the start of the file.
+    """
     with open(file_path, 'r', encoding='utf-8') as f:
-        if file_path.suffix in ['.yaml', '.yml']:
-            return yaml.safe_load(f)
-        elif file_path.suffix == '.json':
-            return json.load(f)
-        else:
-            # Try to parse as YAML first, then JSON
-            content = f.read()
-            try:
-                return yaml.safe_load(content)
-            except yaml.YAMLError:
-                return json.loads(content)
+        loader = yaml.SafeLoader(f)
+        try:
+            loader.get_event()  # StreamStart
+            if not loader.check_event(yaml.DocumentStartEvent):
+                return {}
+            loader.get_event()
+            if not loader.check_event(yaml.MappingStartEvent):
+                return {}
+            loader.get_event()
+            
+            while not loader.check_event(yaml.MappingEndEvent):
+                key_node = loader.compose_node(None, None)
+                if getattr(key_node, 'value', None) == 'info':
+                    info = loader.construct_document(loader.compose_node(key_node, None))
+                    return info if isinstance(info, dict) else {}
+                if not _skip_node(loader, HEADER_SCAN_CHARS):
+                    break
+            else:
+                return {}
+        except yaml.YAMLError:
+            pass
+        finally:
+            loader.dispose()
+    
+    return _find_info(file_path)
+
+
+def _skip_node(loader: yaml.SafeLoader, limit: int) -> bool:
+    """Consume the events of the next node; False once the loader has read past limit characters"""
+    depth = 0
+    while True:
+        if loader.index > limit:
+            return False
+        event = loader.get_event()
+        if isinstance(event, (yaml.MappingStartEvent, yaml.SequenceStartEvent)):
+            depth += 1
+        elif isinstance(event, (yaml.MappingEndEvent, yaml.SequenceEndEvent)):
+            depth -= 1
+        if depth == 0:
+            return True
+
+
+def _find_info(file_path: Path) -> Dict[str, Any]:
+    """Top-level `info` of a spec, looked up without parsing anything else
+    
+    JSON documents are opened as a LazyObject, which scans for member
+    offsets and parses only `info`. In block-style YAML the `info:` line at
+    column 0 and the indented lines after it are collected while streaming
+    through the file, and only those are parsed.
+    """
+    with open(file_path, 'rb') as f:
+        start = f.read(64).lstrip(b'\xef\xbb\xbf \t\r\n')
+    if start.startswith(b'{'):
+        try:
+            root = load_lazy_json(file_path)
+            info = root.get('info') if isinstance(root, (dict, LazyObject)) else None
+        except ValueError:
+            return {}
+        return info if isinstance(info, dict) else {}
+    
+    lines = []
+    with open(file_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if lines:
+                if line.strip() and not line[0].isspace() and not line.startswith('#'):
+                    break
+                lines.append(line)
+            elif TOP_LEVEL_INFO.match(line):
+                lines.append(line)
+    try:
+        data = yaml.load(''.join(lines), Loader=SpecLoader) if lines else None
+    except yaml.YAMLError:
+        return {}
+    info = data.get('info') if isinstance(data, dict) else None
+    return info if isinstance(info, dict) else {}
 
 
 def main():
@@ -335,8 +1213,20 @@ def main():
     parser.add_argument(
         'spec_file',
         type=str,
+        nargs='?',
         help='Path to OpenAPI/Swagger specification file (YAML or JSON)'
     )
+    parser.add_argument(
+        '--url',
+        type=str,
+        help='Download the spec from this URL into api_specs/<platform>/ and convert it'
+    )
+    parser.add_argument(
+        '--platform',
+        type=str,
+        default='remote',
+        help='Platform folder for --url downloads (default: remote)'
+    )
     parser.add_argument(
         '-o', '--output',
         type=str,
@@ -347,17 +1237,140 @@ def main():
         type=str,
         help='Override the API title'
     )
+    parser.add_argument(
+        '--split',
+        choices=SPLIT_MODES,
+        help='Write one file per tag or per endpoint plus index.md into the --output directory'
+    )
+    parser.add_argument(
+        '--format',
+        choices=format_names(),
+        default=DEFAULT_FORMAT,
+        help=f'Output format; json and ndjson hold the endpoints and schemas as records, chunks one '
+             f'token-budgeted, content-addressed chunk per operation for embedding (default: {DEFAULT_FORMAT})'
+    )
+    parser.add_argument(
+        '--max-tokens',
+        type=int,
+        default=DEFAULT_MAX_TOKENS,
+        help=f'Approximate size budget of each chunk in --format chunks (default: {DEFAULT_MAX_TOKENS})'
+    )
+    parser.add_argument(
+        '--sections',
+        type=str,
+        help=f"Comma-separated sections to render (default: all of {','.join(SECTIONS)})"
+    )
+    parser.add_argument(
+        '--tag',
+        action='append',
+        help='Only render operations with this tag (repeatable)'
+    )
+    parser.add_argument(
+        '--path-prefix',
+        type=str,
+        help='Only render operations whose path starts with this prefix, e.g. /v1/apps'
+    )
+    parser.add_argument(
+        '--operation-id',
+        action='append',
+        help='Only render the operation with this operationId (repeatable)'
+    )
+    parser.add_argument(
+        '--build-date',
+        type=str,
+        help="Footer timestamp: 'now', 'mtime' (of the spec file), 'content' (keep the date of the "
+             "existing --output when its content is unchanged) or an ISO 8601 date/time, "
+             "for reproducible output (default: SOURCE_DATE_EPOCH if set, else now)"
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Always parse the spec instead of using the parsed-spec cache'
+    )
+    parser.add_argument(
+        '--cache-dir',
+        type=str,
+        default=str(DEFAULT_CACHE_DIR),
+        help=f'Directory for the parsed-spec cache (default: {DEFAULT_CACHE_DIR})'
+    )
+    parser.add_argument(
+        '--lazy',
+        action='store_true',
+        help=f'Load a JSON spec lazily, parsing one path item or component at a time to bound memory '
+             f'(automatic from {LAZY_MIN_SIZE >> 20} MiB)'
+    )
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='Print wall time and peak memory per stage (load, each section, write) to stderr'
+    )
+    parser.add_argument(
+        '--stats-json',
+        type=str,
+        help='Write per-stage timing and memory as JSON to this file'
+    )
+    parser.add_argument(
+        '--metrics-hook',
+        type=str,
+        help='module:function called with (spec name, stage metrics) after profiling'
+    )
+    parser.add_argument(
+        '-v', '--verbose',
+        action='store_true',
+        help='Print loader details to stderr'
+    )
     
     args = parser.parse_args()
     
+    if args.split and not args.output:
+        parser.error('--split requires --output to name the output directory')
+    if args.split and args.format != 'markdown':
+        parser.error('--split only supports the markdown format')
+    if args.max_tokens < 64:
+        parser.error('--max-tokens must be at least 64')
+    if bool(args.spec_file) == bool(args.url):
+        parser.error('give either a spec file or --url')
+    
+    selection = None
+    if args.sections or args.tag or args.path_prefix or args.operation_id:
+        if args.split:
+            parser.error('--split cannot be combined with --sections, --tag, --path-prefix or --operation-id')
+        try:
+            sections = [name.strip() for name in args.sections.split(',')] if args.sections else None
+            selection = Selection(sections, args.tag, args.path_prefix, args.operation_id)
+        except ValueError as e:
+            parser.error(str(e))
+    
+    if args.verbose:
+        print(f"YAML backend: {YAML_BACKEND}", file=sys.stderr)
+    
+    if args.url:
+        from spec_fetcher import SpecFetcher
+        
+        fetcher = SpecFetcher(workers=1)
+        result = next(fetcher.fetch_all([{'url': args.url, 'platform': args.platform}]))
+        fetcher.close()
+        if result.status == 'error':
+            print(f"Error fetching {args.url}: {result.message}", file=sys.stderr)
+            sys.exit(1)
+        print(f"Fetched {args.url} ({result.status.replace('_', ' ')}): {result.path}", file=sys.stderr)
+        args.spec_file = str(result.path)
+    
     # Load specification
     spec_path = Path(args.spec_file)
     if not spec_path.exists():
         print(f"Error: File '{spec_path}' not found", file=sys.stderr)
         sys.exit(1)
     
+    cache = None if args.no_cache else SpecCache(Path(args.cache_dir))
+    
+    if args.metrics_hook:
+        load_metrics_hook(args.metrics_hook)
+    profiler = StageProfiler() if args.profile or args.stats_json or args.metrics_hook else None
+    
     try:
-        spec = load_spec_file(spec_path)
+        with maybe_stage(profiler, 'load'):
+            spec = load_spec_file(spec_path, cache, lazy=True if args.lazy else None)
     except Exception as e:
         print(f"Error loading specification: {e}", file=sys.stderr)
         sys.exit(1)
@@ -368,17 +1381,70 @@ def main():
             spec['info'] = {}
         spec['info']['title'] = args.title
     
-    # Convert to Markdown
-    converter = OpenAPIToMarkdown(spec)
-    markdown = converter.generate_markdown()
+    # Reuse rendered fragments of unchanged operations and schemas (Markdown only)
+    fragment_cache = None
+    if not args.no_cache and args.format == 'markdown':
+        fragment_cache = FragmentCache(Path(args.cache_dir) / 'fragments', spec_path, get_render_version())
     
-    # Output
-    if args.output:
-        output_path = Path(args.output)
-        output_path.write_text(markdown, encoding='utf-8')
-        print(f"Documentation written to: {output_path}")
+    # Convert to Markdown, streaming sections straight to the destination.
+    # A build date that is just the current time is left to the converter (None),
+    # so split output keeps the index date while no shard changed.
+    build_date = None
+    if args.build_date not in (None, 'now') or (args.build_date is None and os.environ.get('SOURCE_DATE_EPOCH')):
+        try:
+            build_date = resolve_build_date(args.build_date, spec_path)
+        except ValueError as e:
+            parser.error(str(e))
+    converter = OpenAPIToMarkdown(spec, spec_path.parent, fragment_cache, profiler, build_date)
+    if args.build_date == 'content' and args.output and args.format == 'markdown':
+        converter.build_date = reusable_build_date(converter, Path(args.output), args.split, selection) or build_date
+    
+    # When profiling, render everything first so the write stage is timed on its own
+    if args.split:
+        chunks = None
     else:
-        print(markdown)
+        chunks = get_format(args.format).render(
+            converter, selection, max_tokens=args.max_tokens, source=spec_source(spec_path)
+        )
+        if profiler is not None:
+            chunks = list(chunks)
+    
+    # Output
+    with maybe_stage(profiler, 'write'):
+        if args.split:
+            output_dir = Path(args.output)
+            counts = converter.write_shards(output_dir, args.split)
+            print(f"Documentation written to: {output_dir}/ "
+                  f"({counts['written']} files written, {counts['unchanged']} unchanged)")
+        elif args.output:
+            output_path = Path(args.output)
+            if OutputWriter().write(output_path, chunks).changed:
+                print(f"Documentation written to: {output_path}")
+            else:
+                print(f"Documentation unchanged: {output_path}")
+        else:
+            sys.stdout.writelines(chunks)
+            if args.format == 'markdown':
+                print()
+    
+    if fragment_cache is not None:
+        # A selection renders part of the document; keep the fragments it did not touch
+        fragment_cache.save(prune=selection is None)
+        if args.verbose:
+            print(f"Fragments: {fragment_cache.hits} reused, {fragment_cache.misses} rendered", file=sys.stderr)
+    
+    if profiler is not None:
+        report = ProfileReport()
+        report.add(spec_path.name, profiler.stages)
+        emit_metrics(spec_path.name, profiler.stages)
+        
+        if args.profile:
+            rows = [PROFILE_COLUMNS] + report.table_rows()
+            widths = [max(len(row[i]) for row in rows) for i in range(len(PROFILE_COLUMNS))]
+            for row in rows:
+                print('  '.join(cell.ljust(width) for cell, width in zip(row, widths)), file=sys.stderr)
+        if args.stats_json:
+            report.write_json(Path(args.stats_json))
 
 
 if __name__ == '__main__':
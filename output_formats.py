@@ -0,0 +1,104 @@
+"""
+Output formats for converted specifications
+
+Every format renders the same OpenAPIToMarkdown traversal of a spec:
+Markdown renders its sections, JSON and NDJSON serialize the records of
+iter_records(). NDJSON has one record per line (the API, then every
+endpoint and schema), so consumers can stream thousands of operations
+without parsing YAML or Markdown; JSON is one compact document with the
+same records, and chunks cuts each operation into token-budgeted,
+content-addressed pieces for embedding (see chunk_export). More formats
+can be added with register_format().
+"""
+import json
+from typing import Any, Callable, Dict, Iterable, Iterator, List
+
+from chunk_export import DEFAULT_MAX_TOKENS, iter_chunk_records
+
+DEFAULT_FORMAT = 'markdown'
+
+
+class OutputFormat:
+    """A named output format: its file suffix and a renderer producing text chunks"""
+
+    __slots__ = ('name', 'suffix', 'render')
+
+    def __init__(self, name: str, suffix: str, render: Callable[..., Iterable[str]]):
+        # render(converter, selection=None, **options) -> iterable of text chunks;
+        # options a format does not use are ignored
+        self.name = name
+        self.suffix = suffix
+        self.render = render
+
+
+_formats: Dict[str, OutputFormat] = {}
+
+
+def register_format(name: str, suffix: str, render: Callable[..., Iterable[str]]):
+    """Make an output format available to the converters under name"""
+    _formats[name] = OutputFormat(name, suffix, render)
+
+
+def get_format(name: str) -> OutputFormat:
+    try:
+        return _formats[name]
+    except KeyError:
+        raise ValueError(f"Unknown output format '{name}', expected one of {format_names()}") from None
+
+
+def format_names() -> List[str]:
+    return list(_formats)
+
+
+def dump_record(record: Dict[str, Any]) -> str:
+    """Serialize a record compactly; YAML dates and other scalars become strings"""
+    return json.dumps(record, ensure_ascii=False, separators=(',', ':'), default=str)
+
+
+def iter_markdown(converter, selection=None, **options) -> Iterator[str]:
+    return converter.iter_markdown(selection)
+
+
+def iter_ndjson(converter, selection=None, **options) -> Iterator[str]:
+    for record in converter.iter_records(selection):
+        yield dump_record(record) + '\n'
+
+
+def iter_json(converter, selection=None, **options) -> Iterator[str]:
+    """Stream {"api": {...}, "endpoints": [...], "schemas": [...]} one record at a time"""
+    yield '{'
+    key_separator = ''
+    current = None
+    for record in converter.iter_records(selection):
+        record = dict(record)
+        kind = record.pop('kind')
+        if kind == 'api':
+            yield f'{key_separator}"api":{dump_record(record)}'
+            key_separator = ','
+            continue
+
+        if kind != current:
+            if current is not None:
+                yield ']'
+            yield f'{key_separator}"{kind}s":['
+            key_separator = ','
+            current = kind
+            item_separator = ''
+        yield item_separator + dump_record(record)
+        item_separator = ','
+
+    if current is not None:
+        yield ']'
+    yield '}\n'
+
+
+def iter_chunks(converter, selection=None, max_tokens=None, source=None, **options) -> Iterator[str]:
+    """One JSON line per chunk; max_tokens is the size budget of a chunk, source names the spec"""
+    for record in iter_chunk_records(converter, selection, max_tokens or DEFAULT_MAX_TOKENS, source):
+        yield dump_record(record) + '\n'
+
+
+register_format('markdown', '.md', iter_markdown)
+register_format('json', '.json', iter_json)
+register_format('ndjson', '.ndjson', iter_ndjson)
+register_format('chunks', '.chunks.jsonl', iter_chunks)
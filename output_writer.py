@@ -0,0 +1,150 @@
+"""
+Atomic, write-if-changed output files
+
+Documents are streamed into a temporary file next to their target while
+being hashed, and moved over the target with os.replace only when they
+differ from what is already there. A crash mid-write never leaves a
+truncated document behind, and documents that did not change keep their
+mtime, so file watchers and site builds downstream are not triggered.
+"""
+import os
+import hashlib
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Set, Union
+
+BLOCK_SIZE = 1 << 20
+
+# mkstemp creates files readable by the owner only; outputs get the usual umask-based mode
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+FILE_MODE = 0o666 & ~_UMASK
+
+
+def hash_file(path: Path) -> Optional[str]:
+    """Hex SHA-256 digest of a file, or None if it does not exist"""
+    digest = hashlib.sha256()
+    try:
+        with open(path, 'rb') as f:
+            while block := f.read(BLOCK_SIZE):
+                digest.update(block)
+    except FileNotFoundError:
+        return None
+    return digest.hexdigest()
+
+
+def _make_temp(path: Path):
+    """Open a new temporary file beside path, returning (fd, name)"""
+    return tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix='.tmp')
+
+
+def _write_temp(fd: int, tmp_name: str, chunks: Iterable[Union[str, bytes]]):
+    """Stream chunks into an open temporary file, returning (sha256 hex digest, size in bytes)"""
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            for chunk in chunks:
+                data = chunk.encode('utf-8') if isinstance(chunk, str) else chunk
+                digest.update(data)
+                size += len(data)
+                f.write(data)
+        os.chmod(tmp_name, FILE_MODE)
+    except BaseException:
+        _discard(tmp_name)
+        raise
+    return digest.hexdigest(), size
+
+
+def _discard(tmp_name: str):
+    try:
+        os.unlink(tmp_name)
+    except OSError:
+        pass
+
+
+def write_atomic(path: Path, data: Union[str, bytes]):
+    """Replace path with data without ever exposing a partially written file"""
+    path = Path(path)
+    fd, tmp_name = _make_temp(path)
+    _write_temp(fd, tmp_name, [data])
+    try:
+        os.replace(tmp_name, path)
+    except BaseException:
+        _discard(tmp_name)
+        raise
+
+
+class WriteResult:
+    """Outcome of writing one output file"""
+
+    __slots__ = ('changed', 'sha256', 'size')
+
+    def __init__(self, changed: bool, sha256: str, size: int):
+        self.changed = changed
+        self.sha256 = sha256
+        self.size = size
+
+
+class OutputWriter:
+    """Writes output files atomically and only when their content changed
+
+    Missing directories are created on the first write that needs them
+    (once per writer), so writing into existing directories costs no mkdir
+    calls. The files and bytes written or left unchanged are tallied in
+    stats.
+    """
+
+    def __init__(self):
+        self.created_dirs: Set[Path] = set()
+        self.stats: Dict[str, int] = self.empty_stats()
+
+    @staticmethod
+    def empty_stats() -> Dict[str, int]:
+        return {'files_written': 0, 'files_unchanged': 0, 'bytes_written': 0, 'bytes_unchanged': 0}
+
+    def ensure_dir(self, directory: Path):
+        """Create directory (and its parents) unless this writer already did"""
+        directory = Path(directory)
+        if directory not in self.created_dirs:
+            directory.mkdir(parents=True, exist_ok=True)
+            self.created_dirs.add(directory)
+            self.created_dirs.update(directory.parents)
+
+    def write(self, path: Path, content: Union[str, bytes, Iterable[Union[str, bytes]]]) -> WriteResult:
+        """Write content (a string, bytes or an iterable of chunks) to path if it differs"""
+        path = Path(path)
+        if isinstance(content, (str, bytes)):
+            content = [content]
+
+        try:
+            fd, tmp_name = _make_temp(path)
+        except FileNotFoundError:
+            self.ensure_dir(path.parent)
+            fd, tmp_name = _make_temp(path)
+
+        sha256, size = _write_temp(fd, tmp_name, content)
+        try:
+            changed = not self._holds(path, sha256, size)
+            if changed:
+                os.replace(tmp_name, path)
+            else:
+                _discard(tmp_name)
+        except BaseException:
+            _discard(tmp_name)
+            raise
+
+        kind = 'written' if changed else 'unchanged'
+        self.stats[f'files_{kind}'] += 1
+        self.stats[f'bytes_{kind}'] += size
+        return WriteResult(changed, sha256, size)
+
+    @staticmethod
+    def _holds(path: Path, sha256: str, size: int) -> bool:
+        """Whether path already has this content; a size mismatch settles it without hashing"""
+        try:
+            if path.stat().st_size != size:
+                return False
+        except FileNotFoundError:
+            return False
+        return hash_file(path) == sha256
@@ -0,0 +1,120 @@
+"""
+Per-stage timing and memory instrumentation
+
+StageProfiler records wall time and peak allocated memory (via tracemalloc)
+for each named stage of a conversion: loading, every _generate_* section
+and writing. Reports from many specs can be aggregated into a table or a
+JSON document, and registered hooks receive every finished spec's metrics
+so they can be forwarded to external monitoring.
+"""
+import json
+import time
+import importlib
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+# Callables receiving (spec name, {stage: {'seconds': float, 'peak_bytes': int}})
+_metrics_hooks: List[Callable[[str, Dict[str, Dict[str, Any]]], None]] = []
+
+
+def register_metrics_hook(hook: Callable[[str, Dict[str, Dict[str, Any]]], None]):
+    """Call hook with the stage metrics of every profiled spec"""
+    _metrics_hooks.append(hook)
+
+
+def load_metrics_hook(target: str):
+    """Register a hook given as 'module:function', e.g. from a --metrics-hook option"""
+    module_name, _, attr = target.partition(':')
+    if not attr:
+        raise ValueError(f"Metrics hook '{target}' must look like module:function")
+    register_metrics_hook(getattr(importlib.import_module(module_name), attr))
+
+
+def emit_metrics(spec_name: str, stages: Dict[str, Dict[str, Any]]):
+    """Hand a finished spec's metrics to every registered hook"""
+    for hook in _metrics_hooks:
+        hook(spec_name, stages)
+
+
+class StageProfiler:
+    """Collects wall time and peak allocated memory per stage of one conversion"""
+
+    def __init__(self, trace_memory: bool = True):
+        self.trace_memory = trace_memory
+        self.stages: Dict[str, Dict[str, Any]] = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        """Measure the enclosed block as stage name (repeated stages accumulate)"""
+        started_tracing = False
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            started_tracing = True
+
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1] - baseline if self.trace_memory else 0
+            if started_tracing:
+                tracemalloc.stop()
+
+            record = self.stages.setdefault(name, {'seconds': 0.0, 'peak_bytes': 0})
+            record['seconds'] += elapsed
+            record['peak_bytes'] = max(record['peak_bytes'], peak)
+
+
+def maybe_stage(profiler: Optional[StageProfiler], name: str):
+    """profiler.stage(name), or a no-op context when profiling is off"""
+    return profiler.stage(name) if profiler is not None else nullcontext()
+
+
+class ProfileReport:
+    """Stage metrics of many specs, aggregated for display and JSON export"""
+
+    def __init__(self):
+        self.specs: Dict[str, Dict[str, Dict[str, Any]]] = {}
+
+    def add(self, spec_name: str, stages: Dict[str, Dict[str, Any]]):
+        self.specs[spec_name] = stages
+
+    def totals(self) -> Dict[str, Dict[str, Any]]:
+        """Per stage: total and max seconds, max peak bytes and number of specs"""
+        totals = {}
+        for stages in self.specs.values():
+            for name, record in stages.items():
+                total = totals.setdefault(name, {'seconds': 0.0, 'max_seconds': 0.0, 'peak_bytes': 0, 'count': 0})
+                total['seconds'] += record['seconds']
+                total['max_seconds'] = max(total['max_seconds'], record['seconds'])
+                total['peak_bytes'] = max(total['peak_bytes'], record['peak_bytes'])
+                total['count'] += 1
+        return totals
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'specs': self.specs, 'totals': self.totals()}
+
+    def write_json(self, path: Path):
+        Path(path).write_text(json.dumps(self.to_dict(), indent=2) + '\n', encoding='utf-8')
+
+    def table_rows(self) -> List[List[str]]:
+        """Rows of (stage, total ms, max ms, peak KiB, specs) for display"""
+        return [
+            [
+                name,
+                f"{total['seconds'] * 1000:.1f}",
+                f"{total['max_seconds'] * 1000:.1f}",
+                f"{total['peak_bytes'] / 1024:.0f}",
+                str(total['count'])
+            ]
+            for name, total in self.totals().items()
+        ]
+
+
+PROFILE_COLUMNS = ['Stage', 'Total (ms)', 'Max (ms)', 'Peak memory (KiB)', 'Specs']
@@ -0,0 +1,269 @@
+"""
+$ref resolution for OpenAPI/Swagger specifications
+
+Indexes `components` (and Swagger 2.0 `definitions`/`parameters`/`responses`)
+once, resolves every `$ref` at most once through a memo table, detects
+reference cycles and follows references into external files.
+"""
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import unquote
+
+from lazy_json import LazyObject
+from output_writer import hash_file
+
+# Sections whose entries are addressed by name, e.g. #/components/schemas/Pet
+NAMED_SECTIONS = [
+    ('components', 'schemas'),
+    ('components', 'parameters'),
+    ('components', 'responses'),
+    ('components', 'requestBodies'),
+    ('components', 'headers'),
+    ('components', 'securitySchemes'),
+    ('components', 'examples'),
+    ('components', 'links'),
+    ('components', 'callbacks'),
+    ('definitions',),
+    ('parameters',),
+    ('responses',),
+]
+
+# Refs to these sections name a schema model rather than an inline fragment
+SCHEMA_PREFIXES = ('#/components/schemas/', '#/definitions/')
+
+# Swagger 2.0 ref prefixes and their 3.x locations (see spec_normalizer)
+SWAGGER2_PREFIXES = {
+    '#/definitions/': '#/components/schemas/',
+    '#/parameters/': '#/components/parameters/',
+    '#/responses/': '#/components/responses/'
+}
+
+
+class RefResolutionError(Exception):
+    """Raised when a $ref cannot be resolved or forms a cycle"""
+
+
+def split_ref(ref: str) -> Tuple[str, str]:
+    """Split a $ref into (document, fragment); document is '' for the same file"""
+    document, _, fragment = ref.partition('#')
+    return document, '#' + fragment
+
+
+def decode_pointer(fragment: str):
+    """Turn a '#/a/b~1c' URI fragment into JSON pointer tokens ['a', 'b/c']"""
+    pointer = unquote(fragment[1:])
+    if not pointer:
+        return []
+    return [token.replace('~1', '/').replace('~0', '~') for token in pointer.lstrip('/').split('/')]
+
+
+def counterpart_fragment(fragment: str) -> Optional[str]:
+    """The 3.x location of a Swagger 2.0 fragment or the other way round, or None"""
+    for old, new in SWAGGER2_PREFIXES.items():
+        if fragment.startswith(new):
+            return old + fragment[len(new):]
+        if fragment.startswith(old):
+            return new + fragment[len(old):]
+    return None
+
+
+def schema_name(ref: str) -> Optional[str]:
+    """Model name for refs into components/schemas or definitions, else None"""
+    _, fragment = split_ref(ref)
+    if fragment.startswith(SCHEMA_PREFIXES):
+        return decode_pointer(fragment)[-1]
+    return None
+
+
+class RefResolver:
+    """Resolves $ref values within a spec and the files it references
+
+    All refs are normalized to (document, fragment) keys, where document is
+    '' for the root spec and a resolved file path for external files.
+    External documents are rewritten once on load so their internal refs
+    point back at the right file. loaded_files lists them with a hash of
+    their content, for callers that need to know what their output was
+    built from.
+
+    Documents loaded lazily (see lazy_json) are not indexed, their
+    sections are walked by pointer instead, and external ones are
+    rewritten entry by entry as entries are parsed. With memo_limit set,
+    only that many resolved refs are memoized, so resolving does not keep
+    every parsed component of a large spec alive.
+    """
+
+    def __init__(self, spec: Dict[str, Any], base_path: Optional[Path] = None,
+                 loader: Optional[Callable[[Path], Any]] = None, memo_limit: Optional[int] = None):
+        self.spec = spec
+        self.base_path = Path(base_path) if base_path else Path('.')
+        self.loader = loader
+        self.documents = {'': spec}
+        # External files loaded so far, with the sha256 of their content (None when unreadable)
+        self.loaded_files: Dict[str, Optional[str]] = {}
+        self.index = {}
+        self.memo = {}
+        self.flat_memo = {}
+        self.memo_limit = memo_limit
+        self._index_document('', spec)
+
+    def _index_document(self, document: str, root: Any):
+        """Register every named section entry so common refs skip pointer walking"""
+        if not isinstance(root, Mapping):
+            return
+
+        for section in NAMED_SECTIONS:
+            container = root
+            for key in section:
+                container = container.get(key) if isinstance(container, Mapping) else None
+            # Lazily loaded sections are not indexed; indexing would parse every entry
+            if not isinstance(container, dict):
+                continue
+
+            prefix = '#/' + '/'.join(section) + '/'
+            for name, value in container.items():
+                token = str(name).replace('~', '~0').replace('/', '~1')
+                self.index[(document, prefix + token)] = value
+
+    def _normalize(self, ref: str, document: str = '') -> Tuple[str, str]:
+        """Key for ref as seen from inside document"""
+        target, fragment = split_ref(ref)
+        if not target:
+            return document, fragment
+
+        base_dir = Path(document).parent if document else self.base_path
+        return str((base_dir / target).resolve()), fragment
+
+    def _load_document(self, document: str) -> Any:
+        """Load an external file once, rewriting its local refs to absolute keys"""
+        if document not in self.documents:
+            if self.loader is None:
+                raise RefResolutionError(f"External reference to '{document}' but no loader configured")
+            # Hashed before loading, so an edit racing the load shows up as a change later
+            try:
+                self.loaded_files[document] = hash_file(Path(document))
+            except OSError:
+                self.loaded_files[document] = None
+            try:
+                root = self.loader(Path(document))
+            except Exception as e:
+                raise RefResolutionError(f"Cannot load referenced file '{document}': {e}")
+
+            if isinstance(root, LazyObject):
+                root.set_transform(lambda value: self._rebase(value, document))
+            else:
+                self._rebase(root, document)
+            self.documents[document] = root
+            self._index_document(document, root)
+        return self.documents[document]
+
+    def _rebase(self, node: Any, document: str) -> Any:
+        """Rewrite refs inside an external document into document#fragment form, in place"""
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            if isinstance(current, dict):
+                ref = current.get('$ref')
+                if isinstance(ref, str):
+                    target, fragment = self._normalize(ref, document)
+                    current['$ref'] = f"{target}{fragment}"
+                stack.extend(current.values())
+            elif isinstance(current, list):
+                stack.extend(current)
+        return node
+
+    def _remember(self, memo: Dict, key: Tuple[str, str], value: Any):
+        """Memoize value, dropping the oldest entry once memo_limit is reached"""
+        if self.memo_limit is not None and len(memo) >= self.memo_limit:
+            del memo[next(iter(memo))]
+        memo[key] = value
+
+    def resolve(self, ref: str) -> Any:
+        """Return the object a single $ref points at (which may itself be a $ref)"""
+        key = self._normalize(ref)
+        if key in self.memo:
+            return self.memo[key]
+
+        if key in self.index:
+            target = self.index[key]
+        else:
+            document, fragment = key
+            try:
+                target = self._walk(document, fragment, ref)
+            except RefResolutionError:
+                # Other files are normalized on load only when they are
+                # complete Swagger 2.0 documents, so a ref may name the 2.0
+                # section of a 3.x file or the 3.x section of a fragment file
+                other = counterpart_fragment(fragment) if document else None
+                if other is None:
+                    raise
+                target = self.index.get((document, other)) or self._walk(document, other, ref)
+
+        self._remember(self.memo, key, target)
+        return target
+
+    def _walk(self, document: str, fragment: str, ref: str) -> Any:
+        """Follow a JSON pointer through document"""
+        target = self._load_document(document) if document else self.spec
+        for token in decode_pointer(fragment):
+            if isinstance(target, Mapping) and token in target:
+                target = target[token]
+            elif isinstance(target, list) and token.isdigit() and int(token) < len(target):
+                target = target[int(token)]
+            else:
+                raise RefResolutionError(f"Unresolvable reference '{ref}'")
+        return target
+
+    def deref(self, obj: Any) -> Any:
+        """Follow a chain of $refs to the first non-reference object"""
+        seen = []
+        while isinstance(obj, dict) and isinstance(obj.get('$ref'), str):
+            ref = obj['$ref']
+            if ref in seen:
+                raise RefResolutionError(f"Reference cycle: {' -> '.join(seen + [ref])}")
+            seen.append(ref)
+            obj = self.resolve(ref)
+        return obj
+
+    def flatten(self, schema: Any) -> Any:
+        """Dereference a schema and merge its allOf parts into one schema
+
+        Named schemas are flattened once and memoized. A schema that reaches
+        itself through allOf is reported as a cycle rather than recursing.
+        """
+        return self._flatten(schema, ())
+
+    def _flatten(self, schema: Any, stack: Tuple[str, ...]) -> Any:
+        ref = schema.get('$ref') if isinstance(schema, dict) else None
+        if isinstance(ref, str):
+            key = self._normalize(ref)
+            if key in self.flat_memo:
+                return self.flat_memo[key]
+            if key in stack:
+                raise RefResolutionError(f"Reference cycle through allOf at '{ref}'")
+            flat = self._flatten(self.resolve(ref), stack + (key,))
+            self._remember(self.flat_memo, key, flat)
+            return flat
+
+        if not isinstance(schema, dict) or 'allOf' not in schema:
+            return schema
+
+        merged = {k: v for k, v in schema.items() if k != 'allOf'}
+        properties = dict(merged.get('properties', {}))
+        required = list(merged.get('required', []))
+
+        for part in schema['allOf']:
+            part = self._flatten(part, stack)
+            if not isinstance(part, dict):
+                continue
+            for key, value in part.items():
+                if key not in ('properties', 'required'):
+                    merged.setdefault(key, value)
+            properties.update(part.get('properties', {}))
+            required.extend(r for r in part.get('required', []) if r not in required)
+
+        if properties:
+            merged['properties'] = properties
+        if required:
+            merged['required'] = required
+        return merged
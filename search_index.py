@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Offline search over every endpoint and schema in api_specs/
+
+Builds an SQLite FTS5 index of operation IDs, path segments, summaries,
+parameter names and schema properties for each spec, stored next to the
+generated docs. batch_convert.py keeps it up to date (specs are re-indexed
+only when their content hash changes) and the query CLI below answers
+across all platforms without opening a single spec.
+"""
+import re
+import sys
+import sqlite3
+import argparse
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from rich.console import Console
+from rich.table import Table
+
+from openapi_to_markdown import OpenAPIToMarkdown, load_spec_file
+from ref_resolver import RefResolutionError
+
+DEFAULT_INDEX_PATH = Path('api_docs/.search_index.db')
+
+# Bump when the indexed columns or the way they are filled change
+INDEX_VERSION = 1
+
+# Column weights for bm25(), in table column order
+COLUMN_WEIGHTS = {
+    'name': 10.0,
+    'operation_id': 8.0,
+    'terms': 5.0,
+    'summary': 4.0,
+    'parameters': 3.0,
+    'properties': 2.0,
+    'description': 1.0
+}
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS specs (
+    key TEXT PRIMARY KEY,
+    platform TEXT,
+    title TEXT,
+    content_hash TEXT
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS entries USING fts5(
+    {', '.join(COLUMN_WEIGHTS)},
+    kind UNINDEXED, spec UNINDEXED, platform UNINDEXED, method UNINDEXED, path UNINDEXED,
+    tokenize = 'unicode61'
+);
+"""
+
+console = Console()
+
+
+def split_words(text: Optional[str]) -> str:
+    """Break camelCase, snake_case and path segments into space separated words"""
+    if not text:
+        return ''
+    text = re.sub(r'([a-z0-9])([A-Z])', r'\1 \2', text)
+    text = re.sub(r'([A-Z]+)([A-Z][a-z])', r'\1 \2', text)
+    return ' '.join(re.findall(r'[A-Za-z0-9]+', text)).lower()
+
+
+def to_match_query(query: str) -> str:
+    """Turn free text into an FTS5 query where every word must match as a prefix"""
+    words = split_words(query).split()
+    return ' '.join(f'"{word}"*' for word in words)
+
+
+class SearchIndex:
+    """SQLite FTS5 index of the endpoints and schemas of many specs"""
+
+    def __init__(self, path: Path = DEFAULT_INDEX_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.executescript(SCHEMA)
+
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        if row is None or row[0] != str(INDEX_VERSION):
+            self.clear()
+
+    def clear(self):
+        """Drop everything indexed, e.g. after the index format changed"""
+        with self.conn:
+            self.conn.execute("DELETE FROM entries")
+            self.conn.execute("DELETE FROM specs")
+            self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('version', ?)", (str(INDEX_VERSION),))
+
+    def spec_hash(self, key: str) -> Optional[str]:
+        """Content hash the spec stored under key was indexed with"""
+        row = self.conn.execute("SELECT content_hash FROM specs WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def spec_keys(self) -> List[str]:
+        return [row[0] for row in self.conn.execute("SELECT key FROM specs")]
+
+    def index_spec(self, key: str, platform: str, spec: Dict[str, Any], content_hash: str,
+                   base_path: Optional[Path] = None):
+        """Replace the entries of the spec stored under key"""
+        title, rows = spec_rows(OpenAPIToMarkdown(spec, base_path), key, platform)
+        self.store_rows(key, platform, title, rows, content_hash)
+
+    def store_rows(self, key: str, platform: str, title: str, rows: List[tuple], content_hash: str):
+        """Replace the entries of the spec stored under key with rows built by spec_rows()"""
+        with self.conn:
+            self.conn.execute("DELETE FROM entries WHERE spec = ?", (key,))
+            self.conn.executemany(
+                f"INSERT INTO entries ({', '.join(COLUMN_WEIGHTS)}, kind, spec, platform, method, path) "
+                f"VALUES ({', '.join('?' * (len(COLUMN_WEIGHTS) + 5))})",
+                rows
+            )
+            self.conn.execute(
+                "INSERT OR REPLACE INTO specs VALUES (?, ?, ?, ?)", (key, platform, title, content_hash)
+            )
+
+    def remove_spec(self, key: str):
+        with self.conn:
+            self.conn.execute("DELETE FROM entries WHERE spec = ?", (key,))
+            self.conn.execute("DELETE FROM specs WHERE key = ?", (key,))
+
+    def search(self, query: str, platform: Optional[str] = None, kind: Optional[str] = None,
+               limit: int = 20) -> List[Dict[str, Any]]:
+        """Best matches for free-text query, optionally limited to a platform or entry kind"""
+        match = to_match_query(query)
+        if not match:
+            return []
+
+        weights = ', '.join(str(weight) for weight in COLUMN_WEIGHTS.values())
+        sql = (f"SELECT kind, platform, spec, method, path, name, summary, bm25(entries, {weights}) AS rank "
+               f"FROM entries WHERE entries MATCH ?")
+        params: List[Any] = [match]
+        if platform:
+            sql += " AND platform = ?"
+            params.append(platform)
+        if kind:
+            sql += " AND kind = ?"
+            params.append(kind)
+        sql += " ORDER BY rank LIMIT ?"
+        params.append(limit)
+
+        columns = ['kind', 'platform', 'spec', 'method', 'path', 'name', 'summary', 'rank']
+        return [dict(zip(columns, row)) for row in self.conn.execute(sql, params)]
+
+    def close(self):
+        self.conn.close()
+
+    @classmethod
+    def _iter_rows(cls, converter: OpenAPIToMarkdown, key: str, platform: str) -> Iterator[tuple]:
+        """Rows in column order: the weighted columns, then kind, spec, platform, method, path"""
+        for endpoint in converter.endpoints:
+            operation = endpoint.operation
+            parameters = [converter._deref(param) for param in operation.get('parameters') or []]
+            parameter_names = [param.get('name', '') for param in parameters if isinstance(param, dict)]
+            properties = cls._property_names(converter, cls._operation_schemas(converter, operation))
+
+            yield (
+                f"{endpoint.method} {endpoint.path}",
+                endpoint.operation_id or '',
+                ' '.join([split_words(endpoint.path), split_words(endpoint.operation_id)] + endpoint.tags),
+                operation.get('summary') or '',
+                ' '.join(parameter_names + [split_words(name) for name in parameter_names]),
+                ' '.join(properties),
+                operation.get('description') or '',
+                'endpoint', key, platform, endpoint.method, endpoint.path
+            )
+
+        for name, schema in (converter.components.get('schemas') or {}).items():
+            properties = cls._property_names(converter, [schema])
+            yield (
+                name, '', split_words(name), '', '', ' '.join(properties),
+                schema.get('description') or '' if isinstance(schema, dict) else '',
+                'schema', key, platform, '', ''
+            )
+
+    @staticmethod
+    def _operation_schemas(converter: OpenAPIToMarkdown, operation: Dict[str, Any]) -> Iterator[Any]:
+        """Request and response body schemas of an operation"""
+        bodies = [converter._deref(operation.get('requestBody'))]
+        bodies += [converter._deref(response) for response in (operation.get('responses') or {}).values()]
+        for body in bodies:
+            if not isinstance(body, dict):
+                continue
+            for media in (body.get('content') or {}).values():
+                if isinstance(media, dict) and 'schema' in media:
+                    yield media['schema']
+
+    @staticmethod
+    def _property_names(converter: OpenAPIToMarkdown, schemas: Iterable[Any]) -> List[str]:
+        """Top-level property names of schemas, following $ref, allOf and array items"""
+        names = []
+        for schema in schemas:
+            try:
+                schema = converter.resolver.flatten(schema)
+                if schema.get('type') == 'array' and isinstance(schema.get('items'), dict):
+                    schema = converter.resolver.flatten(schema['items'])
+            except (RefResolutionError, AttributeError):
+                continue
+            if isinstance(schema, dict) and isinstance(schema.get('properties'), dict):
+                names.extend(schema['properties'])
+        return names
+
+
+def spec_rows(converter: OpenAPIToMarkdown, key: str, platform: str) -> Tuple[str, List[tuple]]:
+    """Title and index rows of a spec, from a converter that already holds it
+
+    The result is plain tuples of strings, so conversion workers can build
+    it from the spec they parsed and hand it to SearchIndex.store_rows().
+    """
+    return converter.info.get('title', key), list(SearchIndex._iter_rows(converter, key, platform))
+
+
+def index_spec_file(index: SearchIndex, key: str, platform: str, spec_file: Path, content_hash: str,
+                    cache=None):
+    """Load a spec file (through the parsed-spec cache when given) and index it"""
+    index.index_spec(key, platform, load_spec_file(spec_file, cache), content_hash, spec_file.parent)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Search endpoints and schemas of all converted API specifications'
+    )
+    parser.add_argument('query', nargs='+', help='Words to search for (prefix match, all must occur)')
+    parser.add_argument('-p', '--platform', type=str, help='Only search specs of this platform')
+    parser.add_argument('-k', '--kind', choices=['endpoint', 'schema'], help='Only return endpoints or schemas')
+    parser.add_argument('-n', '--limit', type=int, default=20, help='Maximum number of results (default: 20)')
+    parser.add_argument(
+        '--index',
+        type=str,
+        default=str(DEFAULT_INDEX_PATH),
+        help=f'Index file built by batch_convert.py (default: {DEFAULT_INDEX_PATH})'
+    )
+
+    args = parser.parse_args()
+
+    if not Path(args.index).exists():
+        console.print(f"[red]No search index at {args.index}; run batch_convert.py first[/red]")
+        sys.exit(1)
+
+    index = SearchIndex(Path(args.index))
+    try:
+        results = index.search(' '.join(args.query), args.platform, args.kind, args.limit)
+    finally:
+        index.close()
+
+    if not results:
+        console.print("[yellow]No matches found[/yellow]")
+        return
+
+    table = Table(title=f"Results for '{' '.join(args.query)}'")
+    table.add_column("Spec", style="cyan", no_wrap=True)
+    table.add_column("Match", style="bold", no_wrap=True)
+    table.add_column("Summary", style="dim", no_wrap=True, overflow="ellipsis", ratio=1)
+
+    for result in results:
+        spec_name = f"{result['platform']}/{Path(result['spec']).stem}"
+        table.add_row(spec_name, result['name'], result['summary'] or '')
+
+    console.print(table)
+
+
+if __name__ == '__main__':
+    main()
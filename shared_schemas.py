@@ -0,0 +1,117 @@
+"""
+Component schemas shared between the specs of one platform
+
+Every component schema is hashed together with everything it reaches
+through $ref, so two specs define "the same" schema only when it would
+render identically. Schemas defined identically by more than one spec of a
+platform are rendered once into api_docs/<platform>/_schemas.md, and the
+documentation of each spec links there instead of repeating them.
+"""
+import re
+import json
+import hashlib
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from fragment_cache import FragmentHasher
+from openapi_to_markdown import OpenAPIToMarkdown, generate_footer, load_spec_file
+from ref_resolver import RefResolver
+
+SHARED_SCHEMAS_FILE = '_schemas.md'
+
+
+def heading_anchor(text: str) -> str:
+    """The anchor GitHub-style renderers give a Markdown heading"""
+    return re.sub(r'[^\w\- ]', '', text.lower()).replace(' ', '-')
+
+
+def schema_hashes(spec: Dict[str, Any], base_path: Optional[Path] = None) -> Dict[str, str]:
+    """Hash of every component schema of spec, covering all it references"""
+    schemas = (spec.get('components') or {}).get('schemas') or {}
+    hasher = FragmentHasher(RefResolver(spec, base_path, loader=load_spec_file).resolve)
+    return {name: hasher.key('schema', name, schema) for name, schema in schemas.items()}
+
+
+class SchemaLibrary:
+    """The shared schemas of one platform
+
+    Specs are added with the hashes of their schemas; build() then picks
+    every (name, hash) pair used by at least two specs. A name shared in
+    several different versions gets a numbered heading per version.
+    """
+
+    def __init__(self, platform: str):
+        self.platform = platform
+        self.spec_files: Dict[str, Path] = {}
+        self.specs: Dict[str, Dict[str, Any]] = {}
+        self.spec_schemas: Dict[str, Dict[str, str]] = {}
+        # (name, hash) -> heading, and the specs using it, for schemas in the library
+        self.headings: Dict[Tuple[str, str], str] = {}
+        self.users: Dict[Tuple[str, str], List[str]] = {}
+
+    def add(self, key: str, spec_file: Path, hashes: Dict[str, str], spec: Optional[Dict[str, Any]] = None):
+        """Add a spec's schema hashes; spec, if already parsed, is used instead of loading spec_file"""
+        self.spec_files[key] = Path(spec_file)
+        self.spec_schemas[key] = hashes
+        if spec is not None:
+            self.specs[key] = spec
+
+    def build(self):
+        users: Dict[Tuple[str, str], List[str]] = {}
+        for key in sorted(self.spec_schemas):
+            for name, schema_hash in self.spec_schemas[key].items():
+                users.setdefault((name, schema_hash), []).append(key)
+        self.users = {variant: keys for variant, keys in sorted(users.items()) if len(keys) > 1}
+
+        # Versions of a name are numbered in the order of the specs using them
+        self.headings = {}
+        versions: Dict[str, int] = {}
+        for name, schema_hash in sorted(self.users, key=lambda variant: (variant[0], self.users[variant])):
+            versions[name] = versions.get(name, 0) + 1
+            heading = name if versions[name] == 1 else f"{name} ({versions[name]})"
+            self.headings[(name, schema_hash)] = heading
+
+    def __bool__(self) -> bool:
+        return bool(self.headings)
+
+    def links(self, key: str, prefix: str = '') -> Dict[str, str]:
+        """Schema name -> link into the library for the shared schemas of one spec
+
+        prefix is the path from the spec's documentation to the platform
+        directory, e.g. '../' for split output.
+        """
+        links = {}
+        for name, schema_hash in self.spec_schemas.get(key, {}).items():
+            heading = self.headings.get((name, schema_hash))
+            if heading is not None:
+                links[name] = f"{prefix}{SHARED_SCHEMAS_FILE}#{heading_anchor(heading)}"
+        return links
+
+    @property
+    def digest(self) -> str:
+        """Hash of the library's content: its schemas, their versions and their users"""
+        entries = [[name, schema_hash, self.headings[(name, schema_hash)], keys]
+                   for (name, schema_hash), keys in self.users.items()]
+        return hashlib.sha256(json.dumps(entries).encode('utf-8')).hexdigest()
+
+    def iter_markdown(self, cache=None, build_date=None) -> Iterator[str]:
+        """Render _schemas.md, loading each schema from the first spec that uses it"""
+        yield f"# Shared Schemas: {self.platform}\n\n"
+        yield (f"Schemas defined identically by more than one {self.platform} specification. "
+               f"The documentation of each specification links here instead of repeating them.\n\n")
+
+        converters: Dict[str, OpenAPIToMarkdown] = {}
+        for (name, schema_hash), heading in sorted(self.headings.items(), key=lambda item: item[1]):
+            key = self.users[(name, schema_hash)][0]
+            if key not in converters:
+                spec_file = self.spec_files[key]
+                spec = self.specs.get(key) or load_spec_file(spec_file, cache)
+                converters[key] = OpenAPIToMarkdown(spec, spec_file.parent)
+            converter = converters[key]
+
+            used_by = ', '.join(Path(user).stem for user in self.users[(name, schema_hash)])
+            lines = converter._render_schema(heading, converter.components['schemas'][name]).split('\n')
+            lines.insert(1, f"*Used by: {used_by}*\n")
+            yield '\n'.join(lines) + '\n'
+
+        yield generate_footer(build_date)
@@ -0,0 +1,96 @@
+"""
+On-disk cache of parsed API specifications
+
+Stores the parsed spec dict as a pickle keyed by the spec's path, size and
+content hash, so unchanged specs load in milliseconds instead of being
+re-parsed. The cache is bounded in size and evicts least recently used
+entries first.
+"""
+import os
+import pickle
+import hashlib
+import tempfile
+from pathlib import Path
+from typing import Any, Optional
+
+# Bump when the shape of cached documents changes
+CACHE_VERSION = 2
+
+DEFAULT_CACHE_DIR = Path('.spec_cache')
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+class SpecCache:
+    """Size-bounded LRU cache of parsed specs stored as pickle files"""
+
+    def __init__(self, cache_dir: Path = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+
+    def get_key(self, file_path: Path, data: bytes) -> str:
+        """Build the cache key from path, size and content hash"""
+        digest = hashlib.sha256()
+        digest.update(f"{CACHE_VERSION}\0{Path(file_path).resolve()}\0{len(data)}\0".encode('utf-8'))
+        digest.update(hashlib.sha256(data).digest())
+        return digest.hexdigest()
+
+    def get_entry_path(self, key: str) -> Path:
+        """Location of the pickle file for key"""
+        return self.cache_dir / f"{key}.pickle"
+
+    def get(self, file_path: Path, data: bytes) -> Optional[Any]:
+        """Return the cached document for this content, or None on a miss"""
+        entry_path = self.get_entry_path(self.get_key(file_path, data))
+        try:
+            with open(entry_path, 'rb') as f:
+                document = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+            return None
+
+        # Refresh the access time used for LRU eviction
+        try:
+            os.utime(entry_path)
+        except OSError:
+            pass
+        return document
+
+    def put(self, file_path: Path, data: bytes, document: Any):
+        """Store a parsed document, then evict old entries if over budget"""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        entry_path = self.get_entry_path(self.get_key(file_path, data))
+
+        # Write to a temp file and rename so concurrent readers never see a partial pickle
+        fd, tmp_name = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(document, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_name, entry_path)
+        except BaseException:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+            raise
+
+        self.evict()
+
+    def evict(self):
+        """Remove least recently used entries until the cache fits max_bytes"""
+        entries = []
+        total = 0
+        for entry_path in self.cache_dir.glob('*.pickle'):
+            try:
+                stat = entry_path.stat()
+            except OSError:
+                continue  # Removed by another process
+            entries.append((stat.st_mtime, stat.st_size, entry_path))
+            total += stat.st_size
+
+        for _, size, entry_path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                entry_path.unlink()
+            except OSError:
+                pass
+            total -= size
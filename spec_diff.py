@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+"""
+Differences between two versions of an API specification
+
+Operations are matched by method and path, and operations left over on
+both sides by operationId (a moved path); schemas and security schemes
+are matched by name. Every matched item is compared through its fragment
+key, the hash FragmentCache uses for the rendered Markdown of the item,
+which covers everything the item reaches through $ref. Matching is done
+with dictionaries and each referenced object is hashed once, so a diff
+takes time linear in the size of the specs. An item reported as added or
+modified is exactly a fragment the converter renders again.
+
+The versions can be two spec files or two git revisions of one file
+(or a revision and the working tree). Reports are Markdown or JSON.
+"""
+import sys
+import json
+import argparse
+import subprocess
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from rich.console import Console
+
+from fragment_cache import FragmentHasher
+from openapi_to_markdown import OpenAPIToMarkdown, load_spec_file, parse_spec_text
+from output_writer import OutputWriter
+from spec_normalizer import normalize_spec
+
+console = Console(stderr=True)
+
+KINDS = ['endpoint', 'schema', 'securityScheme']
+KIND_TITLES = {'endpoint': 'Endpoints', 'schema': 'Schemas', 'securityScheme': 'Security schemes'}
+STATUSES = ['added', 'removed', 'modified']
+
+# Operation keys compared on their own; any other key is reported by name
+OPERATION_PARTS = ('parameters', 'requestBody', 'responses')
+
+
+class Change:
+    """One added, removed or modified endpoint, schema or security scheme"""
+
+    __slots__ = ('kind', 'name', 'status', 'old_name', 'details', 'fragment_key')
+
+    def __init__(self, kind: str, name: str, status: str, old_name: Optional[str] = None,
+                 details: Optional[List[str]] = None, fragment_key: Optional[str] = None):
+        self.kind = kind
+        self.name = name
+        self.status = status
+        # Name in the old spec when it differs, e.g. the old path of a moved operation
+        self.old_name = old_name
+        self.details = details or []
+        # Fragment key in the new spec; None for removed items
+        self.fragment_key = fragment_key
+
+    def to_dict(self) -> Dict[str, Any]:
+        record = {'kind': self.kind, 'name': self.name, 'status': self.status}
+        if self.old_name is not None:
+            record['old_name'] = self.old_name
+        if self.details:
+            record['details'] = self.details
+        return record
+
+
+class SpecVersion:
+    """One side of a diff: a spec with its converter, hasher and fragments by kind and name"""
+
+    def __init__(self, spec: Dict[str, Any], base_path: Optional[Path] = None, label: str = ''):
+        self.label = label
+        self.converter = OpenAPIToMarkdown(spec, base_path)
+        self.hasher = FragmentHasher(self.converter.resolver.resolve)
+        self.fragments: Dict[str, Dict[str, Any]] = {kind: {} for kind in KINDS}
+        for kind, name, source in self.converter.iter_fragments():
+            self.fragments[kind][name] = source
+        self.endpoints = {f"{e.method} {e.path}": e for e in self.converter.endpoints}
+
+    def key(self, kind: str, name: str) -> str:
+        return self.hasher.key(kind, name, self.fragments[kind][name])
+
+    def digest(self, obj: Any) -> str:
+        return self.hasher.digest(obj)
+
+    def deref(self, obj: Any) -> Any:
+        return self.converter._deref(obj)
+
+
+class SpecDiff:
+    """The changes between an old and a new version of a spec"""
+
+    def __init__(self, old: SpecVersion, new: SpecVersion):
+        self.old = old
+        self.new = new
+        self.changes: List[Change] = []
+        for kind in KINDS:
+            self._match(kind)
+
+    def __bool__(self) -> bool:
+        return bool(self.changes)
+
+    def counts(self) -> Dict[str, Dict[str, int]]:
+        counts = {kind: dict.fromkeys(STATUSES, 0) for kind in KINDS}
+        for change in self.changes:
+            counts[change.kind][change.status] += 1
+        return counts
+
+    def stale_fragments(self) -> List[Tuple[str, str, str]]:
+        """(kind, name, key) of the new spec's fragments that are not in the old one and must be rendered"""
+        return [(c.kind, c.name, c.fragment_key) for c in self.changes if c.fragment_key is not None]
+
+    def _match(self, kind: str):
+        old_items = self.old.fragments[kind]
+        new_items = self.new.fragments[kind]
+        added = [name for name in new_items if name not in old_items]
+        removed = [name for name in old_items if name not in new_items]
+
+        # Unmatched operations with the same operationId moved to another path or method
+        moved = {}
+        if kind == 'endpoint' and added and removed:
+            removed_ids = {self.old.endpoints[name].operation_id: name for name in removed
+                           if self.old.endpoints[name].operation_id}
+            for name in added:
+                old_name = removed_ids.pop(self.new.endpoints[name].operation_id, None)
+                if old_name is not None:
+                    moved[name] = old_name
+            moved_from = set(moved.values())
+            removed = [name for name in removed if name not in moved_from]
+
+        for name in new_items:
+            old_name = moved.get(name, name if name in old_items else None)
+            new_key = self.new.key(kind, name)
+            if old_name is None:
+                self.changes.append(Change(kind, name, 'added', fragment_key=new_key))
+            elif old_name != name or self.old.key(kind, old_name) != new_key:
+                details = self._details(kind, old_name, name)
+                if old_name != name:
+                    details.insert(0, f"moved from `{old_name}` (same operationId)")
+                self.changes.append(Change(kind, name, 'modified', old_name if old_name != name else None,
+                                           details, new_key))
+        for name in removed:
+            self.changes.append(Change(kind, name, 'removed'))
+
+    def _details(self, kind: str, old_name: str, name: str) -> List[str]:
+        old = self.old.fragments[kind][old_name]
+        new = self.new.fragments[kind][name]
+        if kind == 'endpoint':
+            details = self._operation_details(old, new)
+            referenced = self._changed_schemas(old_name, name)
+            if referenced:
+                details.append(f"referenced schemas changed: {', '.join(f'`{n}`' for n in referenced)}")
+        elif kind == 'schema':
+            details = self._schema_details(old, new)
+        else:
+            details = self._compare_keys(old, new, ())
+        return details or ['referenced definitions changed']
+
+    def _compare_keys(self, old: Any, new: Any, skip: tuple) -> List[str]:
+        """Added, removed and changed keys of two mappings, except the skipped ones"""
+        if not isinstance(old, dict) or not isinstance(new, dict):
+            return [] if self.old.digest(old) == self.new.digest(new) else ['definition changed']
+        details = []
+        for key in dict.fromkeys([*old, *new]):
+            if key in skip:
+                continue
+            if key not in old:
+                details.append(f"`{key}` added")
+            elif key not in new:
+                details.append(f"`{key}` removed")
+            elif self.old.digest(old[key]) != self.new.digest(new[key]):
+                details.append(f"`{key}` changed")
+        return details
+
+    def _compare_named(self, label: str, old: Dict[str, Any], new: Dict[str, Any]) -> List[str]:
+        """Details for two mappings of named entries (parameters, responses, properties)"""
+        details = []
+        for name in new:
+            if name not in old:
+                details.append(f"{label} `{name}` added")
+            elif self.old.digest(old[name]) != self.new.digest(new[name]):
+                details.append(f"{label} `{name}` changed")
+        details += [f"{label} `{name}` removed" for name in old if name not in new]
+        return details
+
+    def _operation_details(self, old: Dict[str, Any], new: Dict[str, Any]) -> List[str]:
+        details = self._compare_keys(old, new, OPERATION_PARTS)
+        details += self._compare_named('parameter', self._parameters(self.old, old), self._parameters(self.new, new))
+        old_body, new_body = old.get('requestBody'), new.get('requestBody')
+        if old_body is None and new_body is not None:
+            details.append('request body added')
+        elif old_body is not None and new_body is None:
+            details.append('request body removed')
+        elif self.old.digest(old_body) != self.new.digest(new_body):
+            details.append('request body changed')
+        details += self._compare_named('response', old.get('responses') or {}, new.get('responses') or {})
+        return details
+
+    @staticmethod
+    def _parameters(version: SpecVersion, operation: Dict[str, Any]) -> Dict[str, Any]:
+        """An operation's parameters by 'name (in)'"""
+        parameters = {}
+        for param in operation.get('parameters') or []:
+            param = version.deref(param)
+            if isinstance(param, dict):
+                parameters[f"{param.get('name')} ({param.get('in')})"] = param
+        return parameters
+
+    def _schema_details(self, old: Dict[str, Any], new: Dict[str, Any]) -> List[str]:
+        old, new = self.old.deref(old), self.new.deref(new)
+        if not isinstance(old, dict) or not isinstance(new, dict):
+            return self._compare_keys(old, new, ())
+        details = self._compare_keys(old, new, ('properties', 'required'))
+        details += self._compare_named('property', old.get('properties') or {}, new.get('properties') or {})
+        old_required, new_required = set(old.get('required') or []), set(new.get('required') or [])
+        details += [f"property `{name}` now required" for name in sorted(new_required - old_required)]
+        details += [f"property `{name}` no longer required" for name in sorted(old_required - new_required)]
+        return details
+
+    def _changed_schemas(self, old_name: str, name: str) -> List[str]:
+        """Component schemas an operation references in both versions whose definition changed"""
+        old_refs = self.old.converter._referenced_schemas([self.old.endpoints[old_name]])
+        new_refs = self.new.converter._referenced_schemas([self.new.endpoints[name]])
+        old_schemas, new_schemas = self.old.fragments['schema'], self.new.fragments['schema']
+        return [
+            schema for schema in sorted(old_refs & new_refs)
+            if schema in old_schemas and schema in new_schemas
+            and self.old.key('schema', schema) != self.new.key('schema', schema)
+        ]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'old': self.old.label,
+            'new': self.new.label,
+            'summary': self.counts(),
+            'changes': [change.to_dict() for change in self.changes],
+            'regenerate': [{'kind': kind, 'name': name, 'key': key} for kind, name, key in self.stale_fragments()]
+        }
+
+    def iter_json(self) -> Iterator[str]:
+        yield json.dumps(self.to_dict(), indent=2, ensure_ascii=False, default=str)
+        yield '\n'
+
+    def iter_markdown(self) -> Iterator[str]:
+        yield f"# Changes: {self.old.label} → {self.new.label}\n\n"
+        if not self.changes:
+            yield "No differences.\n"
+            return
+
+        counts = self.counts()
+        yield "| | Added | Removed | Modified |\n|---|---|---|---|\n"
+        for kind in KINDS:
+            if any(counts[kind].values()):
+                row = ' | '.join(str(counts[kind][status]) for status in STATUSES)
+                yield f"| {KIND_TITLES[kind]} | {row} |\n"
+
+        for kind in KINDS:
+            changes = [change for change in self.changes if change.kind == kind]
+            if not changes:
+                continue
+            yield f"\n## {KIND_TITLES[kind]}\n"
+            for status in STATUSES:
+                selected = [change for change in changes if change.status == status]
+                if not selected:
+                    continue
+                yield f"\n### {status.capitalize()}\n\n"
+                for change in selected:
+                    yield f"- `{change.name}`{self._summary(change)}\n"
+                    for detail in change.details:
+                        yield f"  - {detail}\n"
+
+    def _summary(self, change: Change) -> str:
+        if change.kind != 'endpoint':
+            return ''
+        version = self.old if change.status == 'removed' else self.new
+        summary = version.endpoints[change.name].operation.get('summary')
+        return f": {summary}" if summary else ''
+
+
+def diff_specs(old: Dict[str, Any], new: Dict[str, Any], old_base: Optional[Path] = None,
+               new_base: Optional[Path] = None, old_label: str = 'old', new_label: str = 'new') -> SpecDiff:
+    """Diff two loaded (normalized) specs; base paths resolve external $refs"""
+    return SpecDiff(SpecVersion(old, old_base, old_label), SpecVersion(new, new_base, new_label))
+
+
+def load_revision(spec_file: Path, rev: str) -> Dict[str, Any]:
+    """Load spec_file as of a git revision
+
+    External $refs are still resolved against the working tree.
+    """
+    spec_file = Path(spec_file)
+    try:
+        result = subprocess.run(
+            ['git', '-C', str(spec_file.parent), 'show', f"{rev}:./{spec_file.name}"],
+            capture_output=True, check=True
+        )
+    except FileNotFoundError:
+        raise ValueError("git is not installed") from None
+    except subprocess.CalledProcessError as e:
+        raise ValueError(e.stderr.decode('utf-8', 'replace').strip() or f"git show failed for {rev}") from None
+    return normalize_spec(parse_spec_text(result.stdout.decode('utf-8'), spec_file.suffix))
+
+
+def load_version(spec_file: Path, rev: Optional[str] = None) -> SpecVersion:
+    """A spec file from the working tree, or as of a git revision"""
+    spec_file = Path(spec_file)
+    if rev is None:
+        return SpecVersion(load_spec_file(spec_file), spec_file.parent, str(spec_file))
+    return SpecVersion(load_revision(spec_file, rev), spec_file.parent, f"{spec_file} @ {rev}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Report added, removed and modified endpoints, schemas and security schemes between two '
+                    'versions of an API specification'
+    )
+    parser.add_argument(
+        'specs',
+        nargs='+',
+        help='OLD NEW spec files, or one spec file with --rev'
+    )
+    parser.add_argument(
+        '--rev',
+        action='append',
+        help='Git revision of the spec file to compare; once to compare it with the working tree, '
+             'twice to compare two revisions'
+    )
+    parser.add_argument(
+        '--format',
+        choices=['markdown', 'json'],
+        default='markdown',
+        help='Report format (default: markdown)'
+    )
+    parser.add_argument(
+        '-o', '--output',
+        type=str,
+        help='Write the report to this file (default: prints to stdout)'
+    )
+
+    args = parser.parse_args()
+    revs = args.rev or []
+
+    if revs and (len(args.specs) != 1 or len(revs) > 2):
+        parser.error('--rev takes one spec file and is given once or twice')
+    if not revs and len(args.specs) != 2:
+        parser.error('expected two spec files, or one spec file with --rev')
+
+    try:
+        if revs:
+            spec_file = Path(args.specs[0])
+            old = load_version(spec_file, revs[0])
+            new = load_version(spec_file, revs[1] if len(revs) == 2 else None)
+        else:
+            old, new = (load_version(Path(spec)) for spec in args.specs)
+    except Exception as e:
+        console.print(f"[red]Error loading specification: {e}[/red]")
+        sys.exit(2)
+
+    diff = SpecDiff(old, new)
+    report = diff.iter_json() if args.format == 'json' else diff.iter_markdown()
+
+    if args.output:
+        OutputWriter().write(Path(args.output), report)
+        console.print(f"[green]Report written to: {args.output}[/green]")
+    else:
+        for chunk in report:
+            sys.stdout.write(chunk)
+
+    # Like diff(1): 0 when the versions match, 1 when they differ
+    sys.exit(1 if diff else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,240 @@
+"""
+Concurrent download of remote OpenAPI/Swagger specifications
+
+Spec URLs are fetched over one pooled HTTP session by a small thread pool
+and saved under api_specs/<platform>/. The ETag and Last-Modified headers
+of every download are remembered, so the next fetch sends a conditional
+request and a spec that did not change costs a single 304 round trip. A
+200 response whose body matches the file on disk is not written again,
+which keeps the build manifest from seeing a change either.
+"""
+import json
+import hashlib
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+from urllib.parse import unquote, urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from output_writer import write_atomic
+from spec_watcher import SPEC_SUFFIXES
+
+DEFAULT_SOURCES_FILE = Path('api_specs/sources.json')
+DEFAULT_STATE_FILE = Path('api_specs/.fetch_state.json')
+
+USER_AGENT = 'documentation-api-ripper'
+ACCEPT = 'application/json, application/yaml, application/x-yaml, text/yaml, */*;q=0.5'
+
+
+def load_sources(path: Path) -> List[Dict[str, str]]:
+    """Read a sources manifest
+
+    The manifest is JSON: {"sources": [{"url": ..., "platform": ..., "name": ...}]}
+    where name (the file name to save as) is optional. A bare list of
+    sources is accepted as well. File names are checked for collisions, see
+    assign_file_names().
+    """
+    data = json.loads(Path(path).read_text(encoding='utf-8'))
+    sources = data.get('sources', []) if isinstance(data, dict) else data
+
+    for source in sources:
+        if not source.get('url') or not source.get('platform'):
+            raise ValueError(f"Source entries need 'url' and 'platform': {source}")
+        check_name(source['platform'], 'platform')
+        if source.get('name'):
+            check_name(source['name'], 'file name')
+    assign_file_names(sources)
+    return sources
+
+
+def check_name(value: str, kind: str) -> str:
+    """Return value if it is usable as a single path component, else raise ValueError
+
+    Platforms and file names come from sources manifests and from URLs, so
+    anything that could leave its directory (a separator, '..', an absolute
+    path) is refused rather than cleaned up.
+    """
+    if not value or '/' in value or '\\' in value or '..' in value or '\0' in value or Path(value).is_absolute():
+        raise ValueError(f"Unsafe {kind} {value!r}: it must be a plain name without separators or '..'")
+    return value
+
+
+def target_path(specs_dir: Path, platform: str, name: str) -> Path:
+    """Where a spec is saved: specs_dir/platform/name, checked to stay inside that directory"""
+    directory = Path(specs_dir) / check_name(platform, 'platform')
+    target = directory / check_name(name, 'file name')
+    if target.resolve().parent != directory.resolve():
+        raise ValueError(f"Refusing to write {target} outside of {directory}")
+    return target
+
+
+def assign_file_names(sources: List[Dict[str, str]]):
+    """Make the files that sources are saved as distinct within each platform
+
+    Sources without a name whose file name, taken from the URL, is shared
+    with another source of the same platform are marked 'qualified', which
+    prefixes the host and directories of the URL (see url_prefix). Names
+    are compared by stem, as the stem also names the converted document.
+    Raises ValueError when two sources still map to the same file.
+    """
+    def key(source):
+        return source['platform'], Path(target_name(source)).stem.lower()
+
+    counts = Counter(key(source) for source in sources)
+    for source in sources:
+        if not source.get('name') and counts[key(source)] > 1:
+            source['qualified'] = True
+
+    seen = {}
+    for source in sources:
+        platform, stem = key(source)
+        if (platform, stem) in seen:
+            raise ValueError(f"Sources {seen[platform, stem]} and {source['url']} would both be saved "
+                             f"as {platform}/{stem}; give one of them a 'name'")
+        seen[platform, stem] = source['url']
+
+
+def guess_file_name(url: str, content_type: str = '', body: bytes = b'') -> str:
+    """File name for a downloaded spec, from the URL path or else the response content"""
+    name = unquote(Path(urlparse(url).path).name)
+    if Path(name).suffix.lower() in SPEC_SUFFIXES:
+        return name
+
+    stem = Path(name).stem or urlparse(url).hostname or 'spec'
+    if 'json' in content_type or body.lstrip()[:1] in (b'{', b'['):
+        return f"{stem}.json"
+    return f"{stem}.yaml"
+
+
+def url_prefix(url: str) -> str:
+    """Host and directories of a URL joined with '-', e.g. host-a for http://host/a/openapi.yaml"""
+    parsed = urlparse(url)
+    directories = [unquote(part) for part in parsed.path.split('/')[:-1] if part]
+    return '-'.join([parsed.hostname or 'spec'] + directories)
+
+
+def target_name(source: Dict[str, str], content_type: str = '', body: bytes = b'') -> str:
+    """File name a source is saved as; without an explicit name the suffix may depend on the response"""
+    if source.get('name'):
+        return source['name']
+    name = guess_file_name(source['url'], content_type, body)
+    return f"{url_prefix(source['url'])}-{name}" if source.get('qualified') else name
+
+
+class FetchResult:
+    """Outcome of fetching one source"""
+
+    __slots__ = ('url', 'status', 'path', 'message')
+
+    def __init__(self, url: str, status: str, path: Optional[Path] = None, message: str = ''):
+        # status is 'updated', 'not_modified', 'unchanged' or 'error'
+        self.url = url
+        self.status = status
+        self.path = path
+        self.message = message
+
+
+class SpecFetcher:
+    """Downloads spec URLs concurrently with conditional requests"""
+
+    def __init__(self, specs_dir: Path = Path('api_specs'), state_path: Path = DEFAULT_STATE_FILE,
+                 workers: int = 8, timeout: float = 30.0):
+        self.specs_dir = Path(specs_dir)
+        self.state_path = Path(state_path)
+        self.workers = max(1, workers)
+        self.timeout = timeout
+        self.state: Dict[str, Dict[str, Any]] = {}
+        self.load_state()
+
+        self.session = requests.Session()
+        self.session.headers.update({'User-Agent': USER_AGENT, 'Accept': ACCEPT})
+        adapter = HTTPAdapter(pool_connections=self.workers, pool_maxsize=self.workers, max_retries=2)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def load_state(self):
+        """Read the validators of earlier downloads, starting empty if missing or unreadable"""
+        try:
+            self.state = json.loads(self.state_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            self.state = {}
+
+    def save_state(self):
+        """Write the validator state atomically, so an interrupted fetch leaves the old file intact"""
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        write_atomic(self.state_path, json.dumps(self.state, indent=2, sort_keys=True) + '\n')
+
+    def conditional_headers(self, source: Dict[str, str]) -> Dict[str, str]:
+        """If-None-Match / If-Modified-Since for a source, as long as its file is still in place"""
+        entry = self.state.get(source['url'])
+        if not entry or not (self.specs_dir / entry['path']).is_file():
+            return {}
+        saved = Path(entry['path'])
+        if saved.parent.name != source['platform'] or saved.stem != Path(target_name(source)).stem:
+            return {}
+
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def fetch(self, source: Dict[str, str]) -> FetchResult:
+        """Fetch a single source and save it under api_specs/<platform>/"""
+        url = source['url']
+        try:
+            response = self.session.get(url, headers=self.conditional_headers(source), timeout=self.timeout)
+
+            if response.status_code == 304:
+                return FetchResult(url, 'not_modified', self.specs_dir / self.state[url]['path'])
+            response.raise_for_status()
+
+            body = response.content
+            name = target_name(source, response.headers.get('Content-Type', ''), body)
+            target = target_path(self.specs_dir, source['platform'], name)
+
+            content_hash = hashlib.sha256(body).hexdigest()
+            previous = self.state.get(url, {})
+            if previous.get('content_hash') == content_hash and target.is_file():
+                status = 'unchanged'
+            else:
+                self.write_file(target, body)
+                status = 'updated'
+
+            self.state[url] = {
+                'path': target.relative_to(self.specs_dir).as_posix(),
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'content_hash': content_hash
+            }
+            return FetchResult(url, status, target, f"{len(body):,} bytes")
+        except (requests.RequestException, OSError, ValueError) as e:
+            return FetchResult(url, 'error', None, str(e))
+
+    def fetch_all(self, sources: List[Dict[str, str]]) -> Iterator[FetchResult]:
+        """Fetch sources concurrently, yielding results as they complete
+
+        The validator state is saved once every source has been handled.
+        Sources that do not come from load_sources() should have been passed
+        through assign_file_names().
+        """
+        try:
+            with ThreadPoolExecutor(max_workers=min(self.workers, max(1, len(sources)))) as executor:
+                futures = [executor.submit(self.fetch, source) for source in sources]
+                for future in as_completed(futures):
+                    yield future.result()
+        finally:
+            self.save_state()
+
+    @staticmethod
+    def write_file(target: Path, data: bytes):
+        """Atomically replace target with data"""
+        target.parent.mkdir(parents=True, exist_ok=True)
+        write_atomic(target, data)
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,297 @@
+"""
+Swagger 2.0 to OpenAPI 3.x normalization
+
+The converter reads the OpenAPI 3 layout (servers, components, requestBody,
+response content). normalize_spec rewrites Swagger 2.0 documents into that
+layout in one pass over the document: definitions, parameters, responses
+and securityDefinitions move under components, body and formData
+parameters become request bodies, response schemas are wrapped in content
+per produced media type, and $refs, including those into other files, are
+rewritten on the way.
+OpenAPI 3 documents are returned unchanged.
+"""
+from collections.abc import Mapping
+from typing import Any, Dict, List, Optional
+
+from ref_resolver import SWAGGER2_PREFIXES, decode_pointer, split_ref
+
+HTTP_METHODS = ['get', 'post', 'put', 'delete', 'patch', 'head', 'options', 'trace']
+DEFAULT_MEDIA_TYPES = ['application/json']
+
+# Swagger 2.0 parameter keys that describe the value and move into the 3.x schema
+SCHEMA_KEYS = [
+    'type', 'format', 'items', 'collectionFormat', 'default', 'maximum', 'exclusiveMaximum',
+    'minimum', 'exclusiveMinimum', 'maxLength', 'minLength', 'pattern', 'maxItems',
+    'minItems', 'uniqueItems', 'enum', 'multipleOf'
+]
+
+
+def is_swagger2(spec: Any) -> bool:
+    return isinstance(spec, Mapping) and str(spec.get('swagger', '')).startswith('2')
+
+
+def normalize_spec(spec: Dict[str, Any]) -> Dict[str, Any]:
+    """Return spec in the OpenAPI 3.x shape; non-Swagger-2.0 documents are returned as-is"""
+    if not is_swagger2(spec):
+        return spec
+    return Swagger2Normalizer(spec).normalize()
+
+
+class Swagger2Normalizer:
+    """Builds the OpenAPI 3.0 equivalent of one Swagger 2.0 document"""
+
+    def __init__(self, spec: Dict[str, Any]):
+        self.spec = spec
+        self.consumes = spec.get('consumes') or DEFAULT_MEDIA_TYPES
+        self.produces = spec.get('produces') or DEFAULT_MEDIA_TYPES
+        # Shared parameters that are bodies become components/requestBodies
+        self.body_parameters = {
+            name for name, param in (spec.get('parameters') or {}).items()
+            if isinstance(param, dict) and param.get('in') in ('body', 'formData')
+        }
+
+    def normalize(self) -> Dict[str, Any]:
+        spec = self.spec
+        result = {'openapi': '3.0.3', 'x-original-swagger': spec['swagger']}
+
+        for key, value in spec.items():
+            if key in ('swagger', 'host', 'basePath', 'schemes', 'consumes', 'produces', 'definitions',
+                       'parameters', 'responses', 'securityDefinitions', 'paths'):
+                continue
+            result[key] = self.rewrite(value)
+
+        if servers := self.servers():
+            result['servers'] = servers
+        result['paths'] = {path: self.path_item(item) for path, item in (spec.get('paths') or {}).items()}
+
+        components = {}
+        if definitions := spec.get('definitions'):
+            components['schemas'] = self.rewrite(definitions)
+        parameters = spec.get('parameters') or {}
+        if shared := {name: self.parameter(p) for name, p in parameters.items() if name not in self.body_parameters}:
+            components['parameters'] = shared
+        if bodies := {name: self.request_body([parameters[name]], self.consumes) for name in self.body_parameters}:
+            components['requestBodies'] = bodies
+        if responses := spec.get('responses'):
+            components['responses'] = {code: self.response(r, self.produces) for code, r in responses.items()}
+        if security := spec.get('securityDefinitions'):
+            components['securitySchemes'] = {name: self.security_scheme(s) for name, s in security.items()}
+        if components:
+            result['components'] = components
+
+        return result
+
+    def servers(self) -> List[Dict[str, str]]:
+        """servers from host, basePath and schemes"""
+        host = self.spec.get('host')
+        base_path = self.spec.get('basePath', '')
+        if not host:
+            return [{'url': base_path}] if base_path else []
+        return [{'url': f"{scheme}://{host}{base_path}"} for scheme in self.spec.get('schemes') or ['https']]
+
+    def path_item(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        if not isinstance(item, dict):
+            return item
+
+        result = {}
+        for key, value in item.items():
+            if key in HTTP_METHODS and isinstance(value, dict):
+                result[key] = self.operation(value)
+            elif key == 'parameters':
+                # Path-level bodies cannot be expressed in 3.x; they are folded into each operation
+                result[key] = [self.parameter(p) for p in value if not self.is_body(p)]
+            else:
+                result[key] = self.rewrite(value)
+
+        shared_bodies = [p for p in item.get('parameters') or [] if self.is_body(p)]
+        if shared_bodies:
+            for key, operation in result.items():
+                if key in HTTP_METHODS and 'requestBody' not in operation:
+                    consumes = item[key].get('consumes') or self.consumes
+                    operation['requestBody'] = self.request_body(shared_bodies, consumes)
+        return result
+
+    def operation(self, operation: Dict[str, Any]) -> Dict[str, Any]:
+        consumes = operation.get('consumes') or self.consumes
+        produces = operation.get('produces') or self.produces
+        parameters = operation.get('parameters') or []
+
+        result = {}
+        for key, value in operation.items():
+            if key in ('consumes', 'produces', 'schemes'):
+                continue
+            if key == 'parameters':
+                result[key] = [self.parameter(p) for p in value if not self.is_body(p)]
+                if not result[key]:
+                    del result[key]
+            elif key == 'responses':
+                result[key] = {code: self.response(r, produces) for code, r in value.items()}
+            else:
+                result[key] = self.rewrite(value)
+
+        bodies = [p for p in parameters if self.is_body(p)]
+        if bodies:
+            result['requestBody'] = self.request_body(bodies, consumes)
+        return result
+
+    def is_body(self, param: Any) -> bool:
+        """Whether a parameter (or a ref to a shared one) is a body or form parameter"""
+        if not isinstance(param, dict):
+            return False
+        if '$ref' in param:
+            return self.local_name(param['$ref'], '#/parameters/') in self.body_parameters
+        return param.get('in') in ('body', 'formData')
+
+    def parameter(self, param: Dict[str, Any]) -> Dict[str, Any]:
+        """A non-body parameter, with its value description moved into schema"""
+        if not isinstance(param, dict) or '$ref' in param:
+            return self.rewrite(param)
+
+        result = {}
+        schema = {}
+        for key, value in param.items():
+            if key in SCHEMA_KEYS:
+                schema[key] = self.rewrite(value)
+            else:
+                result[key] = self.rewrite(value)
+        if schema:
+            collection_format = schema.pop('collectionFormat', None)
+            if collection_format == 'multi':
+                result['explode'] = True
+            elif collection_format in ('csv', 'ssv', 'pipes'):
+                result['style'] = {'csv': 'form', 'ssv': 'spaceDelimited', 'pipes': 'pipeDelimited'}[collection_format]
+                result['explode'] = False
+            result['schema'] = schema
+        return result
+
+    def request_body(self, params: List[Dict[str, Any]], consumes: List[str]) -> Dict[str, Any]:
+        """A requestBody built from one body parameter or from formData parameters"""
+        params = [self.shared_parameter(p) for p in params]
+
+        if len(params) == 1 and isinstance(params[0], str):
+            return {'$ref': f"#/components/requestBodies/{params[0]}"}
+        params = [p for p in params if isinstance(p, dict)]
+
+        body = next((p for p in params if p.get('in') == 'body'), None)
+        if body is not None:
+            result = {'content': {media: {'schema': self.rewrite(body.get('schema', {}))} for media in consumes}}
+            if description := body.get('description'):
+                result['description'] = description
+            if body.get('required'):
+                result['required'] = True
+            return result
+
+        # formData parameters become the properties of one object schema
+        properties = {}
+        required = []
+        for param in params:
+            prop = {key: self.rewrite(value) for key, value in param.items() if key in SCHEMA_KEYS}
+            if prop.get('type') == 'file':
+                prop = {'type': 'string', 'format': 'binary'}
+            if description := param.get('description'):
+                prop['description'] = description
+            properties[param.get('name', '')] = prop
+            if param.get('required'):
+                required.append(param.get('name', ''))
+
+        schema = {'type': 'object', 'properties': properties}
+        if required:
+            schema['required'] = required
+        form_types = [m for m in consumes if m in ('application/x-www-form-urlencoded', 'multipart/form-data')]
+        return {
+            'content': {media: {'schema': schema} for media in form_types or ['application/x-www-form-urlencoded']},
+            **({'required': True} if required else {})
+        }
+
+    def shared_parameter(self, param: Dict[str, Any]) -> Any:
+        """Name of a referenced shared body parameter, or the parameter itself"""
+        if isinstance(param, dict) and '$ref' in param:
+            name = self.local_name(param['$ref'], '#/parameters/')
+            if name in self.body_parameters:
+                shared = self.spec['parameters'][name]
+                # A referenced formData parameter is merged with its siblings, not referenced
+                return name if shared.get('in') == 'body' else shared
+        return param
+
+    def response(self, response: Any, produces: List[str]) -> Any:
+        if not isinstance(response, dict) or '$ref' in response:
+            return self.rewrite(response)
+
+        result = {}
+        for key, value in response.items():
+            if key == 'schema':
+                result['content'] = {media: {'schema': self.rewrite(value)} for media in produces}
+            elif key == 'headers':
+                result[key] = {
+                    name: {
+                        **({'description': header['description']} if header.get('description') else {}),
+                        'schema': {k: self.rewrite(v) for k, v in header.items() if k in SCHEMA_KEYS}
+                    }
+                    for name, header in value.items()
+                }
+            elif key == 'examples':
+                continue
+            else:
+                result[key] = self.rewrite(value)
+        result.setdefault('description', '')
+        return result
+
+    def security_scheme(self, scheme: Dict[str, Any]) -> Dict[str, Any]:
+        scheme_type = scheme.get('type')
+        result = {key: value for key, value in scheme.items()
+                  if key not in ('type', 'flow', 'authorizationUrl', 'tokenUrl', 'scopes')}
+
+        if scheme_type == 'basic':
+            result.update({'type': 'http', 'scheme': 'basic'})
+        elif scheme_type == 'oauth2':
+            flow = {'implicit': 'implicit', 'password': 'password',
+                    'application': 'clientCredentials', 'accessCode': 'authorizationCode'}.get(scheme.get('flow'), 'implicit')
+            config = {'scopes': scheme.get('scopes') or {}}
+            if flow in ('implicit', 'authorizationCode'):
+                config['authorizationUrl'] = scheme.get('authorizationUrl', '')
+            if flow != 'implicit':
+                config['tokenUrl'] = scheme.get('tokenUrl', '')
+            result.update({'type': 'oauth2', 'flows': {flow: config}})
+        else:
+            result['type'] = scheme_type
+        return result
+
+    def rewrite(self, node: Any) -> Any:
+        """Copy node, pointing $refs at their 3.x locations"""
+        if isinstance(node, dict):
+            result = {}
+            for key, value in node.items():
+                if key == '$ref' and isinstance(value, str):
+                    result[key] = self.rewrite_ref(value)
+                elif key == 'x-nullable' and value is True:
+                    result['nullable'] = True
+                else:
+                    result[key] = self.rewrite(value)
+            return result
+        if isinstance(node, list):
+            return [self.rewrite(item) for item in node]
+        return node
+
+    def rewrite_ref(self, ref: str) -> str:
+        """The 3.x form of ref
+
+        Refs into other files are rewritten as well: a Swagger 2.0 document
+        they name is normalized when the resolver loads it. Which of its
+        shared parameters are bodies is not known here, so those refs keep
+        pointing at components/parameters.
+        """
+        document, fragment = split_ref(ref)
+        for old, new in SWAGGER2_PREFIXES.items():
+            if fragment.startswith(old):
+                name = fragment[len(old):]
+                if not document and old == '#/parameters/' and decode_pointer(fragment)[-1] in self.body_parameters:
+                    return f"#/components/requestBodies/{name}"
+                return document + new + name
+        return ref
+
+    @staticmethod
+    def local_name(ref: str, prefix: str) -> Optional[str]:
+        document, fragment = split_ref(ref)
+        if document or not fragment.startswith(prefix):
+            return None
+        return decode_pointer(fragment)[-1]
@@ -0,0 +1,202 @@
+"""
+File watching for api_specs/
+
+Reports changed spec files under api_specs/<platform>/, and changes to any
+further files handed to watch_files() (those specs pull in through external
+$refs, which may live elsewhere). Uses inotify on
+Linux (through ctypes, no extra dependency) and falls back to polling file
+stats everywhere else. Changes are debounced so an editor saving a file in
+several steps triggers one rebuild.
+"""
+import os
+import time
+import ctypes
+import ctypes.util
+import select
+import struct
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional, Set, Tuple
+
+SPEC_SUFFIXES = ('.yaml', '.yml', '.json')
+
+# inotify constants from <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+FILE_EVENTS = IN_CLOSE_WRITE | IN_MOVED_TO | IN_MOVED_FROM | IN_DELETE | IN_CREATE
+EVENT_HEADER = struct.Struct('iIII')
+
+
+class PollingWatcher:
+    """Detects changes by comparing file stats between scans"""
+
+    name = 'polling'
+
+    def __init__(self, root: Path, interval: float = 1.0):
+        self.root = Path(root)
+        self.interval = interval
+        self.extra: Set[Path] = set()
+        self.snapshot = self.scan()
+
+    @staticmethod
+    def file_stat(path: Path) -> Optional[Tuple[int, int]]:
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def scan(self) -> Dict[Path, Tuple[int, int]]:
+        """Map every spec file under root/<platform>/, and every extra file, to (mtime_ns, size)"""
+        snapshot = {}
+        for path in [p for p in self.root.glob('*/*') if p.suffix in SPEC_SUFFIXES] + list(self.extra):
+            stat = self.file_stat(path)
+            if stat is not None:
+                snapshot[path] = stat
+        return snapshot
+
+    def watch_files(self, paths: Iterable[Path]):
+        """Also report changes to paths (replacing the previous extra files)"""
+        paths = {Path(path).resolve() for path in paths}
+        for path in self.extra - paths:
+            self.snapshot.pop(path, None)
+        for path in paths - self.extra:
+            stat = self.file_stat(path)
+            if stat is not None:
+                self.snapshot[path] = stat
+        self.extra = paths
+
+    def poll(self, timeout: float) -> Set[Path]:
+        """Wait up to timeout seconds and return the paths that changed"""
+        deadline = time.monotonic() + timeout
+        while True:
+            current = self.scan()
+            changed = {
+                path for path in current.keys() | self.snapshot.keys()
+                if current.get(path) != self.snapshot.get(path)
+            }
+            self.snapshot = current
+            remaining = deadline - time.monotonic()
+            if changed or remaining <= 0:
+                return changed
+            time.sleep(min(self.interval, remaining))
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher:
+    """Linux inotify watcher on root and each platform directory below it"""
+
+    name = 'inotify'
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        libc_name = ctypes.util.find_library('c') or 'libc.so.6'
+        self.libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(self.libc, 'inotify_init1'):
+            raise OSError('inotify is not available')
+
+        self.fd = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+
+        self.watches: Dict[int, Path] = {}
+        # Directories watched only for the files handed to watch_files()
+        self.extra_dirs: Set[Path] = set()
+        self.extra: Set[Path] = set()
+        self.add_watch(self.root, IN_CREATE | IN_MOVED_TO)
+        for platform_dir in self.root.iterdir():
+            if platform_dir.is_dir():
+                self.add_watch(platform_dir, FILE_EVENTS)
+
+    def add_watch(self, path: Path, mask: int):
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(str(path)), mask)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {path}")
+        self.watches[wd] = path
+
+    def watch_files(self, paths: Iterable[Path]):
+        """Also report changes to paths (replacing the previous extra files)"""
+        self.extra = {Path(path).resolve() for path in paths}
+        watched = {path.resolve() for path in self.watches.values()}
+        for directory in {path.parent for path in self.extra}:
+            try:
+                if directory == self.root.resolve():
+                    # The root itself is only watched for new platform directories so far
+                    self.add_watch(self.root, IN_CREATE | IN_MOVED_TO | FILE_EVENTS)
+                elif directory not in watched:
+                    self.add_watch(directory, FILE_EVENTS)
+                    self.extra_dirs.add(directory)
+            except OSError:
+                continue  # a missing directory; its files are missing too
+
+    def poll(self, timeout: float) -> Set[Path]:
+        """Wait up to timeout seconds and return the paths that changed"""
+        readable, _, _ = select.select([self.fd], [], [], max(timeout, 0))
+        if not readable:
+            return set()
+
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+
+        changed = set()
+        offset = 0
+        while offset + EVENT_HEADER.size <= len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+            offset += length
+
+            parent = self.watches.get(wd)
+            if parent is None or not name:
+                continue
+            path = parent / name
+
+            if mask & IN_ISDIR:
+                # A new platform directory: watch it and report the specs already inside
+                if parent == self.root and path.is_dir():
+                    self.add_watch(path, FILE_EVENTS)
+                    changed.update(p for p in path.iterdir() if p.suffix in SPEC_SUFFIXES)
+            elif path.suffix in SPEC_SUFFIXES and parent != self.root and parent not in self.extra_dirs:
+                changed.add(path)
+            elif self.extra and path.resolve() in self.extra:
+                changed.add(path.resolve())
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+def create_watcher(root: Path, poll_interval: float = 1.0, use_inotify: bool = True):
+    """Return an inotify watcher when the platform supports it, else a polling one"""
+    if use_inotify:
+        try:
+            return InotifyWatcher(root)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(root, poll_interval)
+
+
+def iter_changes(watcher, debounce: float = 0.5) -> Iterator[Set[Path]]:
+    """Yield sets of changed paths once no further change arrived for debounce seconds"""
+    while True:
+        changed = watcher.poll(3600)
+        if not changed:
+            continue
+
+        while True:
+            more = watcher.poll(debounce)
+            if not more:
+                break
+            changed |= more
+
+        yield changed
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Find the raw spec behind a Swagger UI or Redoc page without a browser
+
+Fetches the documentation page, scans its inline scripts and its Swagger UI
+initializer (swagger-initializer.js, swagger-config) for the spec URL with
+the same patterns extract_swagger_yaml.js uses, follows configUrl
+indirections and finally probes the usual spec locations. Each page costs a
+few plain HTTP requests, so many pages can be resolved in parallel.
+"""
+import re
+import sys
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+from urllib.parse import urljoin
+
+import requests
+import yaml
+
+from openapi_to_markdown import parse_spec_text
+from spec_fetcher import SpecFetcher, USER_AGENT, assign_file_names, check_name, target_name, target_path
+
+# Patterns from extract_swagger_yaml.js, then the same keys without a file extension
+# (e.g. url: "/v2/api-docs"), which are only tried after the stricter ones
+SPEC_URL_PATTERNS = [
+    re.compile(r'''\b(url|spec|configUrl|swaggerUrl)\s*:\s*["']([^"']*\.(?:yaml|yml|json))["']''', re.I),
+    re.compile(r'''\b(url|spec|configUrl|swaggerUrl)\s*:\s*["']([^"'\s]+)["']''', re.I),
+    re.compile(r'''Redoc\.init\(\s*["']([^"']+)["']'''),
+]
+
+# Initializer scripts worth downloading; everything else (bundles, analytics) is skipped
+INITIALIZER_SCRIPT = re.compile(r'(swagger-initializer|swagger-config|initializer|redoc-init)[^/]*\.js', re.I)
+
+# Fallback locations, as in extract_swagger_yaml.js
+COMMON_SPEC_PATHS = [
+    './openapi.yaml', './openapi.yml', './openapi.json',
+    './swagger.yaml', './swagger.yml', './swagger.json',
+    './api-docs', './v1/api-docs', './v2/api-docs', './v3/api-docs',
+    '../openapi.yaml', '../openapi.json',
+    '/openapi.yaml', '/openapi.json', '/swagger.json',
+    '/api/swagger.json', '/api/openapi.json'
+]
+
+
+class DocPageParser(HTMLParser):
+    """Collects inline script text, script sources and Redoc spec-url attributes"""
+
+    def __init__(self):
+        super().__init__()
+        self.inline_scripts: List[str] = []
+        self.script_sources: List[str] = []
+        self.spec_urls: List[str] = []
+        self._in_script = False
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == 'script':
+            if attrs.get('src'):
+                self.script_sources.append(attrs['src'])
+            else:
+                self._in_script = True
+                self.inline_scripts.append('')
+        elif attrs.get('spec-url'):
+            # <redoc spec-url="..."> and <rapi-doc spec-url="...">
+            self.spec_urls.append(attrs['spec-url'])
+
+    def handle_endtag(self, tag):
+        if tag == 'script':
+            self._in_script = False
+
+    def handle_data(self, data):
+        if self._in_script:
+            self.inline_scripts[-1] += data
+
+
+def find_spec_urls(script: str) -> Iterator[Tuple[str, str]]:
+    """Yield (key, url) for every spec URL candidate in a script, best patterns first"""
+    for pattern in SPEC_URL_PATTERNS:
+        for match in pattern.finditer(script):
+            if pattern.groups == 2:
+                yield match.group(1), match.group(2)
+            else:
+                yield 'url', match.group(1)
+
+
+def parse_spec_body(body: bytes) -> Optional[dict]:
+    """The document as a dict if it looks like an OpenAPI/Swagger spec, else None"""
+    try:
+        text = body.decode('utf-8')
+        if text.lstrip()[:1] == '<':  # HTML, not worth handing to the YAML parser
+            return None
+        data = parse_spec_text(text, '')
+    except (UnicodeDecodeError, ValueError, yaml.YAMLError):
+        return None
+    if isinstance(data, dict) and ('openapi' in data or 'swagger' in data):
+        return data
+    return None
+
+
+class DiscoveredSpec:
+    """A spec found for a documentation page"""
+
+    __slots__ = ('page_url', 'spec_url', 'body', 'content_type')
+
+    def __init__(self, page_url: str, spec_url: str, body: bytes, content_type: str):
+        self.page_url = page_url
+        self.spec_url = spec_url
+        self.body = body
+        self.content_type = content_type
+
+
+class SwaggerDiscovery:
+    """Resolves documentation pages to the spec documents they render"""
+
+    def __init__(self, session: Optional[requests.Session] = None, timeout: float = 15.0,
+                 probe_common_paths: bool = True):
+        if session is None:
+            session = requests.Session()
+            session.headers['User-Agent'] = USER_AGENT
+        self.session = session
+        self.timeout = timeout
+        self.probe_common_paths = probe_common_paths
+
+    def get(self, url: str) -> Optional[requests.Response]:
+        try:
+            response = self.session.get(url, timeout=self.timeout)
+        except requests.RequestException:
+            return None
+        return response if response.ok else None
+
+    def candidate_urls(self, page_url: str, html: str) -> Iterator[str]:
+        """Spec URL candidates for a page, most specific first"""
+        page = DocPageParser()
+        page.feed(html)
+
+        for spec_url in page.spec_urls:
+            yield urljoin(page_url, spec_url)
+
+        scripts = list(page.inline_scripts)
+        for src in page.script_sources:
+            if INITIALIZER_SCRIPT.search(src):
+                response = self.get(urljoin(page_url, src))
+                if response is not None:
+                    scripts.append(response.text)
+
+        # Relative URLs in an initializer resolve against the page that runs it
+        for script in scripts:
+            for key, url in find_spec_urls(script):
+                url = urljoin(page_url, url)
+                if key.lower() == 'configurl':
+                    yield from self.config_urls(url)
+                else:
+                    yield url
+
+        if self.probe_common_paths:
+            for path in COMMON_SPEC_PATHS:
+                yield urljoin(page_url, path)
+
+    def config_urls(self, config_url: str) -> Iterator[str]:
+        """Spec URLs named by a Swagger UI configUrl document"""
+        response = self.get(config_url)
+        if response is None:
+            return
+        try:
+            config = response.json()
+        except ValueError:
+            return
+        if config.get('url'):
+            yield urljoin(config_url, config['url'])
+        for entry in config.get('urls') or []:
+            if entry.get('url'):
+                yield urljoin(config_url, entry['url'])
+
+    def discover(self, page_url: str) -> Optional[DiscoveredSpec]:
+        """Return the spec rendered by page_url, or None if none could be found"""
+        response = self.get(page_url)
+        if response is None:
+            return None
+
+        # The URL may already point at the spec itself
+        if parse_spec_body(response.content) is not None:
+            return DiscoveredSpec(page_url, page_url, response.content, response.headers.get('Content-Type', ''))
+
+        tried = set()
+        for spec_url in self.candidate_urls(page_url, response.text):
+            if spec_url in tried:
+                continue
+            tried.add(spec_url)
+
+            spec_response = self.get(spec_url)
+            if spec_response is not None and parse_spec_body(spec_response.content) is not None:
+                return DiscoveredSpec(
+                    page_url, spec_url, spec_response.content, spec_response.headers.get('Content-Type', '')
+                )
+        return None
+
+    def discover_all(self, page_urls: List[str], workers: int = 8) -> Iterator[Tuple[str, Optional[DiscoveredSpec]]]:
+        """Discover specs for many pages in parallel, yielding (page URL, result) in input order"""
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(page_urls)))) as executor:
+            yield from zip(page_urls, executor.map(self.discover, page_urls))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Find and download the OpenAPI/Swagger spec behind Swagger UI or Redoc pages'
+    )
+    parser.add_argument('pages', nargs='+', help='Documentation page URLs')
+    parser.add_argument(
+        '-p', '--platform',
+        type=str,
+        help='Save specs into api_specs/<platform>/ (default: only print the spec URLs)'
+    )
+    parser.add_argument(
+        '-j', '--jobs',
+        type=int,
+        default=8,
+        help='Pages to resolve in parallel (default: 8)'
+    )
+    parser.add_argument(
+        '--no-probe',
+        action='store_true',
+        help='Do not try common spec locations when the page does not name one'
+    )
+
+    args = parser.parse_args()
+    if args.platform:
+        try:
+            check_name(args.platform, 'platform')
+        except ValueError as e:
+            parser.error(str(e))
+
+    discovery = SwaggerDiscovery(probe_common_paths=not args.no_probe)
+    results = list(discovery.discover_all(args.pages, args.jobs))
+
+    # Pages may point at different specs with the same file name (openapi.json),
+    # so names are assigned the way sources.json entries get theirs
+    sources = {}
+    if args.platform:
+        for _, found in results:
+            if found is not None:
+                sources.setdefault(found.spec_url, {'url': found.spec_url, 'platform': args.platform})
+        try:
+            assign_file_names(list(sources.values()))
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+
+    failed = 0
+    for page_url, found in results:
+        if found is None:
+            print(f"No spec found: {page_url}", file=sys.stderr)
+            failed += 1
+            continue
+
+        if args.platform:
+            try:
+                name = target_name(sources[found.spec_url], found.content_type, found.body)
+                target = target_path(Path('api_specs'), args.platform, name)
+            except ValueError as e:
+                print(f"{page_url} -> {found.spec_url} not saved: {e}", file=sys.stderr)
+                failed += 1
+                continue
+            SpecFetcher.write_file(target, found.body)
+            print(f"{page_url} -> {found.spec_url} saved to {target}")
+        else:
+            print(f"{page_url} -> {found.spec_url}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+import pytest
+
+from batch_convert import BatchAPIConverter
+from spec_watcher import PollingWatcher
+
+MAIN = """\
+openapi: 3.0.0
+info: {title: Main, version: '1'}
+paths:
+  /items:
+    get:
+      parameters:
+        - $ref: 'common/params.yaml#/components/parameters/Limit'
+      responses:
+        '200': {description: OK}
+"""
+
+PARAMS = "components:\n  parameters:\n    Limit: {name: %s, in: query, schema: {type: integer}}\n"
+
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    """A working directory with api_specs/p/main.yaml referencing api_specs/p/common/params.yaml"""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'api_specs' / 'p' / 'common').mkdir(parents=True)
+    (tmp_path / 'api_specs' / 'p' / 'main.yaml').write_text(MAIN)
+    (tmp_path / 'api_specs' / 'p' / 'common' / 'params.yaml').write_text(PARAMS % 'limit')
+    return tmp_path
+
+
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_edited_ref_file_rebuilds_spec(workspace, jobs):
+    # A second spec makes the pool path run with jobs > 1
+    (workspace / 'api_specs' / 'p' / 'other.yaml').write_text(MAIN.replace('Main', 'Other'))
+
+    def build():
+        converter = BatchAPIConverter(jobs=jobs, cache_dir=None, search_index=False)
+        converter.run()
+        return converter.stats['converted']
+
+    assert build() == 2
+    assert build() == 0
+    assert '`limit`' in (workspace / 'api_docs' / 'p' / 'main.md').read_text()
+
+    (workspace / 'api_specs' / 'p' / 'common' / 'params.yaml').write_text(PARAMS % 'pageSize')
+    assert build() == 2
+    assert '`pageSize`' in (workspace / 'api_docs' / 'p' / 'main.md').read_text()
+
+    (workspace / 'api_specs' / 'p' / 'common' / 'params.yaml').unlink()
+    assert build() == 2
+
+
+def test_ref_dependents_and_polling_watcher(workspace):
+    converter = BatchAPIConverter(cache_dir=None, search_index=False)
+    converter.run()
+    params = (workspace / 'api_specs' / 'p' / 'common' / 'params.yaml').resolve()
+    dependents = converter.get_ref_dependents()
+    assert {path: {spec.name for spec in specs} for path, specs in dependents.items()} == {params: {'main.yaml'}}
+
+    watcher = PollingWatcher(workspace / 'api_specs', interval=0.01)
+    watcher.watch_files(dependents)
+    assert watcher.poll(0) == set()
+    params.write_text(PARAMS % 'pageSize' + '# edited\n')
+    assert watcher.poll(1) == {params}
+
+
+def test_formats_keep_their_own_manifest_entries(workspace):
+    def build(output_format):
+        converter = BatchAPIConverter(cache_dir=None, search_index=False, output_format=output_format)
+        converter.run()
+        return converter.stats['converted']
+
+    assert build('markdown') == 1
+    assert build('json') == 1
+    assert build('markdown') == 0
+    assert build('json') == 0
+    assert (workspace / 'api_docs' / 'p' / 'main.md').is_file()
+    assert (workspace / 'api_docs' / 'p' / 'main.json').is_file()
@@ -0,0 +1,46 @@
+import os
+import subprocess
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+from openapi_to_markdown import generate_footer, read_build_date, resolve_build_date
+
+SCRIPT = Path(__file__).resolve().parent.parent / 'openapi_to_markdown.py'
+SPEC = "openapi: 3.0.0\ninfo:\n  title: Dated\n  version: '1'\npaths: {}\n"
+
+
+def convert(spec_file, *args, **env):
+    result = subprocess.run(
+        [sys.executable, str(SCRIPT), str(spec_file), '--no-cache', *args],
+        env={**os.environ, **env}, capture_output=True, check=True
+    )
+    return result.stdout
+
+
+@pytest.mark.parametrize('args, env', [
+    ((), {'SOURCE_DATE_EPOCH': '1700000000'}),
+    (('--build-date', 'mtime'), {}),
+    (('--build-date', '2023-11-14T22:13:20'), {}),
+])
+def test_output_does_not_depend_on_timezone(tmp_path, args, env):
+    spec_file = tmp_path / 'spec.yaml'
+    spec_file.write_text(SPEC)
+    os.utime(spec_file, (1700000000, 1700000000))
+
+    utc = convert(spec_file, *args, TZ='UTC', **env)
+    tokyo = convert(spec_file, *args, TZ='Asia/Tokyo', **env)
+    assert utc == tokyo
+    assert utc.rstrip().endswith(b'*Generated on 2023-11-14 22:13:20 UTC*')
+
+
+def test_dates_are_rendered_in_utc(tmp_path):
+    tokyo = timezone(timedelta(hours=9))
+    assert resolve_build_date('2023-11-15T07:13:20+09:00') == datetime(2023, 11, 14, 22, 13, 20, tzinfo=timezone.utc)
+    assert generate_footer(datetime(2023, 11, 15, 7, 13, 20, tzinfo=tokyo)).endswith('2023-11-14 22:13:20 UTC*')
+
+    document = tmp_path / 'docs.md'
+    document.write_text('# Dated\n' + generate_footer(resolve_build_date('2023-11-14T22:13:20')) + '\n')
+    assert read_build_date(document) == datetime(2023, 11, 14, 22, 13, 20, tzinfo=timezone.utc)
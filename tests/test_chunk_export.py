@@ -0,0 +1,35 @@
+from pathlib import Path
+
+import pytest
+
+from chunk_export import iter_chunk_records, spec_source
+from openapi_to_markdown import OpenAPIToMarkdown, load_spec_file
+
+SPECS = Path(__file__).resolve().parent.parent / 'api_specs'
+
+
+def chunk_records(spec_path, max_tokens):
+    converter = OpenAPIToMarkdown(load_spec_file(spec_path), spec_path.parent)
+    return list(iter_chunk_records(converter, max_tokens=max_tokens, source=spec_source(spec_path)))
+
+
+@pytest.mark.parametrize('spec_path', [
+    SPECS / 'fortnite' / 'fortnite_api_spec.yaml',
+    SPECS / 'sensortower' / 'App Analysis.yml',
+])
+def test_ids_unique_at_small_budget(spec_path):
+    records = chunk_records(spec_path, 64)
+    texts = [record['text'] for record in records]
+    # Parts of one operation repeat at this budget; their IDs must not
+    assert len(set(texts)) < len(texts)
+    assert len({record['id'] for record in records}) == len(records)
+
+
+def test_ids_stable_and_per_spec():
+    spec_path = SPECS / 'fortnite' / 'fortnite_api_spec.yaml'
+    first = [record['id'] for record in chunk_records(spec_path, 512)]
+    assert first == [record['id'] for record in chunk_records(spec_path, 512)]
+
+    converter = OpenAPIToMarkdown(load_spec_file(spec_path), spec_path.parent)
+    other = [record['id'] for record in iter_chunk_records(converter, source='other/spec.yaml')]
+    assert not set(first) & set(other)
@@ -0,0 +1,109 @@
+import time
+
+import pytest
+
+from fragment_cache import FragmentCache, FragmentHasher
+
+
+def render_all(cache, keys):
+    cache.start_run()
+    for key in keys:
+        cache.render(key, lambda: f"text of {key}")
+
+
+def test_full_run_prunes_unused(tmp_path):
+    cache = FragmentCache(tmp_path, tmp_path / 'spec.yaml')
+    render_all(cache, ['a', 'b', 'c'])
+    cache.save()
+
+    cache = FragmentCache(tmp_path, tmp_path / 'spec.yaml')
+    render_all(cache, ['a', 'd'])
+    cache.save()
+
+    assert set(FragmentCache(tmp_path, tmp_path / 'spec.yaml').fragments) == {'a', 'd'}
+
+
+def test_partial_run_keeps_untouched(tmp_path):
+    cache = FragmentCache(tmp_path, tmp_path / 'spec.yaml')
+    render_all(cache, ['a', 'b', 'c'])
+    cache.save()
+
+    cache = FragmentCache(tmp_path, tmp_path / 'spec.yaml')
+    render_all(cache, ['a', 'd'])
+    cache.save(prune=False)
+
+    cache = FragmentCache(tmp_path, tmp_path / 'spec.yaml')
+    render_all(cache, ['a', 'b', 'c', 'd'])
+    assert (cache.hits, cache.misses) == (4, 0)
+
+
+def cyclic_schemas(count, connected=False):
+    """Schemas that each reference their neighbours (or, if connected, every other schema)"""
+    schemas = {}
+    for i in range(count):
+        targets = [j for j in range(count) if j != i] if connected else [(i - 1) % count, (i + 1) % count, i]
+        schemas[f"S{i}"] = {
+            'type': 'object',
+            'properties': {f"p{j}": {'$ref': f"#/components/schemas/S{j}"} for j in targets}
+        }
+    return schemas
+
+
+def hasher_for(schemas):
+    return FragmentHasher(lambda ref: schemas[ref.rsplit('/', 1)[1]])
+
+
+def schema_keys(schemas, order=None):
+    hasher = hasher_for(schemas)
+    return {name: hasher.key('schema', name, schemas[name]) for name in order or schemas}
+
+
+@pytest.mark.parametrize('count, connected', [(40, False), (12, True)])
+def test_cyclic_refs_hash_quickly(count, connected):
+    schemas = cyclic_schemas(count, connected)
+    start = time.perf_counter()
+    keys = schema_keys(schemas)
+    assert time.perf_counter() - start < 1.0
+    assert len(set(keys.values())) == count
+
+
+def test_cyclic_hash_does_not_depend_on_entry_point():
+    schemas = cyclic_schemas(6)
+    assert schema_keys(schemas) == schema_keys(schemas, order=sorted(schemas, reverse=True))
+
+
+def test_cyclic_hash_covers_every_member():
+    schemas = cyclic_schemas(6)
+    before = schema_keys(schemas)
+    schemas['S3']['description'] = 'changed'
+    after = schema_keys(schemas)
+    assert all(before[name] != after[name] for name in schemas)
+
+
+def test_acyclic_refs_hash_only_what_they_reach():
+    schemas = {
+        'Leaf': {'type': 'string'},
+        'Node': {'properties': {'leaf': {'$ref': '#/components/schemas/Leaf'}}},
+        'Other': {'type': 'integer'},
+    }
+    before = schema_keys(schemas)
+    schemas['Other']['format'] = 'int64'
+    after = schema_keys(schemas)
+    assert before['Node'] == after['Node'] and before['Other'] != after['Other']
+
+
+def test_cyclic_spec_renders_quickly_with_fragment_cache(tmp_path):
+    from openapi_to_markdown import OpenAPIToMarkdown
+
+    response = {'description': 'OK', 'content': {'application/json': {'schema': {'$ref': '#/components/schemas/S0'}}}}
+    spec = {
+        'openapi': '3.0.0',
+        'info': {'title': 'Cyclic', 'version': '1'},
+        'paths': {'/items': {'get': {'responses': {'200': response}}}},
+        'components': {'schemas': cyclic_schemas(22)},
+    }
+    start = time.perf_counter()
+    cache = FragmentCache(None, tmp_path / 'spec.yaml')
+    markdown = OpenAPIToMarkdown(spec, tmp_path, cache).generate_markdown()
+    assert time.perf_counter() - start < 5.0
+    assert '### S21' in markdown and cache.misses
@@ -0,0 +1,94 @@
+import json
+
+import pytest
+
+import lazy_json
+from lazy_json import LazyObject, load_lazy_json, value_end
+from openapi_to_markdown import load_spec_file
+
+TRICKY = {
+    'openapi': '3.0.0',
+    'info': {'title': 'Braces {in} "quotes" and \\ backslashes', 'version': '1',
+             'description': 'ends with a backslash \\'},
+    'paths': {
+        '/a/{id}': {'get': {'summary': '} ] not the end [ {', 'responses': {'200': {'description': '\\"}'}}}},
+        '/b': {'post': {'requestBody': {'content': {'application/json': {'example': [{'x': [[1, {'y': []}]]}, {}]}}}}},
+        '/été "q"': {'get': {'summary': 'café ☃ 😀', 'responses': {}}},
+    },
+    'components': {
+        'schemas': {
+            'Empty': {},
+            'Nested': {'type': 'object', 'properties': {'a': {'properties': {'b': {'properties': {}}}}}},
+            'key with \\"escapes\\"': {'enum': ['{', '}', '[', ']', '"', '\\', '\\\\"']},
+        },
+        'parameters': {},
+    },
+    'x-numbers': [0, -1.5e10, True, False, None],
+}
+
+
+def plain(value):
+    """value with every LazyObject parsed into a dict"""
+    if isinstance(value, LazyObject):
+        return {key: plain(value[key]) for key in value}
+    if isinstance(value, dict):
+        return {key: plain(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [plain(item) for item in value]
+    return value
+
+
+@pytest.mark.parametrize('indent', [None, 2])
+def test_lazy_matches_eager(tmp_path, indent):
+    spec_file = tmp_path / 'spec.json'
+    spec_file.write_text(json.dumps(TRICKY, indent=indent, ensure_ascii=indent is None))
+
+    lazy = load_lazy_json(spec_file)
+    assert isinstance(lazy, LazyObject)
+    assert isinstance(lazy['paths'], LazyObject) and isinstance(lazy['components']['schemas'], LazyObject)
+    assert plain(lazy) == json.loads(spec_file.read_text()) == TRICKY
+    assert list(lazy['paths']) == list(TRICKY['paths'])
+
+
+def test_lazy_and_eager_spec_loading_agree(tmp_path):
+    spec_file = tmp_path / 'spec.json'
+    spec_file.write_text(json.dumps(TRICKY))
+    assert plain(load_spec_file(spec_file, lazy=True)) == load_spec_file(spec_file, lazy=False)
+
+
+def test_evicted_entries_are_parsed_again(tmp_path, monkeypatch):
+    monkeypatch.setattr(lazy_json, 'RECENT_SIZE', 2)
+    paths = {f"/p{i}": {'get': {'summary': f"{{{i}}}"}} for i in range(5)}
+    spec_file = tmp_path / 'spec.json'
+    spec_file.write_text(json.dumps({'paths': paths}))
+
+    lazy = load_lazy_json(spec_file)['paths']
+    assert [lazy[path] for path in paths] == list(paths.values())
+    assert len(lazy._recent) == 2
+    assert lazy['/p0'] == paths['/p0']
+
+
+@pytest.mark.parametrize('text', ['[1, {"a": "}"}]', '"just a string"', '{}', '\ufeff{"a": {"b": 1}}'])
+def test_other_documents(tmp_path, text):
+    spec_file = tmp_path / 'spec.json'
+    spec_file.write_bytes(text.encode('utf-8'))
+    assert plain(load_lazy_json(spec_file)) == json.loads(text.lstrip('\ufeff'))
+
+
+@pytest.mark.parametrize('text, end', [
+    (b'"a\\"}" ,', 6),
+    (b'{"a": "}", "b": [1, {"c": "]"}]} tail', 32),
+    (b'[[], [[]], {"x": "\\\\"}] ,', 23),
+    (b'-12.5e3, 1', 7),
+    (b'true}', 4),
+])
+def test_value_end(text, end):
+    assert value_end(text, 0) == end
+    json.loads(text[:end])
+
+
+def test_unterminated_values():
+    with pytest.raises(ValueError):
+        value_end(b'"abc', 0)
+    with pytest.raises(ValueError):
+        value_end(b'{"a": [1, 2}', 0)
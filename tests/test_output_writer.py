@@ -0,0 +1,53 @@
+import hashlib
+import os
+
+import pytest
+
+from output_writer import OutputWriter, hash_file, write_atomic
+
+
+def test_unchanged_content_is_not_rewritten(tmp_path):
+    target = tmp_path / 'docs' / 'platform' / 'api.md'
+    writer = OutputWriter()
+
+    first = writer.write(target, ['# API\n', b'body\n'])
+    assert first.changed and first.size == 11
+    assert first.sha256 == hashlib.sha256(b'# API\nbody\n').hexdigest() == hash_file(target)
+    os.utime(target, ns=(1_000_000_000, 1_000_000_000))
+    inode = target.stat().st_ino
+
+    # The same bytes, chunked differently
+    second = writer.write(target, '# API\nbody\n')
+    assert not second.changed and second.sha256 == first.sha256
+    assert target.stat().st_mtime_ns == 1_000_000_000 and target.stat().st_ino == inode
+
+    third = writer.write(target, '# API\nnew body\n')
+    assert third.changed and target.read_text() == '# API\nnew body\n'
+    # Same size, different bytes
+    assert writer.write(target, '# API\nold body\n').changed
+
+    assert writer.stats == {'files_written': 3, 'files_unchanged': 1, 'bytes_written': 11 + 15 + 15,
+                            'bytes_unchanged': 11}
+    assert sorted(path.name for path in target.parent.iterdir()) == ['api.md']
+
+
+def test_failed_render_leaves_old_file(tmp_path):
+    target = tmp_path / 'api.md'
+    target.write_text('old\n')
+
+    def chunks():
+        yield 'partial'
+        raise RuntimeError('render failed')
+
+    with pytest.raises(RuntimeError):
+        OutputWriter().write(target, chunks())
+    assert target.read_text() == 'old\n'
+    assert [path.name for path in tmp_path.iterdir()] == ['api.md']
+
+
+def test_write_atomic_replaces(tmp_path):
+    target = tmp_path / 'state.json'
+    write_atomic(target, '{}\n')
+    write_atomic(target, b'{"a": 1}\n')
+    assert target.read_bytes() == b'{"a": 1}\n'
+    assert hash_file(tmp_path / 'missing') is None
@@ -0,0 +1,98 @@
+import json
+
+import pytest
+import yaml
+
+from openapi_to_markdown import load_spec_file
+from ref_resolver import RefResolver, RefResolutionError, decode_pointer, schema_name
+
+
+def schemas(**entries):
+    return {'openapi': '3.0.0', 'components': {'schemas': entries}}
+
+
+def test_local_refs_and_pointers():
+    spec = schemas(**{'Pet': {'type': 'object'}, 'a/b~c': {'type': 'string'}})
+    spec['paths'] = {'/pets': {'get': {'responses': {'200': {'description': 'OK'}}}}}
+    resolver = RefResolver(spec)
+
+    assert resolver.resolve('#/components/schemas/Pet') is spec['components']['schemas']['Pet']
+    assert resolver.resolve('#/components/schemas/a~1b~0c') == {'type': 'string'}
+    assert resolver.resolve('#/paths/~1pets/get/responses/200/description') == 'OK'
+    assert decode_pointer('#/paths/%7Bid%7D') == ['paths', '{id}']
+    assert schema_name('#/components/schemas/a~1b~0c') == 'a/b~c'
+    with pytest.raises(RefResolutionError):
+        resolver.resolve('#/components/schemas/Missing')
+
+
+def test_self_referencing_schema_resolves():
+    spec = schemas(Node={'type': 'object', 'properties': {
+        'children': {'type': 'array', 'items': {'$ref': '#/components/schemas/Node'}}
+    }})
+    resolver = RefResolver(spec)
+    node = resolver.resolve('#/components/schemas/Node')
+    assert resolver.resolve(node['properties']['children']['items']['$ref']) is node
+    assert resolver.flatten({'$ref': '#/components/schemas/Node'}) is node
+
+
+def test_ref_cycles_are_reported():
+    spec = schemas(A={'$ref': '#/components/schemas/B'}, B={'$ref': '#/components/schemas/A'})
+    with pytest.raises(RefResolutionError, match='cycle'):
+        RefResolver(spec).deref({'$ref': '#/components/schemas/A'})
+
+    spec = schemas(A={'allOf': [{'$ref': '#/components/schemas/B'}]},
+                   B={'allOf': [{'$ref': '#/components/schemas/A'}]})
+    with pytest.raises(RefResolutionError, match='cycle through allOf'):
+        RefResolver(spec).flatten({'$ref': '#/components/schemas/A'})
+
+
+def test_flatten_merges_all_of():
+    spec = schemas(
+        Base={'type': 'object', 'properties': {'id': {'type': 'integer'}}, 'required': ['id']},
+        Pet={'allOf': [{'$ref': '#/components/schemas/Base'},
+                       {'properties': {'name': {'type': 'string'}}, 'required': ['name', 'id']}]}
+    )
+    flat = RefResolver(spec).flatten({'$ref': '#/components/schemas/Pet'})
+    assert flat == {'type': 'object', 'properties': {'id': {'type': 'integer'}, 'name': {'type': 'string'}},
+                    'required': ['id', 'name']}
+
+
+def test_external_refs(tmp_path):
+    (tmp_path / 'models').mkdir()
+    (tmp_path / 'models' / 'pet.yaml').write_text(yaml.safe_dump({'components': {'schemas': {
+        'Pet': {'type': 'object', 'properties': {'owner': {'$ref': '../owner.json#/Owner'},
+                                                 'tag': {'$ref': '#/components/schemas/Tag'}}},
+        'Tag': {'type': 'string'}
+    }}}))
+    (tmp_path / 'owner.json').write_text(json.dumps({'Owner': {'type': 'object', 'title': 'Owner'}}))
+    spec = {'openapi': '3.0.0', 'paths': {}}
+    resolver = RefResolver(spec, tmp_path, loader=load_spec_file)
+
+    pet = resolver.resolve('models/pet.yaml#/components/schemas/Pet')
+    pet_file = str((tmp_path / 'models' / 'pet.yaml').resolve())
+    owner_file = str((tmp_path / 'owner.json').resolve())
+    # Refs inside an external document are rebased onto its absolute path
+    assert pet['properties']['tag'] == {'$ref': f"{pet_file}#/components/schemas/Tag"}
+    assert pet['properties']['owner'] == {'$ref': f"{owner_file}#/Owner"}
+    assert resolver.resolve(pet['properties']['tag']['$ref']) == {'type': 'string'}
+    assert resolver.deref(pet['properties']['owner'])['title'] == 'Owner'
+    assert resolver.resolve('./models/../models/pet.yaml#/components/schemas/Pet') is pet
+    assert set(resolver.loaded_files) == {pet_file, owner_file}
+
+
+def test_external_ref_failures(tmp_path):
+    with pytest.raises(RefResolutionError, match='no loader'):
+        RefResolver({}, tmp_path).resolve('other.yaml#/A')
+
+    resolver = RefResolver({}, tmp_path, loader=load_spec_file)
+    with pytest.raises(RefResolutionError, match='Cannot load'):
+        resolver.resolve('missing.yaml#/A')
+    assert resolver.loaded_files == {str((tmp_path / 'missing.yaml').resolve()): None}
+
+
+def test_memo_limit_bounds_memo():
+    spec = schemas(**{f"S{i}": {'type': 'string', 'title': str(i)} for i in range(10)})
+    resolver = RefResolver(spec, memo_limit=3)
+    for i in range(10):
+        assert resolver.resolve(f"#/components/schemas/S{i}")['title'] == str(i)
+    assert len(resolver.memo) == 3
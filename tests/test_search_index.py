@@ -0,0 +1,37 @@
+import pickle
+
+from batch_convert import ConvertResult
+from openapi_to_markdown import OpenAPIToMarkdown
+from search_index import spec_rows
+from spec_normalizer import normalize_spec
+
+SWAGGER2 = {
+    'swagger': '2.0',
+    'info': {'title': 'Pets', 'version': '1'},
+    'paths': {'/pets': {'post': {
+        'operationId': 'createPet',
+        'parameters': [{'name': 'pet', 'in': 'body', 'schema': {'$ref': '#/definitions/NewPet'}}],
+        'responses': {'201': {'description': 'Created', 'schema': {'$ref': '#/definitions/Pet'}}}
+    }}},
+    'definitions': {
+        'NewPet': {'type': 'object', 'properties': {'petName': {'type': 'string'}}},
+        'Pet': {'allOf': [{'$ref': '#/definitions/NewPet'}, {'properties': {'petId': {'type': 'integer'}}}]}
+    }
+}
+
+
+def test_swagger2_body_schemas_are_indexed_after_normalization():
+    title, rows = spec_rows(OpenAPIToMarkdown(normalize_spec(SWAGGER2)), 'p/pets.yaml', 'p')
+    assert title == 'Pets'
+
+    endpoint = next(row for row in rows if row[-5] == 'endpoint')
+    assert endpoint[0] == 'POST /pets'
+    assert endpoint[5].split() == ['petName', 'petName', 'petId']
+    assert sorted(row[0] for row in rows if row[-5] == 'schema') == ['NewPet', 'Pet']
+
+
+def test_convert_result_survives_pickling():
+    result = ConvertResult('success', 'Converted: pets.md', 'abc', write_stats={'written': 1}, search_rows=('T', []))
+    copy = pickle.loads(pickle.dumps(result))
+    assert (copy.status, copy.message, copy.output_hash, copy.stages, copy.write_stats, copy.search_rows) == (
+        'success', 'Converted: pets.md', 'abc', None, {'written': 1}, ('T', []))
@@ -0,0 +1,37 @@
+import time
+
+from shared_schemas import SchemaLibrary, schema_hashes
+
+
+def cyclic_spec(count, extra=None):
+    schemas = {
+        f"Node{i}": {
+            'type': 'object',
+            'properties': {
+                'parent': {'$ref': f"#/components/schemas/Node{(i - 1) % count}"},
+                'children': {'type': 'array', 'items': {'$ref': f"#/components/schemas/Node{(i + 1) % count}"}},
+            }
+        }
+        for i in range(count)
+    }
+    schemas.update(extra or {})
+    return {'openapi': '3.0.0', 'info': {'title': 'Cyclic', 'version': '1'}, 'paths': {},
+            'components': {'schemas': schemas}}
+
+
+def test_schema_hashes_of_cyclic_spec(tmp_path):
+    start = time.perf_counter()
+    hashes = schema_hashes(cyclic_spec(30), tmp_path)
+    assert time.perf_counter() - start < 2.0
+    assert len(set(hashes.values())) == 30
+
+
+def test_cyclic_schemas_shared_between_specs(tmp_path):
+    first = schema_hashes(cyclic_spec(5, {'Only': {'type': 'string'}}), tmp_path)
+    second = schema_hashes(cyclic_spec(5, {'Only': {'type': 'integer'}}), tmp_path)
+
+    library = SchemaLibrary('p')
+    library.add('p/first.yaml', tmp_path / 'first.yaml', first)
+    library.add('p/second.yaml', tmp_path / 'second.yaml', second)
+    library.build()
+    assert set(library.links('p/first.yaml')) == {f"Node{i}" for i in range(5)}
@@ -0,0 +1,44 @@
+import copy
+import time
+
+from spec_diff import diff_specs
+
+
+def cyclic_spec(count):
+    schemas = {
+        f"Node{i}": {
+            'type': 'object',
+            'properties': {
+                'parent': {'$ref': f"#/components/schemas/Node{(i - 1) % count}"},
+                'child': {'$ref': f"#/components/schemas/Node{(i + 1) % count}"},
+            }
+        }
+        for i in range(count)
+    }
+    response = {'description': 'OK', 'content': {'application/json': {'schema': {'$ref': '#/components/schemas/Node0'}}}}
+    return {
+        'openapi': '3.0.0',
+        'info': {'title': 'Cyclic', 'version': '1'},
+        'paths': {'/nodes': {'get': {'operationId': 'listNodes', 'responses': {'200': response}}}},
+        'components': {'schemas': schemas},
+    }
+
+
+def test_cyclic_spec_diff_is_fast_and_complete():
+    old = cyclic_spec(25)
+    new = copy.deepcopy(old)
+    new['components']['schemas']['Node7']['description'] = 'Changed'
+
+    start = time.perf_counter()
+    diff = diff_specs(old, new)
+    assert time.perf_counter() - start < 5.0
+
+    changed = {(change.kind, change.name) for change in diff.changes}
+    # Every node reaches Node7 through the cycle, and so does the operation
+    assert changed == {('schema', f"Node{i}") for i in range(25)} | {('endpoint', 'GET /nodes')}
+    assert {change.status for change in diff.changes} == {'modified'}
+    assert 'Node7' in ''.join(diff.iter_markdown())
+
+
+def test_identical_cyclic_specs_have_no_changes():
+    assert not diff_specs(cyclic_spec(10), cyclic_spec(10))
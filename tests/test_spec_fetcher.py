@@ -0,0 +1,162 @@
+import json
+import threading
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import output_writer
+from spec_fetcher import SpecFetcher, assign_file_names, load_sources, target_name, target_path
+
+SPEC = "openapi: 3.0.0\ninfo:\n  title: {title}\n  version: '1'\npaths: {{}}\n"
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class AnyPathHandler(QuietHandler):
+    """Answers every path with the same spec, as a hostile or misconfigured server might"""
+
+    def do_GET(self):
+        body = SPEC.format(title='Evil').encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/yaml')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def server(tmp_path):
+    """Serve tmp_path/www over HTTP on a free local port, yielding its base URL"""
+    root = tmp_path / 'www'
+    for directory in ('a', 'b'):
+        (root / directory).mkdir(parents=True)
+        (root / directory / 'openapi.yaml').write_text(SPEC.format(title=directory.upper()))
+
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), partial(QuietHandler, directory=str(root)))
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def fetch(tmp_path, sources):
+    fetcher = SpecFetcher(tmp_path / 'specs', tmp_path / 'specs' / '.fetch_state.json', workers=2)
+    try:
+        return {result.url: result for result in fetcher.fetch_all(sources)}
+    finally:
+        fetcher.close()
+
+
+def test_fetch_then_not_modified(tmp_path, server):
+    sources = [{'url': f"{server}/a/openapi.yaml", 'platform': 'p'}]
+    first = fetch(tmp_path, sources)[sources[0]['url']]
+    assert first.status == 'updated'
+    assert first.path == tmp_path / 'specs' / 'p' / 'openapi.yaml'
+    assert 'title: A' in first.path.read_text()
+
+    second = fetch(tmp_path, sources)[sources[0]['url']]
+    assert second.status == 'not_modified'
+    assert second.path == first.path
+
+
+def test_same_file_name_in_one_platform(tmp_path, server):
+    manifest = tmp_path / 'sources.json'
+    manifest.write_text(json.dumps({'sources': [
+        {'url': f"{server}/a/openapi.yaml", 'platform': 'p'},
+        {'url': f"{server}/b/openapi.yaml", 'platform': 'p'},
+    ]}))
+    sources = load_sources(manifest)
+
+    results = fetch(tmp_path, sources)
+    paths = {result.path for result in results.values()}
+    assert [result.status for result in results.values()] == ['updated', 'updated']
+    assert {path.name for path in paths} == {'127.0.0.1-a-openapi.yaml', '127.0.0.1-b-openapi.yaml'}
+    assert {path.read_text() for path in paths} == {SPEC.format(title='A'), SPEC.format(title='B')}
+
+    again = fetch(tmp_path, load_sources(manifest))
+    assert {result.status for result in again.values()} == {'not_modified'}
+    assert {result.path for result in again.values()} == paths
+
+
+def test_explicit_names_must_differ():
+    sources = [
+        {'url': 'http://host/a/openapi.yaml', 'platform': 'p', 'name': 'api.yaml'},
+        {'url': 'http://host/b/openapi.json', 'platform': 'p', 'name': 'api.json'},
+    ]
+    with pytest.raises(ValueError, match="give one of them a 'name'"):
+        assign_file_names(sources)
+
+
+def test_same_name_in_other_platforms():
+    sources = [
+        {'url': 'http://host/a/openapi.yaml', 'platform': 'p'},
+        {'url': 'http://host/b/openapi.yaml', 'platform': 'q'},
+    ]
+    assign_file_names(sources)
+    assert not any(source.get('qualified') for source in sources)
+
+
+def test_url_name_cannot_leave_platform_directory(tmp_path):
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), AnyPathHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    try:
+        url = f"http://127.0.0.1:{httpd.server_address[1]}/a/..%2F..%2F..%2Fevil.yaml"
+        result = fetch(tmp_path, [{'url': url, 'platform': 'p'}])[url]
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+    assert result.status == 'error'
+    assert 'Unsafe file name' in result.message
+    assert not list(tmp_path.rglob('evil.yaml'))
+
+
+@pytest.mark.parametrize('field, value', [
+    ('platform', '../outside'),
+    ('platform', '/tmp'),
+    ('platform', '..'),
+    ('name', '../../evil.yaml'),
+    ('name', 'sub\\evil.yaml'),
+    ('name', '/etc/evil.yaml'),
+])
+def test_unsafe_manifest_entries_are_rejected(tmp_path, field, value):
+    source = {'url': 'http://host/openapi.yaml', 'platform': 'p', field: value}
+    manifest = tmp_path / 'sources.json'
+    manifest.write_text(json.dumps({'sources': [source]}))
+    with pytest.raises(ValueError, match='Unsafe'):
+        load_sources(manifest)
+
+
+def test_target_path_stays_in_platform_directory(tmp_path):
+    assert target_path(tmp_path, 'p', 'openapi.yaml') == tmp_path / 'p' / 'openapi.yaml'
+    name = target_name({'url': 'http://host/a/..%2Fevil.yaml', 'platform': 'p'})
+    with pytest.raises(ValueError):
+        target_path(tmp_path, 'p', name)
+    with pytest.raises(ValueError):
+        target_path(tmp_path, '', 'openapi.yaml')
+
+
+def test_interrupted_state_save_keeps_old_state(tmp_path, monkeypatch):
+    state_path = tmp_path / '.fetch_state.json'
+    fetcher = SpecFetcher(tmp_path, state_path)
+    fetcher.state = {'http://host/openapi.yaml': {'path': 'p/openapi.yaml', 'etag': '"1"'}}
+    fetcher.save_state()
+    saved = state_path.read_text()
+
+    def interrupted(src, dst):
+        raise KeyboardInterrupt
+
+    fetcher.state['http://host/openapi.yaml']['etag'] = '"2"'
+    monkeypatch.setattr(output_writer.os, 'replace', interrupted)
+    with pytest.raises(KeyboardInterrupt):
+        fetcher.save_state()
+    fetcher.close()
+
+    assert state_path.read_text() == saved
+    assert [path.name for path in tmp_path.iterdir()] == ['.fetch_state.json']
@@ -0,0 +1,48 @@
+import json
+
+import pytest
+import yaml
+
+import openapi_to_markdown
+from openapi_to_markdown import load_spec_header
+
+INFO = {'title': 'Late API', 'version': '2.1'}
+
+
+def info_last_spec(count=2000):
+    paths = {f"/items/{i}": {'get': {'summary': f"Item {i}", 'responses': {'200': {'description': 'OK'}}}}
+             for i in range(count)}
+    return {'openapi': '3.0.0', 'paths': paths, 'info': INFO}
+
+
+@pytest.mark.parametrize('name, dump', [
+    ('spec.yaml', lambda spec: yaml.safe_dump(spec, sort_keys=False)),
+    ('spec.json', json.dumps),
+    ('flow.yaml', lambda spec: json.dumps(spec, indent=1)),
+])
+def test_info_after_large_paths(tmp_path, monkeypatch, name, dump):
+    spec_file = tmp_path / name
+    spec_file.write_text(dump(info_last_spec()))
+    monkeypatch.setattr(openapi_to_markdown, 'HEADER_SCAN_CHARS', 4096)
+
+    looked_up = []
+    find_info = openapi_to_markdown._find_info
+    monkeypatch.setattr(openapi_to_markdown, '_find_info', lambda path: looked_up.append(path) or find_info(path))
+
+    assert load_spec_header(spec_file) == INFO
+    assert looked_up == [spec_file]
+
+
+def test_info_first_is_read_from_the_prefix(tmp_path, monkeypatch):
+    spec = info_last_spec()
+    spec_file = tmp_path / 'spec.yaml'
+    spec_file.write_text(yaml.safe_dump({'info': INFO, **spec}, sort_keys=False))
+    monkeypatch.setattr(openapi_to_markdown, '_find_info', lambda path: pytest.fail('looked up info'))
+
+    assert load_spec_header(spec_file) == INFO
+
+
+def test_missing_info(tmp_path):
+    spec_file = tmp_path / 'spec.yaml'
+    spec_file.write_text("openapi: 3.0.0\npaths: {}\n")
+    assert load_spec_header(spec_file) == {}
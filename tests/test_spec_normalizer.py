@@ -0,0 +1,211 @@
+import pytest
+
+from openapi_to_markdown import OpenAPIToMarkdown, load_spec_file
+from output_formats import get_format
+from ref_resolver import RefResolver, RefResolutionError
+from spec_normalizer import normalize_spec
+
+MAIN = """\
+swagger: '2.0'
+info: {title: Two files, version: '1'}
+paths:
+  /pets:
+    get:
+      parameters:
+        - $ref: 'common.yaml#/parameters/Limit'
+      responses:
+        '200':
+          description: OK
+          schema:
+            $ref: '#/definitions/Pet'
+        default:
+          $ref: 'common.yaml#/responses/Error'
+definitions:
+  Pet:
+    type: object
+    properties:
+      owner:
+        $ref: 'common.yaml#/definitions/Owner'
+      tag:
+        $ref: 'fragments.yaml#/definitions/Tag'
+"""
+
+COMMON = """\
+swagger: '2.0'
+info: {title: Common, version: '1'}
+paths: {}
+parameters:
+  Limit: {name: pageSize, in: query, type: integer}
+responses:
+  Error:
+    description: Failure
+    schema:
+      $ref: '#/definitions/Owner'
+definitions:
+  Owner:
+    type: object
+    properties:
+      ownerName: {type: string}
+"""
+
+# Shared definitions without a 'swagger' version are not normalized on load
+FRAGMENTS = """\
+definitions:
+  Tag:
+    type: object
+    properties:
+      tagLabel: {type: string}
+"""
+
+
+@pytest.fixture
+def two_file_spec(tmp_path):
+    for name, text in (('main.yaml', MAIN), ('common.yaml', COMMON), ('fragments.yaml', FRAGMENTS)):
+        (tmp_path / name).write_text(text)
+    return tmp_path / 'main.yaml'
+
+
+def test_external_refs_follow_normalized_documents(two_file_spec):
+    spec = load_spec_file(two_file_spec)
+    resolver = RefResolver(spec, two_file_spec.parent, loader=load_spec_file)
+
+    pet = spec['components']['schemas']['Pet']
+    assert pet['properties']['owner'] == {'$ref': 'common.yaml#/components/schemas/Owner'}
+    assert spec['paths']['/pets']['get']['parameters'] == [{'$ref': 'common.yaml#/components/parameters/Limit'}]
+
+    owner = resolver.resolve(pet['properties']['owner']['$ref'])
+    assert owner['properties'] == {'ownerName': {'type': 'string'}}
+    assert resolver.resolve('common.yaml#/components/parameters/Limit')['schema'] == {'type': 'integer'}
+    assert resolver.resolve('common.yaml#/components/responses/Error')['description'] == 'Failure'
+    assert resolver.resolve(pet['properties']['tag']['$ref'])['properties'] == {'tagLabel': {'type': 'string'}}
+    # Refs written against the 2.0 layout of a normalized file still resolve
+    assert resolver.resolve('common.yaml#/definitions/Owner') is owner
+    with pytest.raises(RefResolutionError):
+        resolver.resolve('common.yaml#/components/schemas/Missing')
+
+
+def test_two_file_swagger2_renders(two_file_spec):
+    converter = OpenAPIToMarkdown(load_spec_file(two_file_spec), two_file_spec.parent)
+    markdown = ''.join(get_format('markdown').render(converter, None))
+    assert '- `pageSize` (query, integer)' in markdown
+    assert '- `default`: Failure' in markdown
+
+
+SWAGGER2 = {
+    'swagger': '2.0',
+    'info': {'title': 'Pets', 'version': '1'},
+    'host': 'api.example.com',
+    'basePath': '/v1',
+    'schemes': ['https'],
+    'produces': ['application/json', 'application/xml'],
+    'paths': {
+        '/pets': {
+            'parameters': [{'$ref': '#/parameters/Limit'}],
+            'get': {
+                'parameters': [{'name': 'tags', 'in': 'query', 'type': 'array', 'items': {'type': 'string'},
+                                'collectionFormat': 'csv'}],
+                'responses': {
+                    '200': {'description': 'OK', 'schema': {'type': 'array', 'items': {'$ref': '#/definitions/Pet'}}},
+                    'default': {'$ref': '#/responses/Error'}
+                }
+            },
+            'post': {
+                'parameters': [{'$ref': '#/parameters/PetBody'}],
+                'responses': {'201': {'description': 'Created'}}
+            }
+        },
+        '/pets/{id}/photo': {
+            'put': {
+                'consumes': ['multipart/form-data'],
+                'parameters': [
+                    {'name': 'id', 'in': 'path', 'required': True, 'type': 'integer'},
+                    {'name': 'file', 'in': 'formData', 'type': 'file', 'required': True},
+                    {'name': 'caption', 'in': 'formData', 'type': 'string'}
+                ],
+                'responses': {'204': {'description': 'Stored'}}
+            }
+        }
+    },
+    'definitions': {
+        'Pet': {'type': 'object', 'properties': {'name': {'type': 'string', 'x-nullable': True},
+                                                 'owner': {'$ref': '#/definitions/Owner'}}},
+        'Owner': {'type': 'object'}
+    },
+    'parameters': {
+        'Limit': {'name': 'limit', 'in': 'query', 'type': 'integer', 'maximum': 100},
+        'PetBody': {'name': 'pet', 'in': 'body', 'required': True, 'schema': {'$ref': '#/definitions/Pet'}}
+    },
+    'responses': {
+        'Error': {'description': 'Failure', 'schema': {'$ref': '#/definitions/Owner'}}
+    },
+    'securityDefinitions': {
+        'key': {'type': 'apiKey', 'name': 'X-Key', 'in': 'header'},
+        'oauth': {'type': 'oauth2', 'flow': 'accessCode', 'authorizationUrl': 'https://a', 'tokenUrl': 'https://t',
+                  'scopes': {'read': 'Read'}}
+    }
+}
+
+
+def test_definitions_move_to_components_schemas():
+    spec = normalize_spec(SWAGGER2)
+    assert spec['openapi'].startswith('3.') and 'definitions' not in spec
+    assert spec['servers'] == [{'url': 'https://api.example.com/v1'}]
+    pet = spec['components']['schemas']['Pet']
+    assert pet['properties']['owner'] == {'$ref': '#/components/schemas/Owner'}
+    assert pet['properties']['name'] == {'type': 'string', 'nullable': True}
+
+
+def test_parameters_are_rewritten():
+    spec = normalize_spec(SWAGGER2)
+    components = spec['components']
+    assert components['parameters'] == {'Limit': {'name': 'limit', 'in': 'query',
+                                                  'schema': {'type': 'integer', 'maximum': 100}}}
+    assert components['requestBodies']['PetBody'] == {
+        'content': {'application/json': {'schema': {'$ref': '#/components/schemas/Pet'}}}, 'required': True
+    }
+
+    pets = spec['paths']['/pets']
+    assert pets['parameters'] == [{'$ref': '#/components/parameters/Limit'}]
+    assert pets['get']['parameters'] == [{'name': 'tags', 'in': 'query', 'style': 'form', 'explode': False,
+                                          'schema': {'type': 'array', 'items': {'type': 'string'}}}]
+    assert 'parameters' not in pets['post']
+    assert pets['post']['requestBody'] == {'$ref': '#/components/requestBodies/PetBody'}
+
+    photo = spec['paths']['/pets/{id}/photo']['put']
+    assert photo['parameters'] == [{'name': 'id', 'in': 'path', 'required': True, 'schema': {'type': 'integer'}}]
+    assert photo['requestBody'] == {
+        'content': {'multipart/form-data': {'schema': {
+            'type': 'object',
+            'properties': {'file': {'type': 'string', 'format': 'binary'}, 'caption': {'type': 'string'}},
+            'required': ['file']
+        }}},
+        'required': True
+    }
+
+
+def test_responses_are_rewritten():
+    spec = normalize_spec(SWAGGER2)
+    assert spec['components']['responses']['Error'] == {
+        'description': 'Failure',
+        'content': {media: {'schema': {'$ref': '#/components/schemas/Owner'}}
+                    for media in ('application/json', 'application/xml')}
+    }
+    responses = spec['paths']['/pets']['get']['responses']
+    assert responses['default'] == {'$ref': '#/components/responses/Error'}
+    assert responses['200']['content']['application/xml'] == {
+        'schema': {'type': 'array', 'items': {'$ref': '#/components/schemas/Pet'}}
+    }
+    assert spec['paths']['/pets']['post']['responses'] == {'201': {'description': 'Created'}}
+
+
+def test_security_definitions_become_schemes():
+    schemes = normalize_spec(SWAGGER2)['components']['securitySchemes']
+    assert schemes['key'] == {'type': 'apiKey', 'name': 'X-Key', 'in': 'header'}
+    assert schemes['oauth']['flows'] == {'authorizationCode': {
+        'scopes': {'read': 'Read'}, 'authorizationUrl': 'https://a', 'tokenUrl': 'https://t'
+    }}
+
+
+def test_openapi3_is_returned_unchanged():
+    spec = {'openapi': '3.0.0', 'info': {'title': 'T', 'version': '1'}, 'paths': {}}
+    assert normalize_spec(spec) is spec
@@ -0,0 +1,41 @@
+import sys
+
+import pytest
+
+import swagger_discovery
+from swagger_discovery import DiscoveredSpec, SwaggerDiscovery
+
+SPEC = b'{"openapi": "3.0.0", "info": {"title": "T", "version": "1"}, "paths": {}}'
+
+
+def run_main(monkeypatch, tmp_path, found):
+    """Run the CLI with --platform p against canned discovery results, returning its exit code"""
+    def discover_all(self, page_urls, workers=8):
+        return [(page_url, found.get(page_url)) for page_url in page_urls]
+
+    monkeypatch.setattr(SwaggerDiscovery, 'discover_all', discover_all)
+    monkeypatch.setattr(sys, 'argv', ['swagger_discovery.py', '-p', 'p', *found])
+    monkeypatch.chdir(tmp_path)
+    with pytest.raises(SystemExit) as exit_info:
+        swagger_discovery.main()
+    return exit_info.value.code
+
+
+def test_same_spec_name_from_two_pages(monkeypatch, tmp_path):
+    found = {
+        f"https://{host}/docs": DiscoveredSpec(f"https://{host}/docs", f"https://{host}/v1/openapi.json",
+                                               SPEC.replace(b'"T"', f'"{host}"'.encode()), 'application/json')
+        for host in ('one.example', 'two.example')
+    }
+    assert run_main(monkeypatch, tmp_path, found) == 0
+
+    saved = sorted((tmp_path / 'api_specs' / 'p').iterdir())
+    assert [path.name for path in saved] == ['one.example-v1-openapi.json', 'two.example-v1-openapi.json']
+    assert b'one.example' in saved[0].read_bytes() and b'two.example' in saved[1].read_bytes()
+
+
+def test_scraped_url_cannot_escape_platform_directory(monkeypatch, tmp_path):
+    page = 'https://evil.example/docs'
+    found = {page: DiscoveredSpec(page, 'https://evil.example/a/..%2F..%2F..%2Fevil.yaml', SPEC, 'application/json')}
+    assert run_main(monkeypatch, tmp_path, found) == 1
+    assert not list(tmp_path.rglob('evil.yaml'))